@@ -1,73 +1,232 @@
 """
 Main file of comrob project, running the comrob bot and robot controller.
 """
+import asyncio
 import concurrent.futures
 import os
-import threading
-import time
 
 from collections import deque
 from dotenv import load_dotenv
 
 from comrob_py.comrob_bot.comrob_bot import ComrobBot
+from comrob_py.enums.aggregation_mode import AggregationMode
 from comrob_py.enums.command_key import CommandKey, FunctionKey
-from comrob_py.robot_handler.command_handler import select_command, send_message
+from comrob_py.enums.pool_mode import PoolMode
+from comrob_py.enums.robot_backend import RobotBackend
+from comrob_py.event_log.event_log import EventLog
+from comrob_py.metrics.metrics import registry
+from comrob_py.metrics.metrics_server import MetricsServer
+from comrob_py.robot_handler.command_handler import send_message
 from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+from comrob_py.robot_handler.motion_profiles import MotionProfiles
+from comrob_py.robot_handler.robot_handler import RobotHandler
+from comrob_py.robot_handler.robot_pool import RobotPool
+from comrob_py.robot_handler.session_scheduler import SessionScheduler
 from comrob_py.robot_handler.user_handler import UserHandler
 
+COMMAND_SECONDS = registry.histogram("comrob_command_seconds", "Duration of the execution of the selected commands.",
+                                     ("function",))
 
-def main():
-    # load env and initialize bot
-    load_dotenv()
-    comrob_bot = ComrobBot(irc_token=os.environ["TMI_TOKEN"], nick=os.environ["BOT_NICK"],
-                           prefix=os.environ["BOT_PREFIX"], initial_channels=[os.environ["CHANNEL"]])
-    # run comrobbot in separate thread
-    comrob_bot_thread_1 = threading.Thread(target=comrob_bot.run)
-    comrob_bot_thread_1.start()
-    # start robot / user handler
-    user_handler = UserHandler(edge_length_xy=float(os.environ["EDGE_LENGTH_XY"]),
-                               edge_length_z=float(os.environ["EDGE_LENGTH_Z"]),
-                               x_offset=float(os.environ["X_OFFSET"]),
-                               y_offset=float(os.environ["Y_OFFSET"]),
-                               z_offset=float(os.environ["Z_OFFSET"]),
-                               xy_base_offset=float(os.environ["XY_BASE_OFFSET"]),
-                               z_base_offset=float(os.environ["Z_BASE_OFFSET"]),
-                               min_radius_xy=float(os.environ["MIN_RADIUS_XY"]),
-                               max_radius_xy=float(os.environ["MAX_RADIUS_XY"]),
-                               x_start_user=int(os.environ["X_START_USER"]),
-                               y_start_user=int(os.environ["Y_START_USER"]),
-                               z_start_user=int(os.environ["Z_START_USER"]))
-    # wait for comrob bot to start before sending messages
-    time.sleep(3)
-    # time for collection and execution of one command in [s]
-    loop_time = 10
+
+def execute_command(comrob_bot, user_handler, command, arm=None):
+    """
+    Run the command selected in a session on the robot.
+    :param comrob_bot: bot to send messages with
+    :type comrob_bot: ComrobBot
+    :param user_handler: handler of the robot
+    :type user_handler: UserHandler
+    :param command: command with the most votes
+    :type command: dict
+    :param arm: arm running the command, only named in the chat if not None
+    :type arm: int
+    """
+    # try running the command
+    try:
+        send_message(comrob_bot, "Selected command: " + command[CommandKey.Function].value +
+                     str(command[CommandKey.Args]) +
+                     ", votes: " + str(command[CommandKey.Count]) +
+                     ("" if arm is None else ", arm: " + str(arm)) + ".")
+        # try to call function on uarm
+        function = getattr(user_handler, command[CommandKey.Function].value)
+        with COMMAND_SECONDS.time(command[CommandKey.Function].value):
+            function(*command[CommandKey.Args])
+    except ComrobError as error:
+        # except expected errors and send message to chat instead
+        send_message(comrob_bot, error.message)
+
+
+async def run_sessions(comrob_bot, session_scheduler, robot_pool, execute):
+    """
+    Run the voting sessions on the loop of the bot, until cancelled.
+    :param comrob_bot: bot collecting the votes
+    :type comrob_bot: ComrobBot
+    :param session_scheduler: scheduler closing the sessions
+    :type session_scheduler: SessionScheduler
+    :param robot_pool: arms executing the winners
+    :type robot_pool: RobotPool
+    :param execute: function called with user handler, command and arm on the thread of the arm
+    :type execute: callable
+    """
+    # the first session starts when the bot is online
+    await comrob_bot.wait_until_ready_async()
     while True:
-        send_message(comrob_bot, "You have now " + str(loop_time) + "s to enter commands for the robot.")
-        time.sleep(loop_time)
-
-        # get buffer from bot
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(comrob_bot.get_command_buffer)
-            command_buffer = future.result()
-        # try selecting and running a command from the command queue
+        send_message(comrob_bot, "You can now enter commands for the robot, the session starts with the first vote.")
+        # wait until the scheduler closes the session
+        await session_scheduler.wait_for_session_async(comrob_bot.session_id)
+
+        # close session, votes arriving from now on are collected for the next session
+        _, vote_tally = comrob_bot.swap_command_buffer()
+        # the arms execute one command at a time, while the next session is collected
         try:
-            command = select_command(command_buffer)
-            send_message(comrob_bot, "Selected command: " + command[CommandKey.Function].value +
-                         str(command[CommandKey.Args]) +
-                         ", votes: " + str(command[CommandKey.Count]) + ".")
-            # try to call function on uarm
-            function = getattr(user_handler, command[CommandKey.Function].value)
-            function(*command[CommandKey.Args])
+            executions = await robot_pool.dispatch(vote_tally, execute)
         except ComrobError as error:
-            # except expected errors and send message to chat instead
             send_message(comrob_bot, error.message)
+            continue
+        # keep the next session open until the robot is expected to be free
+        for execution in executions.values():
+            execution.add_done_callback(lambda _: session_scheduler.notify_busy(robot_pool.busy_time))
+
+
+def arm_environ(name, arm):
+    """
+    Read setting of an arm from the env, settings without arm suffix apply to all arms.
+    :param name: name of the setting
+    :type name: str
+    :param arm: index of the arm
+    :type arm: int
+    :return: value of NAME_<arm> if set, otherwise value of NAME
+    :rtype: str
+    """
+    return os.environ.get(name + "_" + str(arm), os.environ[name])
+
+
+def parse_blocks(blocks):
+    """
+    Parse the blocks placed before start, e.g. "4:8:0,5:8:0,5:8:1".
+    :param blocks: comma separated user coordinates x:y:z of the blocks, None if not set
+    :type blocks: str
+    :return: user coordinates x, y, z of the blocks, None if the blocks are unknown
+    :rtype: list
+    """
+    if blocks is None:
+        return None
+    return [tuple(int(value) for value in block.split(":")) for block in blocks.split(",") if block.strip()]
+
+
+def main():
+    # load env and initialize bot
+    load_dotenv()
+    # metrics are served on localhost for scraping, if a port is set
+    metrics_port = os.environ.get("METRICS_PORT", "")
+    if metrics_port:
+        MetricsServer(port=int(metrics_port)).start()
+    # votes, sessions, commands and robot calls are recorded for replay, if a log file is set
+    event_log_path = os.environ.get("EVENT_LOG", "")
+    event_log = EventLog(event_log_path) if event_log_path else None
+    # channels are comma separated, optionally with the weight of their votes, e.g. "comrob,partner:0.5"
+    channels = dict()
+    for channel in os.environ["CHANNEL"].split(","):
+        name, _, weight = channel.strip().partition(":")
+        channels[name] = float(weight) if weight else 1
+    comrob_bot = ComrobBot(irc_token=os.environ["TMI_TOKEN"], nick=os.environ["BOT_NICK"],
+                           prefix=os.environ["BOT_PREFIX"], initial_channels=list(channels),
+                           channel_weights=channels, event_log=event_log)
+    # the scheduler closes a session depending on the votes received
+    session_scheduler = SessionScheduler(window=float(os.environ.get("WINDOW", 10.0)),
+                                         min_window=float(os.environ.get("MIN_WINDOW", 3.0)),
+                                         max_window=float(os.environ.get("MAX_WINDOW", 20.0)),
+                                         quiet_extension=float(os.environ.get("QUIET_EXTENSION", 3.0)),
+                                         quorum=int(os.environ.get("QUORUM", 10)),
+                                         majority=float(os.environ.get("MAJORITY", 0.5)))
+    comrob_bot.add_vote_callback(session_scheduler.notify_vote)
+
+    motion_profiles = MotionProfiles(traverse_speed=float(os.environ.get("TRAVERSE_SPEED", 10000)),
+                                     traverse_acceleration=float(os.environ.get("TRAVERSE_ACCELERATION", 1000)),
+                                     approach_speed=float(os.environ.get("APPROACH_SPEED", 2000)),
+                                     approach_acceleration=float(os.environ.get("APPROACH_ACCELERATION", 500)),
+                                     carry_speed=float(os.environ.get("CARRY_SPEED", 5000)),
+                                     carry_acceleration=float(os.environ.get("CARRY_ACCELERATION", 500)))
+    # serial ports of the arms, comma separated, "auto" to use all connected arms, the first arm found if not set
+    robot_ports = os.environ.get("ROBOT_PORTS", "")
+    if robot_ports == "auto":
+        ports = RobotHandler.discover_ports()
+    elif robot_ports:
+        ports = robot_ports.split(",")
+    else:
+        ports = [None]
+    # uarm, simulated or mock
+    robot_backend = RobotBackend(os.environ.get("ROBOT_BACKEND", RobotBackend.Uarm.value))
+
+    def create_user_handler(arm, port):
+        """
+        Connect arm, home it and move it to its start position.
+        """
+        # blocks on the table at start, all stacks are unknown if not set and support is only checked on known stacks
+        initial_blocks = parse_blocks(os.environ.get("INITIAL_BLOCKS_" + str(arm), os.environ.get("INITIAL_BLOCKS")))
+        return UserHandler(edge_length_xy=float(arm_environ("EDGE_LENGTH_XY", arm)),
+                           edge_length_z=float(arm_environ("EDGE_LENGTH_Z", arm)),
+                           x_offset=float(arm_environ("X_OFFSET", arm)),
+                           y_offset=float(arm_environ("Y_OFFSET", arm)),
+                           z_offset=float(arm_environ("Z_OFFSET", arm)),
+                           xy_base_offset=float(arm_environ("XY_BASE_OFFSET", arm)),
+                           z_base_offset=float(arm_environ("Z_BASE_OFFSET", arm)),
+                           min_radius_xy=float(arm_environ("MIN_RADIUS_XY", arm)),
+                           max_radius_xy=float(arm_environ("MAX_RADIUS_XY", arm)),
+                           x_start_user=int(arm_environ("X_START_USER", arm)),
+                           y_start_user=int(arm_environ("Y_START_USER", arm)),
+                           z_start_user=int(arm_environ("Z_START_USER", arm)),
+                           check_grip=os.environ.get("CHECK_GRIP", "0") == "1", initial_blocks=initial_blocks,
+                           robot_handler=RobotHandler(motion_profiles=motion_profiles, port=port,
+                                                      backend=robot_backend, event_log=event_log))
+
+    def create_robot_pool():
+        """
+        Connect all arms at the same time.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(ports)) as executor:
+            user_handlers = list(executor.map(create_user_handler, range(len(ports)), ports))
+        return RobotPool(user_handlers, PoolMode(os.environ.get("POOL_MODE", PoolMode.RoundRobin.value)),
+                         AggregationMode(os.environ.get("AGGREGATION_MODE", AggregationMode.Plurality.value)))
+
+    robot_pool = None
+
+    def validate_command(function_key, args):
+        """
+        Check commands on arrival, all commands are rejected until the arms are ready.
+        """
+        if robot_pool is None:
+            message = "The robot is starting, please wait."
+            raise ComrobError(ErrorCode.E0025, message)
+        robot_pool.validate_command(function_key, args)
+
+    # reject unreachable commands as soon as they arrive, also while the arms are connected
+    comrob_bot.set_command_validator(validate_command)
 
-        # clear buffer of bot
-        comrob_bot_thread_2 = threading.Thread(target=comrob_bot.clear_command_buffer)
-        comrob_bot_thread_2.start()
-        comrob_bot_thread_2.join()
+    def execute(user_handler, command, arm):
+        if event_log is not None:
+            event_log.command(command[CommandKey.Function], command[CommandKey.Args], command[CommandKey.Count], arm)
+        execute_command(comrob_bot, user_handler, command, arm if len(robot_pool) > 1 else None)
 
-    comrob_bot_thread_1.join()
+    # bot, scheduler and robot dispatch run on the loop of the bot, only the serial communication runs on threads
+    loop = comrob_bot.loop
+    tasks = [loop.create_task(comrob_bot.start())]
+    try:
+        # the arms are connected and homed while the bot connects to the chat
+        robot_pool = loop.run_until_complete(loop.run_in_executor(None, create_robot_pool))
+        tasks.append(loop.create_task(run_sessions(comrob_bot, session_scheduler, robot_pool, execute)))
+        loop.run_until_complete(asyncio.gather(*tasks))
+    except KeyboardInterrupt:
+        print("Shutting down.")
+    finally:
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        # the arms finish their current command
+        if robot_pool is not None:
+            robot_pool.shutdown()
+        if event_log is not None:
+            event_log.close()
+        loop.close()
 
 
 if __name__ == '__main__':
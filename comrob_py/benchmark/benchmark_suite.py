@@ -0,0 +1,264 @@
+"""
+Benchmark suite of the hot paths: vote ingestion, command selection, transforms and robot commands.
+Run with python -m comrob_py.benchmark.benchmark_suite, see --help for the options.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from collections import deque
+
+from comrob_py.comrob_bot.comrob_bot import ComrobBot, bot_loop
+from comrob_py.enums.aggregation_mode import AggregationMode
+from comrob_py.enums.command_key import CommandKey, FunctionKey
+from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.robot_handler.command_handler import select_command
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.coordinates import Coordinates, CoordinatesArray
+from comrob_py.robot_handler.robot_handler import RobotHandler
+from comrob_py.robot_handler.simulated_swift_api import SimulatedSwiftApi
+from comrob_py.robot_handler.user_handler import UserHandler
+from comrob_py.robot_handler.vote_aggregation import aggregate
+from comrob_py.robot_handler.vote_tally import VoteTally
+from comrob_py.robot_handler.wrist_solver import WristSolver
+
+# number of votes of the select_command scaling curve
+SELECT_SIZES = (1, 10, 100, 1000, 10000, 100000)
+
+
+def measure(function, repeat=5, number=1):
+    """
+    Time a function, the median of several runs is robust against outliers.
+    :param function: function to time, called without arguments
+    :type function: callable
+    :param repeat: number of runs
+    :type repeat: int
+    :param number: number of calls per run
+    :type number: int
+    :return: statistics of the time per call in s
+    :rtype: dict
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - start) / number)
+    return {"median": statistics.median(times), "min": min(times), "mean": statistics.mean(times),
+            "repeat": repeat, "number": number}
+
+
+def generate_votes(count, channels=("comrob",), seed=0):
+    """
+    Generate synthetic chat votes, mostly positions around the start position, like a busy chat.
+    :param count: number of votes
+    :type count: int
+    :param channels: channels the votes are sent in
+    :type channels: tuple
+    :param seed: seed of the random generator, the same seed gives the same votes
+    :type seed: int
+    :return: votes as (function key, args, user name, channel)
+    :rtype: list
+    """
+    generator = random.Random(seed)
+    votes = []
+    for index in range(count):
+        draw = generator.random()
+        if draw < 0.6:
+            function_key, args = FunctionKey.Position, [generator.randint(2, 7), generator.randint(5, 10)]
+        elif draw < 0.9:
+            function_key, args = FunctionKey.Height, [generator.randint(0, 4)]
+        else:
+            function_key, args = FunctionKey.Hold, []
+        votes.append((function_key, args, "user_" + str(index), generator.choice(channels)))
+    return votes
+
+
+def create_user_handler(latency=0.0):
+    """
+    Create user handler of a simulated robot, which advances a virtual clock instead of waiting.
+    """
+    swift = SimulatedSwiftApi(latency=latency, realtime=False)
+    return UserHandler(robot_handler=RobotHandler(swift=swift)), swift
+
+
+def benchmark_vote_ingestion(vote_count, repeat):
+    """
+    Votes per second added through the command handler of the bot, with and without validation.
+    """
+    user_handler, _ = create_user_handler()
+    votes = generate_votes(vote_count, channels=("comrob", "partner_1", "partner_2"))
+    results = dict()
+    for name, validator in (("vote_ingestion", None), ("vote_ingestion_validated", user_handler.validate_command)):
+        with bot_loop():
+            comrob_bot = ComrobBot("oauth:benchmark", "comrob_bot", "!", ["comrob", "partner_1", "partner_2"])
+            if validator is not None:
+                comrob_bot.set_command_validator(validator)
+
+            def ingest():
+                for vote in votes:
+                    comrob_bot.add_vote(*vote)
+                comrob_bot.swap_command_buffer()
+
+            results[name] = measure(ingest, repeat)
+        results[name]["votes_per_s"] = vote_count / results[name]["median"]
+    return results
+
+
+def benchmark_select_command(repeat, sizes=SELECT_SIZES):
+    """
+    Scaling of the command selection with the number of votes, counted from the buffer and read from the tally.
+    """
+    results = dict()
+    for size in sizes:
+        votes = generate_votes(size)
+        command_buffer = deque({CommandKey.Function: function_key, CommandKey.Args: args, CommandKey.User: user_name}
+                               for function_key, args, user_name, _ in votes)
+        vote_tally = VoteTally()
+        for function_key, args, user_name, _ in votes:
+            vote_tally.add(function_key, args, user_name)
+        results["select_command_buffer_" + str(size)] = measure(lambda: select_command(command_buffer), repeat)
+        results["select_command_tally_" + str(size)] = measure(lambda: select_command(vote_tally), repeat,
+                                                               number=100)
+        for aggregation_mode in (AggregationMode.Median, AggregationMode.Centroid, AggregationMode.Heatmap):
+            results["aggregate_" + aggregation_mode.value + "_" + str(size)] = \
+                measure(lambda: aggregate(vote_tally.commands(), aggregation_mode), repeat, number=10)
+    return results
+
+
+def benchmark_transforms(repeat):
+    """
+    Microbenchmarks of frame transforms, wrist solver and workspace checks of the user handler.
+    """
+    user_handler, _ = create_user_handler()
+    frame_registry = user_handler.frame_registry
+    reachability_map = user_handler.reachability_map
+    workspace = user_handler.workspace
+    coordinates = CoordinatesArray([[4, 8, 3]], CoordinateFrame.User)
+    batch = CoordinatesArray([[x, y, 3] for x in range(-16, 16) for y in range(32)], CoordinateFrame.User)
+    start = Coordinates(4, 8, 3, CoordinateFrame.User)
+    target = Coordinates(6, 9, 3, CoordinateFrame.User)
+    motion_planner = user_handler.motion_planner
+    wrist_solver = WristSolver(frame_registry)
+
+    return {"transform_single": measure(lambda: frame_registry.transform(coordinates, CoordinateFrame.Uarm), repeat,
+                                        number=1000),
+            "transform_batch_1024": measure(lambda: frame_registry.transform(batch, CoordinateFrame.Uarm), repeat,
+                                            number=100),
+            "reachability_lookup": measure(lambda: reachability_map.is_reachable(4, 8, 3), repeat, number=1000),
+            "workspace_contains": measure(lambda: workspace.contains(180.0, 20.0, 122.5), repeat, number=1000),
+            "wrist_solver": measure(lambda: wrist_solver.solve(start, target, 90.0), repeat, number=1000),
+            "motion_plan": measure(lambda: motion_planner.plan(start, target), repeat, number=1000),
+            "validate_command": measure(lambda: user_handler.validate_command(FunctionKey.Position, [6, 9]), repeat,
+                                        number=1000)}
+
+
+def benchmark_end_to_end(command_count, latency, repeat):
+    """
+    Latency from a closed session to the executed command on a simulated robot, in wall time and robot time.
+    """
+    user_handler, swift = create_user_handler(latency)
+    # sessions of ten votes each
+    sessions = [generate_votes(10, seed=seed) for seed in range(command_count)]
+    robot_times = []
+
+    def run():
+        for votes in sessions:
+            for vote in votes:
+                comrob_bot.add_vote(*vote)
+            _, vote_tally = comrob_bot.swap_command_buffer()
+            if len(vote_tally) == 0:
+                continue
+            start_time = swift.clock()
+            command = vote_tally.select_command()
+            try:
+                getattr(user_handler, command[CommandKey.Function].value)(*command[CommandKey.Args])
+            except ComrobError:
+                pass
+            robot_times.append(swift.clock() - start_time + user_handler.busy_time)
+
+    with bot_loop():
+        comrob_bot = ComrobBot("oauth:benchmark", "comrob_bot", "!", ["comrob"])
+        comrob_bot.set_command_validator(user_handler.validate_command)
+        result = measure(run, repeat)
+    result["median"] /= command_count
+    result["min"] /= command_count
+    result["mean"] /= command_count
+    result["robot_time_median"] = statistics.median(robot_times) if robot_times else 0.0
+    return {"end_to_end_command": result}
+
+
+def run_suite(quick=False):
+    """
+    Run all benchmarks.
+    :param quick: true for fewer votes and runs, e.g. to check that the suite works
+    :type quick: bool
+    :return: benchmark name -> statistics
+    :rtype: dict
+    """
+    repeat = 3 if quick else 7
+    results = dict()
+    results.update(benchmark_vote_ingestion(1000 if quick else 20000, repeat))
+    results.update(benchmark_select_command(repeat, SELECT_SIZES[:4] if quick else SELECT_SIZES))
+    results.update(benchmark_transforms(repeat))
+    results.update(benchmark_end_to_end(10 if quick else 100, latency=0.005, repeat=repeat))
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Compare results with a previous run.
+    :param results: benchmark name -> statistics of this run
+    :type results: dict
+    :param baseline: benchmark name -> statistics of the previous run
+    :type baseline: dict
+    :param threshold: relative slowdown of the median reported as regression
+    :type threshold: float
+    :return: benchmark name -> ratio of medians, and names of the regressed benchmarks
+    :rtype: tuple
+    """
+    ratios = dict()
+    regressions = []
+    for name, statistics_run in results.items():
+        if name not in baseline or baseline[name]["median"] <= 0.0:
+            continue
+        ratios[name] = statistics_run["median"] / baseline[name]["median"]
+        if ratios[name] > 1.0 + threshold:
+            regressions.append(name)
+    return ratios, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of comrob.")
+    parser.add_argument("--output", help="file to write the results to as json")
+    parser.add_argument("--compare", help="json file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown reported as regression")
+    parser.add_argument("--quick", action="store_true", help="fewer votes and runs")
+    arguments = parser.parse_args(argv)
+
+    results = run_suite(arguments.quick)
+    report = {"python": platform.python_version(), "platform": platform.platform(), "time": time.time(),
+              "results": results}
+    for name, statistics_run in results.items():
+        print(name.ljust(36), "%.3e s" % statistics_run["median"])
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        ratios, regressions = compare(results, baseline, arguments.threshold)
+        for name, ratio in ratios.items():
+            print(name.ljust(36), "%.2fx" % ratio, "REGRESSION" if name in regressions else "")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Test file for benchmark suite.
+"""
+import unittest
+
+from comrob_py.benchmark.benchmark_suite import benchmark_select_command, compare, generate_votes
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_generate_votes(self):
+        """
+        Test that the same seed generates the same votes from different users.
+        """
+        votes = generate_votes(100, channels=("channel_1", "channel_2"), seed=1)
+        self.assertEqual(votes, generate_votes(100, channels=("channel_1", "channel_2"), seed=1))
+        self.assertEqual(len({user_name for _, _, user_name, _ in votes}), 100)
+
+    def test_compare(self):
+        """
+        Test that slowdowns above the threshold are reported as regression.
+        """
+        results = benchmark_select_command(repeat=1, sizes=(10,))
+        self.assertEqual(set(results), {"select_command_buffer_10", "select_command_tally_10", "aggregate_median_10",
+                                        "aggregate_centroid_10", "aggregate_heatmap_10"})
+        baseline = {"select_command_buffer_10": {"median": results["select_command_buffer_10"]["median"] / 2},
+                    "select_command_tally_10": {"median": results["select_command_tally_10"]["median"]}}
+        ratios, regressions = compare(results, baseline, threshold=0.2)
+        self.assertAlmostEqual(ratios["select_command_buffer_10"], 2.0)
+        self.assertEqual(regressions, ["select_command_buffer_10"])
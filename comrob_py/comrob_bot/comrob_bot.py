@@ -2,18 +2,79 @@
 This file contains the twitch-bot allowing to communicate with the comrob.
 """
 import asyncio
+import re
+import threading
+import weakref
 
 from collections import deque
+from contextlib import contextmanager
 from twitchio.ext import commands
 
+from comrob_py.comrob_bot.message_queue import MessageQueue
 from comrob_py.enums.command_key import CommandKey, FunctionKey
+from comrob_py.metrics.metrics import registry
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.vote_tally import VoteTally
+
+MESSAGES = registry.counter("comrob_chat_messages_total", "Chat messages received.", ("channel",))
+MESSAGE_SECONDS = registry.histogram("comrob_chat_message_seconds",
+                                     "Duration from receiving a chat message until its vote is buffered or rejected.")
+DROPPED_MESSAGES = registry.counter("comrob_chat_messages_dropped_total",
+                                    "Chat messages dropped before command dispatch, no command or malformed.",
+                                    ("channel", "reason"))
+VOTES = registry.counter("comrob_votes_total", "Votes by result, accepted or the reason of the rejection.",
+                         ("channel", "result"))
+
+# bots not closed yet, closed by bot_loop when their loop is closed
+OPEN_BOTS = weakref.WeakSet()
+
+# grammar of the arguments of every command, integers separated by spaces, the arm is optional
+COMMAND_ARGUMENTS = {FunctionKey.Height: (1, 2), FunctionKey.Position: (2, 3), FunctionKey.Hold: (0, 1),
+                     FunctionKey.Move: (4, 5)}
+
+
+def compile_command_pattern(prefixes):
+    """
+    Compile pattern matching the chat messages which are well-formed commands.
+    :param prefixes: prefix or prefixes of the commands
+    :type prefixes: str or list
+    :return: pattern matching a whole message
+    :rtype: re.Pattern
+    """
+    prefixes = [prefixes] if isinstance(prefixes, str) else prefixes
+    commands_pattern = "|".join(function_key.value + r"(?:\s+[+-]?\d+){" + str(minimum) + "," + str(maximum) + "}"
+                                for function_key, (minimum, maximum) in COMMAND_ARGUMENTS.items())
+    return re.compile("(?:" + "|".join(re.escape(prefix) for prefix in prefixes) + ")(?:" + commands_pattern +
+                      r")\s*")
+
+
+@contextmanager
+def bot_loop():
+    """
+    Event loop for bots which are never connected, the background tasks of the bots are cancelled and the bots are
+    closed afterwards.
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        yield loop
+    finally:
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        bots = [comrob_bot for comrob_bot in OPEN_BOTS if comrob_bot.loop is loop]
+        loop.run_until_complete(asyncio.gather(*(comrob_bot.close() for comrob_bot in bots)))
+        loop.close()
+        asyncio.set_event_loop(None)
 
 
 class ComrobBot:
     """
     The ComrobBot class handles the communication with the twitch chat and the robot controller
     """
-    def __init__(self, irc_token, nick, prefix, initial_channels):
+    def __init__(self, irc_token, nick, prefix, initial_channels, digest_interval=5.0, rate_limit=20,
+                 rate_period=30.0, channel_weights=None, event_log=None):
         """
         Init function for the bot.
         :param irc_token: oath token to use for irc for twitch chat
@@ -24,12 +85,47 @@ class ComrobBot:
         :type prefix: str
         :param initial_channels: channels for bot to join on startup
         :type initial_channels: list
+        :param digest_interval: time between two summaries of the received votes in s
+        :type digest_interval: float
+        :param rate_limit: maximum number of messages sent by the bot within rate_period
+        :type rate_limit: int
+        :param rate_period: period of the message rate limit in s
+        :type rate_period: float
+        :param channel_weights: channel -> weight of the votes from this channel, all votes count 1 if None
+        :type channel_weights: dict
+        :param event_log: log to record votes and sessions in, nothing is recorded if None
+        :type event_log: EventLog
         """
         # set up the bot
         self.__bot = commands.Bot(irc_token=irc_token, nick=nick, prefix=prefix, initial_channels=initial_channels)
+        # messages not matching are dropped before twitchio parses them
+        self.__prefixes = tuple([prefix] if isinstance(prefix, str) else prefix)
+        self.__command_pattern = compile_command_pattern(self.__prefixes)
         self.__command_buffer = deque()
+        # live count of the votes in the command buffer
+        self.__vote_tally = VoteTally()
+        # guards buffer and tally, so that a vote is never split between two sessions
+        self.__buffer_lock = threading.Lock()
+        # outgoing messages are sent by one queue on the loop of the bot
+        self.__message_queue = MessageQueue(self.__bot.loop, self.__send_privmsg, self.__bot.initial_channels,
+                                            rate_limit=rate_limit, rate_period=rate_period)
+        self.__digest_interval = digest_interval
+        self.__channel_weights = {channel.lower(): weight for channel, weight in (channel_weights or dict()).items()}
+        # channel -> votes acknowledged in the next digest of the channel instead of one message per vote
+        self.__received_votes = dict()
+        self.__rejected_votes = dict()
+        self.__invalid_votes = dict()
+        self.__event_log = event_log
+        # function checking commands on arrival, raising a ComrobError for invalid commands
+        self.__command_validator = None
+        # functions called with the vote tally after every accepted vote
+        self.__vote_callbacks = []
+        # set when the bot is online, for threads and for the loop of the bot
+        self.__ready = threading.Event()
+        self.__ready_async = asyncio.Event()
 
         self.__set_up()
+        OPEN_BOTS.add(self)
 
     def __set_up(self):
         """
@@ -40,10 +136,20 @@ class ComrobBot:
             """
             Function called when the bot goes online.
             """
+            # the digests are only started once, also if the bot reconnects
+            if self.__ready.is_set():
+                return
             print(self.__bot.nick, "is online!")
-            # this is only needed to send messages within event_ready
-            ws = self.__bot._ws
-            await ws.send_privmsg(*self.__bot.initial_channels, f"/me is online!")
+            self.__message_queue.start()
+            # every channel gets a digest of its own votes, only if it voted since its last digest
+            for channel in self.__bot.initial_channels:
+                channel = channel.lower()
+                self.__message_queue.add_digest(lambda channel=channel: self.__vote_digest(channel),
+                                                self.__digest_interval, channel,
+                                                lambda channel=channel: self.__has_votes(channel))
+            self.__message_queue.put("/me is online!")
+            self.__ready.set()
+            self.__ready_async.set()
 
         @self.__bot.event
         async def event_message(context):
@@ -56,61 +162,80 @@ class ComrobBot:
             if context.author.name.lower() == self.__bot.nick.lower():
                 return
 
-            await self.__bot.handle_commands(context)
+            channel = context.channel.name.lower()
+            MESSAGES.inc(channel)
+            # most chat messages are no commands, they are dropped before the command dispatch of twitchio
+            if not context.content.startswith(self.__prefixes):
+                DROPPED_MESSAGES.inc(channel, "no_command")
+                return
+            if self.__command_pattern.fullmatch(context.content) is None:
+                DROPPED_MESSAGES.inc(channel, "malformed")
+                return
+            with MESSAGE_SECONDS.time():
+                await self.__bot.handle_commands(context)
 
         @self.__bot.command()
-        async def height(context, z: int):
+        async def height(context, z: int, arm: int = None):
             """
-            Height command !height z. Adds command "height" with argument z to the command queue.
+            Height command !height z [arm]. Adds command "height" with argument z to the command queue.
             :param context: message context
             :type context: twitchio.dataclasses.Message
             :param z: argument of height function, indicates target height of robot in user frame
             :type z: int
+            :param arm: arm to move, if there are several arms
+            :type arm: int
             """
-            user_name = context.author.name.lower()
-            if self.__check_user(user_name):
-                await context.send("Only one command per user per session @" + user_name + ".")
-                return
-            self.__command_buffer.append({CommandKey.Function: FunctionKey.Height,
-                                          CommandKey.Args: [z],
-                                          CommandKey.User: user_name})
-            await context.send("Command: \"height " + str(z) + "\" added to the command queue.")
+            self.__add_command(FunctionKey.Height, self.__with_arm([z], arm), context.author.name.lower(),
+                               context.channel.name.lower())
 
         @self.__bot.command()
-        async def position(context, x: int, y: int):
+        async def position(context, x: int, y: int, arm: int = None):
             """
-            Position command !position x y. Adds command position with arguments x and y to the command queue.
+            Position command !position x y [arm]. Adds command position with arguments x and y to the command queue.
             :param context: message context
             :type context: twitchio.dataclasses.Message
             :param x: argument of position function, indicates target x-position of robot in user frame
             :type x: int
             :param y: argument of position function, indicates target y-position of robot in user frame
             :type y: int
+            :param arm: arm to move, if there are several arms
+            :type arm: int
             """
-            user_name = context.author.name.lower()
-            if self.__check_user(user_name):
-                await context.send("Only one command per user per session @" + user_name + ".")
-                return
-            self.__command_buffer.append({CommandKey.Function: FunctionKey.Position,
-                                          CommandKey.Args: [x, y],
-                                          CommandKey.User: user_name})
-            await context.send("Command: \"position " + str(x) + " " + str(y) + "\" added to the command queue.")
+            self.__add_command(FunctionKey.Position, self.__with_arm([x, y], arm), context.author.name.lower(),
+                               context.channel.name.lower())
 
         @self.__bot.command()
-        async def hold(context):
+        async def hold(context, arm: int = None):
             """
-            Hold command !position x y. Adds command hold to the command queue. Toggles holding of a block.
+            Hold command !hold [arm]. Adds command hold to the command queue. Toggles holding of a block.
             :param context: message context
             :type context: twitchio.dataclasses.Message
+            :param arm: arm to pick up or drop with, if there are several arms
+            :type arm: int
             """
-            user_name = context.author.name.lower()
-            if self.__check_user(user_name):
-                await context.send("Only one command per user per session @" + user_name + ".")
-                return
-            self.__command_buffer.append({CommandKey.Function: FunctionKey.Hold,
-                                          CommandKey.Args: [],
-                                          CommandKey.User: user_name})
-            await context.send("Command: \"hold\" added to the command queue.")
+            self.__add_command(FunctionKey.Hold, self.__with_arm([], arm), context.author.name.lower(),
+                               context.channel.name.lower())
+
+        @self.__bot.command()
+        async def move(context, x_from: int, y_from: int, x_to: int, y_to: int, arm: int = None):
+            """
+            Move command !move x_from y_from x_to y_to [arm]. Adds command move to the command queue. Moves the top
+            block of one stack onto another stack.
+            :param context: message context
+            :type context: twitchio.dataclasses.Message
+            :param x_from: x-position in user frame of the stack to take the block from
+            :type x_from: int
+            :param y_from: y-position in user frame of the stack to take the block from
+            :type y_from: int
+            :param x_to: x-position in user frame of the stack to put the block on
+            :type x_to: int
+            :param y_to: y-position in user frame of the stack to put the block on
+            :type y_to: int
+            :param arm: arm to move the block with, if there are several arms
+            :type arm: int
+            """
+            self.__add_command(FunctionKey.Move, self.__with_arm([x_from, y_from, x_to, y_to], arm),
+                               context.author.name.lower(), context.channel.name.lower())
 
     def run(self):
         """
@@ -118,38 +243,235 @@ class ComrobBot:
         """
         self.__bot.run()
 
-    def get_command_buffer(self):
+    async def start(self):
+        """
+        Run bot on its event loop, until it is cancelled. Stops sending messages when it returns.
+        """
+        try:
+            await self.__bot.start()
+        finally:
+            self.__message_queue.stop()
+
+    async def close(self):
+        """
+        Stop sending messages and close the http session of the bot, needs to be called on the event loop of the bot.
+        """
+        self.__message_queue.stop()
+        await self.__bot.http._session.close()
+        OPEN_BOTS.discard(self)
+
+    @property
+    def loop(self):
+        """
+        Event loop of the bot.
+        """
+        return self.__bot.loop
+
+    @property
+    def ready(self):
+        """
+        True if the bot is online.
+        """
+        return self.__ready.is_set()
+
+    def wait_until_ready(self, timeout=None):
+        """
+        Wait until the bot is online (blocking), messages sent before are queued until then.
+        :param timeout: maximum time to wait in s, no limit if None
+        :type timeout: float
+        :return: true if the bot is online
+        :rtype: bool
+        """
+        return self.__ready.wait(timeout)
+
+    async def wait_until_ready_async(self):
+        """
+        Wait on the loop of the bot until the bot is online.
+        """
+        await self.__ready_async.wait()
+
+    @property
+    def session_id(self):
+        """
+        Id of the current voting session.
+        """
+        return self.__vote_tally.session_id
+
+    def add_vote_callback(self, callback):
+        """
+        Add function, which is called on the loop of the bot with the live vote tally after every accepted vote.
+        :param callback: function taking the vote tally as argument
+        :type callback: callable
+        """
+        self.__vote_callbacks.append(callback)
+
+    def set_command_validator(self, validator):
+        """
+        Set function, which checks every command on arrival. Commands for which the validator raises a ComrobError are
+        not added to the command buffer.
+        :param validator: function taking function key and arguments of a command
+        :type validator: callable
+        """
+        self.__command_validator = validator
+
+    def add_vote(self, function_key, args, user_name, channel):
+        """
+        Add vote as if it was sent in chat, e.g. to generate load without a chat connection.
+        :param function_key: function of the command
+        :type function_key: FunctionKey
+        :param args: arguments of the command
+        :type args: list
+        :param user_name: name of user submitting the command
+        :type user_name: str
+        :param channel: channel the command was sent in
+        :type channel: str
+        :return: true if command was added
+        :rtype: bool
+        """
+        return self.__add_command(function_key, args, user_name.lower(), channel.lower())
+
+    def get_command_buffer(self, channel=None):
         """
         Get command buffer.
+        :param channel: channel to get the commands of, all channels if None
+        :type channel: str
         :return: buffer storing all command added
         :rtype: deque
         """
-        return self.__command_buffer.copy()
+        with self.__buffer_lock:
+            if channel is None:
+                return self.__command_buffer.copy()
+            return deque(command for command in self.__command_buffer if command[CommandKey.Channel] == channel)
+
+    def get_vote_tally(self):
+        """
+        Get vote tally of the current session.
+        :return: tally counting all commands added
+        :rtype: VoteTally
+        """
+        with self.__buffer_lock:
+            return self.__vote_tally.copy()
 
     def clear_command_buffer(self):
         """
-        Clears command buffer.
+        Clears command buffer and starts a new session tally.
         """
-        self.__command_buffer = deque()
+        self.swap_command_buffer()
 
-    def send_message(self, message):
+    def swap_command_buffer(self):
+        """
+        Close the current session and start collecting the next one with an empty buffer and tally (atomic).
+        :return: command buffer and vote tally of the closed session
+        :rtype: tuple
+        """
+        with self.__buffer_lock:
+            command_buffer = self.__command_buffer
+            vote_tally = self.__vote_tally
+            self.__command_buffer = deque()
+            self.__vote_tally = VoteTally(vote_tally.session_id + 1)
+        if self.__event_log is not None:
+            self.__event_log.session(vote_tally.session_id, len(vote_tally))
+        return command_buffer, vote_tally
+
+    def send_message(self, message, channel=None):
         """
         Send message to stream at any time.
         :param message: message to be sent in channel chat
         :type message: str
+        :param channel: channel to send the message to, all channels if None
+        :type channel: str
         """
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        self.__message_queue.put(message, channel)
 
-        loop.run_until_complete(self.__bot._ws.send_privmsg(*self.__bot.initial_channels, message))
-        loop.close()
+    async def __send_privmsg(self, message, channel):
+        """
+        Send message to a channel, only called by the message queue.
+        :param message: message to be sent in channel chat
+        :type message: str
+        :param channel: channel to send the message to
+        :type channel: str
+        """
+        await self.__bot._ws.send_privmsg(channel, message)
+
+    def __has_votes(self, channel):
+        """
+        Check if votes were received in a channel since its last digest.
+        """
+        return channel in self.__received_votes or channel in self.__rejected_votes or channel in self.__invalid_votes
+
+    def __vote_digest(self, channel):
+        """
+        Summary of the votes received in a channel since the last digest.
+        :param channel: channel to summarize
+        :type channel: str
+        :return: digest message, None if no vote was received
+        :rtype: str
+        """
+        received_votes = self.__received_votes.pop(channel, 0)
+        rejected_votes = self.__rejected_votes.pop(channel, 0)
+        invalid_votes = self.__invalid_votes.pop(channel, 0)
+        if received_votes == 0 and rejected_votes == 0 and invalid_votes == 0:
+            return None
 
-    def __check_user(self, user_name):
+        message = ""
+        if received_votes > 0:
+            message += str(received_votes) + " votes received"
+            # the session might have been closed since the votes were received
+            if len(self.__vote_tally) > 0:
+                command = self.__vote_tally.select_command()
+                message += ", leading: " + " ".join([command[CommandKey.Function].value] +
+                                                    [str(arg) for arg in command[CommandKey.Args]])
+            message += ". "
+        if rejected_votes > 0:
+            message += str(rejected_votes) + " votes ignored, only one command per user per session. "
+        if invalid_votes > 0:
+            message += str(invalid_votes) + " votes ignored, target not reachable."
+        return message.strip()
+
+    @staticmethod
+    def __with_arm(args, arm):
+        """
+        Append the chosen arm to the arguments of a command, the robot pool splits it off again.
         """
-        Check if user already submitted command in command queue.
-        :param user_name: name of user to be checked
+        return args if arm is None else args + [arm]
+
+    def __add_command(self, function_key, args, user_name, channel):
+        """
+        Add command to command buffer, if it is valid and user did not submit a command in this channel and session
+        yet.
+        :param function_key: function of the command
+        :type function_key: FunctionKey
+        :param args: arguments of the command
+        :type args: list
+        :param user_name: name of user submitting the command
         :type user_name: str
-        :return: true if user name in command buffer
+        :param channel: channel the command was sent in
+        :type channel: str
+        :return: true if command was added
         :rtype: bool
         """
-        return user_name in [info[CommandKey.User] for info in self.__command_buffer]
+        if self.__event_log is not None:
+            self.__event_log.vote(function_key, args, user_name, channel)
+        if self.__command_validator is not None:
+            try:
+                self.__command_validator(function_key, args)
+            except ComrobError as error:
+                self.__invalid_votes[channel] = self.__invalid_votes.get(channel, 0) + 1
+                VOTES.inc(channel, error.error_code.name)
+                return False
+
+        with self.__buffer_lock:
+            vote_tally = self.__vote_tally
+            if not vote_tally.add(function_key, args, (channel, user_name), self.__channel_weights.get(channel, 1)):
+                self.__rejected_votes[channel] = self.__rejected_votes.get(channel, 0) + 1
+                VOTES.inc(channel, "duplicate")
+                return False
+            self.__command_buffer.append({CommandKey.Function: function_key,
+                                          CommandKey.Args: args,
+                                          CommandKey.User: user_name,
+                                          CommandKey.Channel: channel})
+        self.__received_votes[channel] = self.__received_votes.get(channel, 0) + 1
+        VOTES.inc(channel, "accepted")
+        for callback in self.__vote_callbacks:
+            callback(vote_tally)
+        return True
@@ -0,0 +1,157 @@
+"""
+This file contains the MessageQueue, which sends all outgoing chat messages of the bot from its own event loop.
+"""
+import asyncio
+import time
+
+from collections import deque
+
+from comrob_py.metrics.metrics import registry
+
+DROPPED_MESSAGES = registry.counter("comrob_outgoing_messages_dropped_total",
+                                    "Outgoing chat messages dropped because the queue was full.")
+FAILED_MESSAGES = registry.counter("comrob_outgoing_messages_failed_total",
+                                   "Outgoing chat messages which could not be sent to a channel.")
+
+
+class MessageQueue:
+    """
+    The MessageQueue collects outgoing messages from any thread and sends them on the event loop of the bot, keeping
+    the number of sent messages below the rate limit of twitch. The limit counts every message sent to a channel, so a
+    message to all channels counts once per channel. Digests are only sent while no other message is waiting, so they
+    never delay or crowd out other messages.
+    """
+    def __init__(self, loop, send, channels, rate_limit=20, rate_period=30.0, max_size=100):
+        """
+        Constructor.
+        :param loop: event loop of the bot, all messages are sent on this loop
+        :type loop: asyncio.AbstractEventLoop
+        :param send: coroutine function sending one message to one channel
+        :type send: callable
+        :param channels: channels to send messages to all channels to
+        :type channels: list
+        :param rate_limit: maximum number of messages sent within rate_period
+        :type rate_limit: int
+        :param rate_period: period of the rate limit in s
+        :type rate_period: float
+        :param max_size: maximum number of queued messages, not counting digests, further messages are dropped
+        :type max_size: int
+        """
+        self.__loop = loop
+        self.__send = send
+        self.__channels = list(channels)
+        self.__rate_limit = rate_limit
+        self.__rate_period = rate_period
+        self.__queue = asyncio.Queue(maxsize=max_size)
+        # time stamps of the messages sent within the last rate period
+        self.__send_times = deque()
+        # digests and their channels waiting to be sent, a digest is only queued again after it was sent
+        self.__digests = deque()
+        self.__queued_digests = set()
+        self.__tasks = []
+
+    def start(self):
+        """
+        Start sending queued messages, needs to be called on the event loop of the bot.
+        """
+        self.__tasks.append(self.__loop.create_task(self.__process()))
+
+    def add_digest(self, digest, interval, channel=None, active=None):
+        """
+        Periodically queue a digest message, needs to be called on the event loop of the bot. The message is created
+        when it is sent, so a digest delayed by the rate limit is not followed by stale ones.
+        :param digest: function returning the digest message, or None if there is nothing to send
+        :type digest: callable
+        :param interval: time between two digests in s
+        :type interval: float
+        :param channel: channel to send the digest to, all channels if None
+        :type channel: str
+        :param active: function returning true if there is something to report, the digest is queued every interval if
+            None
+        :type active: callable
+        """
+        self.__tasks.append(self.__loop.create_task(self.__run_digest(digest, interval, channel, active)))
+
+    def stop(self):
+        """
+        Stop sending messages, messages left in the queue are dropped.
+        """
+        for task in self.__tasks:
+            self.__loop.call_soon_threadsafe(task.cancel)
+        self.__tasks = []
+
+    def put(self, message, channel=None):
+        """
+        Queue message to be sent, can be called from any thread.
+        :param message: message to be sent
+        :type message: str
+        :param channel: channel to send the message to, all channels if None
+        :type channel: str
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self.__loop:
+            self.__put((message, channel))
+        else:
+            self.__loop.call_soon_threadsafe(self.__put, (message, channel))
+
+    def __put(self, item):
+        """
+        Queue message and channel, the message is dropped if the queue is full.
+        """
+        try:
+            self.__queue.put_nowait(item)
+        except asyncio.QueueFull:
+            DROPPED_MESSAGES.inc()
+
+    async def __process(self):
+        """
+        Send queued messages one after the other, one message per channel, digests only if no message is waiting.
+        """
+        while True:
+            if self.__queue.empty() and self.__digests:
+                digest, channel = self.__digests.popleft()
+                self.__queued_digests.discard(digest)
+                message = digest()
+                if message is None:
+                    continue
+            else:
+                item = await self.__queue.get()
+                # None only wakes up the loop to send the digests
+                if item is None:
+                    continue
+                message, channel = item
+            for target in (self.__channels if channel is None else [channel]):
+                await self.__wait_for_rate_limit()
+                try:
+                    await self.__send(message, target)
+                except Exception:  # a failed message must not stop the queue
+                    FAILED_MESSAGES.inc()
+
+    async def __wait_for_rate_limit(self):
+        """
+        Wait until another message can be sent without exceeding the rate limit.
+        """
+        now = time.monotonic()
+        while self.__send_times and now - self.__send_times[0] >= self.__rate_period:
+            self.__send_times.popleft()
+        if len(self.__send_times) >= self.__rate_limit:
+            await asyncio.sleep(self.__send_times[0] + self.__rate_period - now)
+            self.__send_times.popleft()
+        self.__send_times.append(time.monotonic())
+
+    async def __run_digest(self, digest, interval, channel, active):
+        """
+        Queue digest every interval, unless it is still waiting or there is nothing to report.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if digest in self.__queued_digests or (active is not None and not active()):
+                continue
+            self.__digests.append((digest, channel))
+            self.__queued_digests.add(digest)
+            if self.__queue.empty():
+                self.__queue.put_nowait(None)
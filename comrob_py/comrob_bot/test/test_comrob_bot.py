@@ -0,0 +1,54 @@
+"""
+Test file for comrob bot.
+"""
+import unittest
+
+from comrob_py.comrob_bot.comrob_bot import OPEN_BOTS, ComrobBot, bot_loop, compile_command_pattern
+from comrob_py.enums.command_key import FunctionKey
+
+
+class TestComrobBot(unittest.TestCase):
+    def test_ready(self):
+        """
+        Test that a bot is not ready before it is online.
+        """
+        with bot_loop():
+            comrob_bot = ComrobBot("oauth:test", "comrob_bot", "!", ["comrob"])
+            self.assertFalse(comrob_bot.ready)
+            self.assertFalse(comrob_bot.wait_until_ready(timeout=0.01))
+
+    def test_close(self):
+        """
+        Test that the bots are closed with their loop.
+        """
+        with bot_loop():
+            comrob_bot = ComrobBot("oauth:test", "comrob_bot", "!", ["comrob"])
+            self.assertIn(comrob_bot, OPEN_BOTS)
+        self.assertNotIn(comrob_bot, OPEN_BOTS)
+
+    def test_add_vote(self):
+        """
+        Test that every user votes once per channel and session.
+        """
+        with bot_loop():
+            comrob_bot = ComrobBot("oauth:test", "comrob_bot", "!", ["comrob", "partner"])
+            self.assertTrue(comrob_bot.add_vote(FunctionKey.Height, [2], "User_1", "comrob"))
+            self.assertFalse(comrob_bot.add_vote(FunctionKey.Height, [3], "user_1", "comrob"))
+            self.assertTrue(comrob_bot.add_vote(FunctionKey.Height, [3], "user_1", "partner"))
+            self.assertEqual(len(comrob_bot.get_command_buffer("comrob")), 1)
+            _, vote_tally = comrob_bot.swap_command_buffer()
+            self.assertEqual(len(vote_tally), 2)
+            self.assertEqual(len(comrob_bot.get_command_buffer()), 0)
+
+    def test_command_pattern(self):
+        """
+        Test that only well-formed commands pass the prefilter.
+        """
+        command_pattern = compile_command_pattern("!")
+        for message in ("!height 3", "!height 3 1", "!position 4 8", "!position -1 2 1 ", "!hold", "!hold 1",
+                        "!move 5 9 6 9", "!move 5 9 6 9 1"):
+            self.assertIsNotNone(command_pattern.fullmatch(message), message)
+        for message in ("hello", "!height", "!height x", "!heightx 3", "!position 4", "!hold 1 2", "?hold",
+                        "!move 5 9 6"):
+            self.assertIsNone(command_pattern.fullmatch(message), message)
+        self.assertIsNotNone(compile_command_pattern(["!", "?"]).fullmatch("?hold"))
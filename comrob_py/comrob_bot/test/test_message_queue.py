@@ -0,0 +1,144 @@
+"""
+Test file for message queue.
+"""
+import asyncio
+import threading
+import time
+import unittest
+
+from comrob_py.comrob_bot.message_queue import DROPPED_MESSAGES, FAILED_MESSAGES, MessageQueue
+
+
+class TestMessageQueue(unittest.TestCase):
+    def setUp(self):
+        self.__loop = asyncio.new_event_loop()
+        self.__sent = []
+        self.__channels = []
+        super().setUp()
+
+    def tearDown(self):
+        self.__loop.close()
+        super().tearDown()
+
+    async def __send(self, message, channel):
+        self.__sent.append((time.monotonic(), message))
+        self.__channels.append(channel)
+
+    def test_rate_limit(self):
+        """
+        Test that messages are sent in order and paced by the rate limit.
+        """
+        message_queue = MessageQueue(self.__loop, self.__send, ["channel_1"], rate_limit=2, rate_period=0.2)
+
+        async def run():
+            message_queue.start()
+            for index in range(5):
+                message_queue.put(str(index))
+            await asyncio.sleep(0.5)
+            message_queue.stop()
+
+        self.__loop.run_until_complete(run())
+        self.assertEqual([message for _, message in self.__sent], ["0", "1", "2", "3", "4"])
+        # at most two messages within every rate period
+        self.assertGreaterEqual(self.__sent[2][0] - self.__sent[0][0], 0.19)
+        self.assertGreaterEqual(self.__sent[4][0] - self.__sent[2][0], 0.19)
+
+    def test_put_from_thread(self):
+        """
+        Test queuing messages from another thread.
+        """
+        message_queue = MessageQueue(self.__loop, self.__send, ["channel_1"])
+
+        async def run():
+            message_queue.start()
+            thread = threading.Thread(target=message_queue.put, args=("message",))
+            thread.start()
+            thread.join()
+            await asyncio.sleep(0.05)
+            message_queue.stop()
+
+        self.__loop.run_until_complete(run())
+        self.assertEqual([message for _, message in self.__sent], ["message"])
+
+    def test_send_error(self):
+        """
+        Test that a message which could not be sent is counted and does not stop the queue.
+        """
+        async def send(message, channel):
+            if message == "failing":
+                raise ConnectionError("connection lost")
+            await self.__send(message, channel)
+
+        message_queue = MessageQueue(self.__loop, send, ["channel_1"])
+        failed = FAILED_MESSAGES.value()
+
+        async def run():
+            message_queue.start()
+            message_queue.put("failing")
+            message_queue.put("message")
+            await asyncio.sleep(0.05)
+            message_queue.stop()
+
+        self.__loop.run_until_complete(run())
+        self.assertEqual([message for _, message in self.__sent], ["message"])
+        self.assertEqual(FAILED_MESSAGES.value() - failed, 1)
+
+    def test_digest(self):
+        """
+        Test that digests are only queued if there is something to report.
+        """
+        message_queue = MessageQueue(self.__loop, self.__send, ["channel_1"])
+        digests = ["2 votes received.", None]
+
+        async def run():
+            message_queue.start()
+            message_queue.add_digest(lambda: digests.pop(0) if digests else None, 0.02, "channel_1")
+            await asyncio.sleep(0.1)
+            message_queue.stop()
+
+        self.__loop.run_until_complete(run())
+        self.assertEqual([message for _, message in self.__sent], ["2 votes received."])
+        self.assertEqual(self.__channels, ["channel_1"])
+
+    def test_broadcast(self):
+        """
+        Test that a message to all channels counts once per channel for the rate limit.
+        """
+        message_queue = MessageQueue(self.__loop, self.__send, ["channel_1", "channel_2", "channel_3"], rate_limit=2,
+                                     rate_period=0.2)
+
+        async def run():
+            message_queue.start()
+            message_queue.put("message")
+            await asyncio.sleep(0.3)
+            message_queue.stop()
+
+        self.__loop.run_until_complete(run())
+        self.assertEqual(self.__channels, ["channel_1", "channel_2", "channel_3"])
+        self.assertGreaterEqual(self.__sent[2][0] - self.__sent[0][0], 0.19)
+
+    def test_max_size(self):
+        """
+        Test that messages are dropped if the queue is full and that digests wait for the other messages.
+        """
+        message_queue = MessageQueue(self.__loop, self.__send, ["channel_1"], rate_limit=3, rate_period=0.2,
+                                     max_size=2)
+        digests = []
+        dropped = DROPPED_MESSAGES.value()
+
+        def digest():
+            digests.append(len(digests))
+            return str(digests[-1]) + " votes received."
+
+        async def run():
+            message_queue.start()
+            message_queue.add_digest(digest, 0.01, active=lambda: not digests)
+            for index in range(3):
+                message_queue.put(str(index))
+            await asyncio.sleep(0.1)
+            message_queue.stop()
+
+        self.__loop.run_until_complete(run())
+        # the digest is sent after the messages, only once while it is active
+        self.assertEqual([message for _, message in self.__sent], ["0", "1", "0 votes received."])
+        self.assertEqual(DROPPED_MESSAGES.value() - dropped, 1)
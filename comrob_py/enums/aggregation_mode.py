@@ -0,0 +1,18 @@
+"""
+This file stores the enum of the ways the votes of a session are aggregated.
+"""
+from enum import Enum
+
+
+class AggregationMode(Enum):
+    """
+    The AggregationMode enum denotes how the winning command is computed from the votes of a session.
+    """
+    # the command with the most identical votes wins
+    Plurality = "plurality"
+    # the weighted median of the voted targets wins, per axis
+    Median = "median"
+    # the centroid of the densest cluster of voted targets wins
+    Centroid = "centroid"
+    # the voted target with the most votes in its neighborhood wins
+    Heatmap = "heatmap"
@@ -10,9 +10,11 @@ class CommandKey(Enum):
     Args = 1
     User = 2
     Count = 3
+    Channel = 4
 
 
 class FunctionKey(Enum):
     Height = "height"
     Position = "position"
     Hold = "hold"
+    Move = "move"
@@ -0,0 +1,18 @@
+"""
+This file stores the enum of the records of the event log.
+"""
+from enum import Enum
+
+
+class EventType(Enum):
+    """
+    The EventType enum denotes what a record of the event log describes.
+    """
+    # vote received from chat, before it is checked
+    Vote = 0
+    # session closed, votes from now on belong to the next session
+    Session = 1
+    # command selected to be executed
+    Command = 2
+    # call of the robot handler to the swift api
+    RobotCall = 3
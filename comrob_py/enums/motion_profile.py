@@ -0,0 +1,16 @@
+"""
+This file stores the enum of the motion profiles of the uarm.
+"""
+from enum import Enum
+
+
+class MotionProfile(Enum):
+    """
+    The MotionProfile enum denotes how fast a move is executed.
+    """
+    # free moves of the end-effector
+    Traverse = "traverse"
+    # moves towards blocks, e.g. lowering onto a block
+    Approach = "approach"
+    # moves while holding a block
+    Carry = "carry"
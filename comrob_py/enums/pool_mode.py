@@ -0,0 +1,14 @@
+"""
+This file stores the enum of the modes of the robot pool.
+"""
+from enum import Enum
+
+
+class PoolMode(Enum):
+    """
+    The PoolMode enum denotes how the sessions are distributed between the arms of a robot pool.
+    """
+    # the winner of every session is executed by the next arm in turn
+    RoundRobin = "round_robin"
+    # votes choose an arm, the winner of every arm is executed in parallel
+    Independent = "independent"
@@ -0,0 +1,13 @@
+"""
+This file stores the enum of the pump status reported by the uarm.
+"""
+from enum import Enum
+
+
+class PumpStatus(Enum):
+    """
+    The PumpStatus enum denotes the state of the pump, as returned by the swift api.
+    """
+    Stop = 0
+    Working = 1
+    Grabbing = 2
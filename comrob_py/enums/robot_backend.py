@@ -0,0 +1,16 @@
+"""
+This file stores the enum of the devices the robot handler can control.
+"""
+from enum import Enum
+
+
+class RobotBackend(Enum):
+    """
+    The RobotBackend enum denotes which device the robot handler sends its commands to.
+    """
+    # uArm swift pro connected by USB
+    Uarm = "uarm"
+    # simulated uArm with timing of moves and serial communication
+    Simulated = "simulated"
+    # mock executing every command at once, without timing
+    Mock = "mock"
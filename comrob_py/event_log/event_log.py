@@ -0,0 +1,121 @@
+"""
+This file contains the EventLog, an append-only file of everything that happened during a stream.
+"""
+import json
+import struct
+import threading
+import time
+
+from comrob_py.enums.event_type import EventType
+
+# header of a record: length of the rest of the record, time in s since the epoch, event type
+HEADER = struct.Struct("<IdB")
+# the length counts time and event type as well as the payload
+HEADER_LENGTH = HEADER.size - 4
+
+
+class EventLog:
+    """
+    The EventLog appends length-prefixed binary records to a file. Every record consists of a header with length, time
+    and event type and a compact json payload. Records are flushed when written, so that a crash loses at most the
+    record being written, which the reader skips.
+    """
+    def __init__(self, path, clock=time.time):
+        """
+        Constructor, opens the file for appending.
+        :param path: path of the log file, created if it does not exist
+        :type path: str
+        :param clock: clock returning the time in s stored with the records
+        :type clock: callable
+        """
+        self.__file = open(path, "ab")
+        # a record cut off by a crash would corrupt the records appended after it
+        self.__file.truncate(complete_length(path))
+        self.__clock = clock
+        self.__lock = threading.Lock()
+
+    def write(self, event_type, payload):
+        """
+        Append record, can be called from any thread.
+        :param event_type: what the record describes
+        :type event_type: EventType
+        :param payload: data of the record, needs to be serializable as json
+        :type payload: list or dict
+        """
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        record = HEADER.pack(HEADER_LENGTH + len(data), self.__clock(), event_type.value) + data
+        with self.__lock:
+            self.__file.write(record)
+            self.__file.flush()
+
+    def vote(self, function_key, args, user_name, channel):
+        """
+        Append vote received from chat.
+        """
+        self.write(EventType.Vote, [function_key.value, list(args), user_name, channel])
+
+    def session(self, session_id, votes):
+        """
+        Append closed session.
+        """
+        self.write(EventType.Session, [session_id, votes])
+
+    def command(self, function_key, args, count, arm=None):
+        """
+        Append command selected to be executed.
+        """
+        self.write(EventType.Command, [function_key.value, list(args), count, arm])
+
+    def robot_call(self, call, args, kwargs):
+        """
+        Append call to the swift api.
+        """
+        self.write(EventType.RobotCall, [call, list(args), kwargs])
+
+    def close(self):
+        """
+        Close the file.
+        """
+        with self.__lock:
+            self.__file.close()
+
+
+def complete_length(path):
+    """
+    Length of the complete records at the start of a log file.
+    :param path: path of the log file
+    :type path: str
+    :return: length in bytes
+    :rtype: int
+    """
+    length = 0
+    with open(path, "rb") as log_file:
+        while True:
+            header = log_file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return length
+            record_length = HEADER.unpack(header)[0] - HEADER_LENGTH
+            if len(log_file.read(record_length)) < record_length:
+                return length
+            length += HEADER.size + record_length
+
+
+def read_events(path):
+    """
+    Read all complete records of a log file.
+    :param path: path of the log file
+    :type path: str
+    :return: generator of (time, event type, payload)
+    :rtype: generator
+    """
+    with open(path, "rb") as log_file:
+        while True:
+            header = log_file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            length, event_time, event_type = HEADER.unpack(header)
+            data = log_file.read(length - HEADER_LENGTH)
+            # record cut off by a crash
+            if len(data) < length - HEADER_LENGTH:
+                return
+            yield event_time, EventType(event_type), json.loads(data)
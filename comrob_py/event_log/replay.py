@@ -0,0 +1,128 @@
+"""
+Replay of a recorded event log through the bot and the user handler against a simulated robot, as load test and to
+reproduce a stream.
+Run with python -m comrob_py.event_log.replay <log file>, see --help for the options.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from comrob_py.comrob_bot.comrob_bot import ComrobBot, bot_loop
+from comrob_py.enums.command_key import CommandKey, FunctionKey
+from comrob_py.enums.event_type import EventType
+from comrob_py.enums.pool_mode import PoolMode
+from comrob_py.enums.robot_backend import RobotBackend
+from comrob_py.event_log.event_log import read_events
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.robot_handler import RobotHandler
+from comrob_py.robot_handler.robot_pool import RobotPool
+from comrob_py.robot_handler.simulated_swift_api import SimulatedSwiftApi
+from comrob_py.robot_handler.user_handler import UserHandler
+
+
+def create_robot_pool(arms=1, pool_mode=PoolMode.RoundRobin, backend=RobotBackend.Simulated):
+    """
+    Create robot pool of robots which are never connected, simulated robots advance a virtual clock instead of waiting.
+    """
+    user_handlers = []
+    for _ in range(arms):
+        if backend is RobotBackend.Simulated:
+            robot_handler = RobotHandler(swift=SimulatedSwiftApi(latency=0.005, realtime=False))
+        else:
+            robot_handler = RobotHandler(backend=RobotBackend.Mock)
+        user_handlers.append(UserHandler(robot_handler=robot_handler))
+    return RobotPool(user_handlers, pool_mode)
+
+
+def replay(path, speed=0.0, robot_pool=None, channel_weights=None):
+    """
+    Feed the votes of a log through the command handler of a bot and execute the winner of every recorded session.
+    :param path: path of the log file
+    :type path: str
+    :param speed: factor the recorded time is sped up by, as fast as possible if 0
+    :type speed: float
+    :param robot_pool: robots to execute the commands, one simulated robot if None
+    :type robot_pool: RobotPool
+    :param channel_weights: channel -> weight of the votes from this channel, all votes count 1 if None
+    :type channel_weights: dict
+    :return: statistics of the replay
+    :rtype: dict
+    """
+    events = list(read_events(path))
+    robot_pool = robot_pool if robot_pool is not None else create_robot_pool()
+    channels = sorted({payload[3] for _, event_type, payload in events if event_type is EventType.Vote})
+    # winners of the recording, to compare the replay with
+    recorded_commands = [(payload[0], payload[1]) for _, event_type, payload in events
+                         if event_type is EventType.Command]
+    replayed_commands = []
+    statistics = {"events": len(events), "votes": 0, "accepted_votes": 0, "sessions": 0,
+                  "robot_calls": sum(event_type is EventType.RobotCall for _, event_type, _ in events)}
+
+    def execute(user_handler, command, arm):
+        replayed_commands.append((command[CommandKey.Function].value, command[CommandKey.Args]))
+        try:
+            getattr(user_handler, command[CommandKey.Function].value)(*command[CommandKey.Args])
+        except ComrobError:
+            pass
+
+    async def run_session(vote_tally):
+        executions = await robot_pool.dispatch(vote_tally, execute)
+        await asyncio.gather(*executions.values())
+
+    with bot_loop() as loop:
+        comrob_bot = ComrobBot("oauth:replay", "comrob_bot", "!", channels or ["comrob"],
+                               channel_weights=channel_weights)
+        comrob_bot.set_command_validator(robot_pool.validate_command)
+        start_time = time.perf_counter()
+        for event_time, event_type, payload in events:
+            if speed > 0.0:
+                delay = (event_time - events[0][0]) / speed - (time.perf_counter() - start_time)
+                if delay > 0.0:
+                    time.sleep(delay)
+
+            if event_type is EventType.Vote:
+                statistics["votes"] += 1
+                function_key, args, user_name, channel = payload
+                if comrob_bot.add_vote(FunctionKey(function_key), args, user_name, channel):
+                    statistics["accepted_votes"] += 1
+            elif event_type is EventType.Session:
+                statistics["sessions"] += 1
+                _, vote_tally = comrob_bot.swap_command_buffer()
+                if len(vote_tally) == 0:
+                    continue
+                try:
+                    loop.run_until_complete(run_session(vote_tally))
+                except ComrobError:
+                    pass
+        statistics["wall_time"] = time.perf_counter() - start_time
+    robot_pool.shutdown()
+
+    statistics["recorded_time"] = events[-1][0] - events[0][0] if events else 0.0
+    statistics["votes_per_s"] = statistics["votes"] / statistics["wall_time"] if statistics["wall_time"] > 0 else 0.0
+    statistics["commands"] = len(replayed_commands)
+    statistics["matching_commands"] = sum(recorded == replayed
+                                          for recorded, replayed in zip(recorded_commands, replayed_commands))
+    return statistics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded event log of comrob.")
+    parser.add_argument("path", help="event log file to replay")
+    parser.add_argument("--speed", type=float, default=0.0, help="speed-up of the recorded time, 0 for no waiting")
+    parser.add_argument("--backend", choices=[RobotBackend.Simulated.value, RobotBackend.Mock.value],
+                        default=RobotBackend.Simulated.value, help="robot to execute the commands")
+    parser.add_argument("--arms", type=int, default=1, help="number of arms")
+    parser.add_argument("--pool-mode", choices=[pool_mode.value for pool_mode in PoolMode],
+                        default=PoolMode.RoundRobin.value, help="distribution of the sessions between the arms")
+    arguments = parser.parse_args(argv)
+
+    robot_pool = create_robot_pool(arguments.arms, PoolMode(arguments.pool_mode), RobotBackend(arguments.backend))
+    statistics = replay(arguments.path, arguments.speed, robot_pool)
+    for name, value in statistics.items():
+        print(name.ljust(20), value)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Test file for event log and replay.
+"""
+import os
+import tempfile
+import unittest
+
+from comrob_py.comrob_bot.comrob_bot import ComrobBot, bot_loop
+from comrob_py.enums.command_key import CommandKey, FunctionKey
+from comrob_py.enums.event_type import EventType
+from comrob_py.event_log.event_log import EventLog, read_events
+from comrob_py.enums.robot_backend import RobotBackend
+from comrob_py.event_log.replay import create_robot_pool, replay
+from comrob_py.robot_handler.robot_handler import RobotHandler
+from comrob_py.robot_handler.simulated_swift_api import SimulatedSwiftApi
+
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "events.log")
+
+    def test_records(self):
+        """
+        Test reading the records back and skipping a record cut off by a crash.
+        """
+        event_log = EventLog(self.path, clock=lambda: 1.5)
+        event_log.vote(FunctionKey.Position, [4, 8], "user_1", "comrob")
+        event_log.session(0, 1)
+        event_log.close()
+        with open(self.path, "ab") as log_file:
+            log_file.write(b"\x20\x00\x00")
+        self.assertEqual(list(read_events(self.path)),
+                         [(1.5, EventType.Vote, ["position", [4, 8], "user_1", "comrob"]),
+                          (1.5, EventType.Session, [0, 1])])
+
+        # appending after a crash drops the cut off record
+        event_log = EventLog(self.path, clock=lambda: 2.0)
+        event_log.command(FunctionKey.Hold, [], 3)
+        event_log.close()
+        self.assertEqual(list(read_events(self.path))[-1], (2.0, EventType.Command, ["hold", [], 3, None]))
+
+    def test_robot_calls(self):
+        """
+        Test recording the calls of the robot handler.
+        """
+        event_log = EventLog(self.path)
+        robot_handler = RobotHandler(swift=SimulatedSwiftApi(realtime=False), event_log=event_log)
+        robot_handler.move(x=150)
+        event_log.close()
+        calls = [payload[0] for _, event_type, payload in read_events(self.path)]
+        self.assertEqual(calls[:2], ["set_mode", "reset"])
+        self.assertEqual(calls[-3:], ["set_acceleration", "set_position", "flush_cmd"])
+
+    def test_replay(self):
+        """
+        Test recording a stream with the bot and replaying it.
+        """
+        event_log = EventLog(self.path)
+        with bot_loop():
+            comrob_bot = ComrobBot("oauth:test", "comrob_bot", "!", ["comrob"], event_log=event_log)
+            for session in range(3):
+                for user in range(5):
+                    comrob_bot.add_vote(FunctionKey.Position, [4 + session, 8], "user_" + str(user), "comrob")
+                # duplicate vote
+                comrob_bot.add_vote(FunctionKey.Height, [2], "user_0", "comrob")
+                _, vote_tally = comrob_bot.swap_command_buffer()
+                command = vote_tally.select_command()
+                event_log.command(command[CommandKey.Function], command[CommandKey.Args], command[CommandKey.Count])
+        event_log.close()
+
+        statistics = replay(self.path, speed=1000.0)
+        self.assertEqual(statistics["votes"], 18)
+        self.assertEqual(statistics["accepted_votes"], 15)
+        self.assertEqual(statistics["sessions"], 3)
+        self.assertEqual(statistics["commands"], 3)
+        self.assertEqual(statistics["matching_commands"], 3)
+
+        # replay on two mocked arms
+        statistics = replay(self.path, robot_pool=create_robot_pool(2, backend=RobotBackend.Mock))
+        self.assertEqual(statistics["commands"], 3)
+        self.assertEqual(statistics["matching_commands"], 3)
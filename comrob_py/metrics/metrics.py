@@ -0,0 +1,254 @@
+"""
+This file contains counters and histograms of the latency and throughput of every stage, collected in a registry.
+"""
+import bisect
+import threading
+import time
+
+from contextlib import contextmanager
+
+# upper bounds of the histogram buckets in s, from serial calls to robot moves
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    """
+    The Counter counts events, optionally split by label values.
+    """
+    def __init__(self, name, description, label_names=()):
+        """
+        Constructor.
+        :param name: name of the metric
+        :type name: str
+        :param description: description shown in the text format
+        :type description: str
+        :param label_names: names of the labels, e.g. ("result",)
+        :type label_names: tuple
+        """
+        self.__name = name
+        self.__description = description
+        self.__label_names = tuple(label_names)
+        # label values -> count
+        self.__values = dict()
+        self.__lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self.__name
+
+    def inc(self, *label_values, amount=1):
+        """
+        Increase counter.
+        :param label_values: values of the labels, in the order of the label names
+        :type label_values: str
+        :param amount: amount to add
+        :type amount: float
+        """
+        with self.__lock:
+            self.__values[label_values] = self.__values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        """
+        Current count for the label values.
+        """
+        with self.__lock:
+            return self.__values.get(label_values, 0)
+
+    def snapshot(self):
+        """
+        Copy of all counts.
+        :return: label values -> count
+        :rtype: dict
+        """
+        with self.__lock:
+            return dict(self.__values)
+
+    def render(self):
+        """
+        Metric in the prometheus text format.
+        :return: lines of the text format
+        :rtype: list
+        """
+        lines = ["# HELP " + self.__name + " " + self.__description, "# TYPE " + self.__name + " counter"]
+        for label_values, count in sorted(self.snapshot().items()):
+            lines.append(self.__name + format_labels(self.__label_names, label_values) + " " + str(count))
+        return lines
+
+
+class Histogram:
+    """
+    The Histogram counts observed values, e.g. latencies, in buckets and keeps their sum, optionally split by label
+    values.
+    """
+    def __init__(self, name, description, label_names=(), buckets=DEFAULT_BUCKETS):
+        """
+        Constructor.
+        :param name: name of the metric
+        :type name: str
+        :param description: description shown in the text format
+        :type description: str
+        :param label_names: names of the labels, e.g. ("call",)
+        :type label_names: tuple
+        :param buckets: sorted upper bounds of the buckets
+        :type buckets: tuple
+        """
+        self.__name = name
+        self.__description = description
+        self.__label_names = tuple(label_names)
+        self.__buckets = tuple(buckets)
+        # label values -> [count per bucket, the last bucket counting values above all bounds, sum]
+        self.__values = dict()
+        self.__lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self.__name
+
+    def observe(self, value, *label_values):
+        """
+        Add observed value.
+        :param value: observed value, e.g. a duration in s
+        :type value: float
+        :param label_values: values of the labels, in the order of the label names
+        :type label_values: str
+        """
+        index = bisect.bisect_left(self.__buckets, value)
+        with self.__lock:
+            counts = self.__values.get(label_values)
+            if counts is None:
+                counts = [[0] * (len(self.__buckets) + 1), 0.0]
+                self.__values[label_values] = counts
+            counts[0][index] += 1
+            counts[1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        """
+        Context observing its duration in s.
+        :param label_values: values of the labels, in the order of the label names
+        :type label_values: str
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def count(self, *label_values):
+        """
+        Number of observed values for the label values.
+        """
+        with self.__lock:
+            counts = self.__values.get(label_values)
+            return sum(counts[0]) if counts is not None else 0
+
+    def snapshot(self):
+        """
+        Copy of all observations.
+        :return: label values -> dict with cumulative bucket counts, count and sum
+        :rtype: dict
+        """
+        snapshot = dict()
+        with self.__lock:
+            for label_values, (bucket_counts, total) in self.__values.items():
+                cumulative = []
+                for bucket_count in bucket_counts:
+                    cumulative.append((cumulative[-1] if cumulative else 0) + bucket_count)
+                snapshot[label_values] = {"buckets": dict(zip(self.__buckets + (float("inf"),), cumulative)),
+                                          "count": cumulative[-1], "sum": total}
+        return snapshot
+
+    def render(self):
+        """
+        Metric in the prometheus text format.
+        :return: lines of the text format
+        :rtype: list
+        """
+        lines = ["# HELP " + self.__name + " " + self.__description, "# TYPE " + self.__name + " histogram"]
+        for label_values, values in sorted(self.snapshot().items()):
+            for bound, count in values["buckets"].items():
+                bound_label = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(self.__name + "_bucket" +
+                             format_labels(self.__label_names + ("le",), label_values + (bound_label,)) +
+                             " " + str(count))
+            labels = format_labels(self.__label_names, label_values)
+            lines.append(self.__name + "_count" + labels + " " + str(values["count"]))
+            lines.append(self.__name + "_sum" + labels + " " + repr(values["sum"]))
+        return lines
+
+
+class MetricsRegistry:
+    """
+    The MetricsRegistry holds all metrics by name, so that every module can get its metrics without passing them
+    around.
+    """
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.__metrics = dict()
+        self.__lock = threading.Lock()
+
+    def counter(self, name, description, label_names=()):
+        """
+        Get counter, created on first use.
+        :return: counter with the name
+        :rtype: Counter
+        """
+        return self.__get(Counter, name, description, label_names)
+
+    def histogram(self, name, description, label_names=(), buckets=DEFAULT_BUCKETS):
+        """
+        Get histogram, created on first use.
+        :return: histogram with the name
+        :rtype: Histogram
+        """
+        return self.__get(Histogram, name, description, label_names, buckets)
+
+    def snapshot(self):
+        """
+        Copy of all metrics, for use within the process.
+        :return: name -> snapshot of the metric
+        :rtype: dict
+        """
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def render(self):
+        """
+        All metrics in the prometheus text format.
+        :return: text of all metrics
+        :rtype: str
+        """
+        with self.__lock:
+            metrics = sorted(self.__metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def __get(self, metric_class, name, *args):
+        """
+        Get metric, created on first use.
+        """
+        with self.__lock:
+            metric = self.__metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, *args)
+                self.__metrics[name] = metric
+            return metric
+
+
+def format_labels(label_names, label_values):
+    """
+    Format labels of the prometheus text format, e.g. {call="set_position"}.
+    """
+    if not label_names:
+        return ""
+    return "{" + ",".join(name + "=\"" + str(value).replace("\\", "\\\\").replace("\"", "\\\"") + "\""
+                          for name, value in zip(label_names, label_values)) + "}"
+
+
+# registry of all metrics of the process
+registry = MetricsRegistry()
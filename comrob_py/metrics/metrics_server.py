@@ -0,0 +1,71 @@
+"""
+This file contains the MetricsServer, which serves the metrics as text over http for scraping.
+"""
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from comrob_py.metrics.metrics import registry
+
+
+class MetricsServer:
+    """
+    The MetricsServer answers GET /metrics with all metrics of a registry in the prometheus text format. It runs on its
+    own thread and listens on localhost only by default.
+    """
+    def __init__(self, port=9100, host="127.0.0.1", metrics_registry=None):
+        """
+        Constructor.
+        :param port: port to listen on, 0 for any free port
+        :type port: int
+        :param host: address to listen on
+        :type host: str
+        :param metrics_registry: registry to serve, the registry of the process if None
+        :type metrics_registry: MetricsRegistry
+        """
+        metrics_registry = metrics_registry if metrics_registry is not None else registry
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics_registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # scrapes are not logged
+                pass
+
+        self.__server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        self.__server.daemon_threads = True
+        self.__thread = None
+
+    @property
+    def port(self):
+        """
+        Port the server listens on.
+        """
+        return self.__server.server_address[1]
+
+    def start(self):
+        """
+        Start serving on a daemon thread.
+        """
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stop serving and close the socket.
+        """
+        # shutdown waits for serve_forever, which only runs after start
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
@@ -0,0 +1,77 @@
+"""
+Test file for metrics and metrics server.
+"""
+import unittest
+import urllib.error
+import urllib.request
+
+from comrob_py.metrics.metrics import MetricsRegistry
+from comrob_py.metrics.metrics_server import MetricsServer
+from comrob_py.robot_handler.robot_handler import RobotHandler, SERIAL_SECONDS
+from comrob_py.robot_handler.simulated_swift_api import SimulatedSwiftApi
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counter(self):
+        """
+        Test counting by labels and the text format.
+        """
+        metrics_registry = MetricsRegistry()
+        counter = metrics_registry.counter("votes_total", "Votes.", ("result",))
+        counter.inc("accepted")
+        counter.inc("accepted")
+        counter.inc("E0009", amount=3)
+        # the same name gives the same counter
+        self.assertIs(metrics_registry.counter("votes_total", "Votes."), counter)
+        self.assertEqual(counter.value("accepted"), 2)
+        self.assertEqual(counter.value("duplicate"), 0)
+        self.assertEqual(metrics_registry.snapshot()["votes_total"], {("accepted",): 2, ("E0009",): 3})
+        self.assertIn("votes_total{result=\"E0009\"} 3", metrics_registry.render())
+
+    def test_histogram(self):
+        """
+        Test buckets, sum and the text format.
+        """
+        metrics_registry = MetricsRegistry()
+        histogram = metrics_registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.1)
+        histogram.observe(0.5)
+        histogram.observe(2.0)
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.count(), 5)
+        snapshot = metrics_registry.snapshot()["latency_seconds"][()]
+        self.assertEqual(snapshot["buckets"], {0.1: 3, 1.0: 4, float("inf"): 5})
+        self.assertAlmostEqual(snapshot["sum"], 2.65, delta=0.01)
+        text = metrics_registry.render()
+        self.assertIn("latency_seconds_bucket{le=\"+Inf\"} 5", text)
+        self.assertIn("latency_seconds_count 5", text)
+
+    def test_metrics_server(self):
+        """
+        Test scraping the metrics over http.
+        """
+        metrics_registry = MetricsRegistry()
+        metrics_registry.counter("scrape_test_total", "Test.").inc()
+        metrics_server = MetricsServer(port=0, metrics_registry=metrics_registry)
+        metrics_server.start()
+        try:
+            url = "http://127.0.0.1:" + str(metrics_server.port)
+            with urllib.request.urlopen(url + "/metrics") as response:
+                self.assertEqual(response.status, 200)
+                self.assertIn("scrape_test_total 1", response.read().decode())
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(url + "/other")
+        finally:
+            metrics_server.stop()
+
+    def test_serial_calls(self):
+        """
+        Test that the calls of the robot handler to the swift api are measured.
+        """
+        count = SERIAL_SECONDS.count("set_position")
+        robot_handler = RobotHandler(swift=SimulatedSwiftApi(realtime=False))
+        robot_handler.reset()
+        robot_handler.move(x=150)
+        self.assertEqual(SERIAL_SECONDS.count("set_position"), count + 1)
@@ -0,0 +1,184 @@
+"""
+This file contains asyncio variants of the robot handler and the user handler.
+"""
+import asyncio
+import concurrent.futures
+import functools
+
+from comrob_py.enums.motion_profile import MotionProfile
+
+
+class AsyncExecutor:
+    """
+    The AsyncExecutor runs the blocking calls of one arm on a thread of their own, one after the other in the order
+    they were made, and makes them awaitable on the event loop. Cancelling an awaitable drops the call if it has not
+    started yet, a call which is already talking to the arm is finished.
+    """
+    def __init__(self, executor=None):
+        """
+        Constructor.
+        :param executor: executor to run the calls on, a new single thread executor if None
+        :type executor: concurrent.futures.Executor
+        """
+        self.__executor = executor if executor is not None else concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    @property
+    def executor(self):
+        return self.__executor
+
+    async def run(self, function, *args, **kwargs):
+        """
+        Run blocking function on the thread of the arm.
+        :param function: function to call
+        :type function: callable
+        :return: return value of the function
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.__executor,
+                                                                functools.partial(function, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        """
+        Stop the thread, after the calls made so far are finished if wait is true.
+        """
+        self.__executor.shutdown(wait=wait)
+
+
+class AsyncRobotHandler:
+    """
+    The AsyncRobotHandler offers the functions of a robot handler as coroutines, resolved when the arm acknowledged the
+    commands, or when it stopped for moves with wait. The serial communication runs off the event loop.
+    """
+    def __init__(self, robot_handler, async_executor=None):
+        """
+        Constructor.
+        :param robot_handler: blocking robot handler
+        :type robot_handler: RobotHandler
+        :param async_executor: executor of the arm, shared with the async user handler of the arm, a new one if None
+        :type async_executor: AsyncExecutor
+        """
+        self.__robot_handler = robot_handler
+        self.__async_executor = async_executor if async_executor is not None else AsyncExecutor()
+
+    @property
+    def robot_handler(self):
+        return self.__robot_handler
+
+    @property
+    def async_executor(self):
+        return self.__async_executor
+
+    @property
+    def busy_time(self):
+        return self.__robot_handler.busy_time
+
+    async def reset(self):
+        """
+        Reset robot, go back to start position.
+        """
+        await self.__async_executor.run(self.__robot_handler.reset)
+
+    async def move(self, x=None, y=None, z=None, wrist_angle=None, wait=False, motion_profile=MotionProfile.Traverse):
+        """
+        Move robot in uarm frame, axes which are None keep their value.
+        :param wait: true to resolve when the arm stopped instead of when the move is acknowledged
+        :type wait: bool
+        """
+        await self.__async_executor.run(self.__robot_handler.move, x, y, z, wrist_angle, wait=wait,
+                                        motion_profile=motion_profile)
+
+    async def height(self, z, wait=False, motion_profile=MotionProfile.Traverse):
+        """
+        Move robot to height in uarm frame.
+        """
+        await self.__async_executor.run(self.__robot_handler.height, z, wait=wait, motion_profile=motion_profile)
+
+    async def position(self, x, y):
+        """
+        Move robot to position in uarm frame.
+        """
+        await self.__async_executor.run(self.__robot_handler.position, x, y)
+
+    async def rotate_wrist(self, angle_deg):
+        """
+        Rotate wrist joint of robot.
+        """
+        await self.__async_executor.run(self.__robot_handler.rotate_wrist, angle_deg)
+
+    async def pump(self, on, wait=False):
+        """
+        Toggle the pump function on/off.
+        """
+        await self.__async_executor.run(self.__robot_handler.pump, on, wait=wait)
+
+    async def pump_status(self, timeout=0.0):
+        """
+        Read status of the pump.
+        :param timeout: time in s to read the status again while the pump is still working
+        :type timeout: float
+        :return: status of the pump
+        :rtype: PumpStatus
+        """
+        return await self.__async_executor.run(self.__robot_handler.pump_status, timeout=timeout)
+
+
+class AsyncUserHandler:
+    """
+    The AsyncUserHandler offers the commands of a user handler as coroutines, resolved when the arm acknowledged all
+    moves of the command. Commands are checked without waiting for the arm.
+    """
+    def __init__(self, user_handler, async_executor=None):
+        """
+        Constructor.
+        :param user_handler: blocking user handler
+        :type user_handler: UserHandler
+        :param async_executor: executor of the arm, shared with the async robot handler of the arm, a new one if None
+        :type async_executor: AsyncExecutor
+        """
+        self.__user_handler = user_handler
+        self.__async_executor = async_executor if async_executor is not None else AsyncExecutor()
+
+    @property
+    def user_handler(self):
+        return self.__user_handler
+
+    @property
+    def async_executor(self):
+        return self.__async_executor
+
+    @property
+    def busy_time(self):
+        return self.__user_handler.busy_time
+
+    def validate_command(self, function_key, args):
+        """
+        Check if a command can be executed from the current position, without moving the robot.
+        """
+        self.__user_handler.validate_command(function_key, args)
+
+    async def execute(self, function_key, args):
+        """
+        Execute command.
+        :param function_key: function of the command
+        :type function_key: FunctionKey
+        :param args: arguments of the command
+        :type args: list
+        """
+        await self.__async_executor.run(getattr(self.__user_handler, function_key.value), *args)
+
+    async def height(self, z_user):
+        """
+        Move to new height in user frame.
+        """
+        await self.__async_executor.run(self.__user_handler.height, z_user)
+
+    async def position(self, x_user, y_user):
+        """
+        Move to position in user frame.
+        """
+        await self.__async_executor.run(self.__user_handler.position, x_user, y_user)
+
+    async def hold(self):
+        """
+        Pick-up or drop cube below end-effector.
+        """
+        await self.__async_executor.run(self.__user_handler.hold)
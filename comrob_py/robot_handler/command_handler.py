@@ -1,20 +1,23 @@
 """
 This file offers utility functions that handle the command queue.
 """
-import threading
-
 from comrob_py.enums.command_key import CommandKey
 from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+from comrob_py.robot_handler.vote_tally import VoteTally
 
 
 def select_command(command_queue):
     """
     This functions gets a command queue and selects the function which gets the most votes from users.
+    If a VoteTally is given, the winner is read directly from the tally.
     :param command_queue: dictionary containing commands and arguments from different users.
-    :type command_queue: dequeue
+    :type command_queue: dequeue or VoteTally
     :return: command with highest number of votes, first command otherwise
     :rtype: dict
     """
+    if isinstance(command_queue, VoteTally):
+        return command_queue.select_command()
+
     if len(command_queue) == 0:
         message = "No command in command queue."
         raise ComrobError(ErrorCode.E0011, message)
@@ -47,6 +50,4 @@ def send_message(bot, message):
     :param message: message to send on the bot
     :type message: str
     """
-    thread = threading.Thread(target=bot.send_message, args=(message,))
-    thread.start()
-    thread.join()
+    bot.send_message(message)
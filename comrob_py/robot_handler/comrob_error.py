@@ -47,3 +47,15 @@ class ErrorCode(Enum):
     E0011 = 11  # CommandHandler
     E0012 = 12  # UserHandler
     E0013 = 13  # UserHandler
+    E0014 = 14  # Coordinates
+    E0015 = 15  # FrameRegistry
+    E0016 = 16  # RobotHandler
+    E0017 = 17  # UserHandler
+    E0018 = 18  # OccupancyGrid
+    E0019 = 19  # UserHandler
+    E0020 = 20  # UserHandler
+    E0021 = 21  # MotionPlanner
+    E0022 = 22  # RobotPool
+    E0023 = 23  # RobotHandler
+    E0024 = 24  # UserHandler
+    E0025 = 25  # comrob
@@ -4,6 +4,7 @@ This file contains the coordinates object, which is used to store coordinates in
 import numpy
 
 from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
 
 
 class Coordinates:
@@ -91,3 +92,87 @@ class Coordinates:
         :type z: float
         """
         self.__coordinates[2] = z
+
+
+class CoordinatesArray:
+    """
+    The CoordinatesArray stores many coordinates of the same frame in one Nx3 numpy array.
+    """
+    def __init__(self, coordinates, coordinate_frame):
+        """
+        Initialization method
+        :param coordinates: array of shape (N, 3) with one x, y, z row per point
+        :type coordinates: numpy.ndarray
+        :param coordinate_frame: frame of given coordinates
+        :type coordinate_frame: CoordinateFrame
+        """
+        self.__coordinates = numpy.asarray(coordinates, dtype=float).reshape(-1, 3)
+        self.__coordinate_frame = coordinate_frame
+
+    @classmethod
+    def from_coordinates(cls, coordinates_list):
+        """
+        Create array from single coordinates, all coordinates need to be in the same frame.
+        :param coordinates_list: coordinates to be stored
+        :type coordinates_list: list
+        :return: array of all coordinates
+        :rtype: CoordinatesArray
+        """
+        coordinate_frame = coordinates_list[0].coordinate_frame
+        if any(coordinates.coordinate_frame is not coordinate_frame for coordinates in coordinates_list):
+            message = "All coordinates need to be in the same frame."
+            raise ComrobError(ErrorCode.E0014, message)
+        return cls([[coordinates.x, coordinates.y, coordinates.z] for coordinates in coordinates_list],
+                   coordinate_frame)
+
+    def __len__(self):
+        """
+        Number of coordinates.
+        """
+        return self.__coordinates.shape[0]
+
+    def __getitem__(self, index):
+        """
+        Get single coordinates.
+        :param index: index of coordinates
+        :type index: int
+        :return: coordinates at index
+        :rtype: Coordinates
+        """
+        x, y, z = self.__coordinates[index]
+        return Coordinates(x, y, z, self.__coordinate_frame)
+
+    @property
+    def coordinates(self):
+        """
+        coordinates getter, Nx3 array.
+        """
+        return self.__coordinates
+
+    @property
+    def x(self):
+        """
+        x getter.
+        """
+        return self.__coordinates[:, 0]
+
+    @property
+    def y(self):
+        """
+        y getter.
+        """
+        return self.__coordinates[:, 1]
+
+    @property
+    def z(self):
+        """
+        z getter.
+        """
+        return self.__coordinates[:, 2]
+
+    @property
+    def coordinate_frame(self):
+        """
+        coordinate_frame getter.
+        """
+        return self.__coordinate_frame
@@ -0,0 +1,158 @@
+"""
+This file contains the FrameRegistry, which converts arrays of coordinates between any registered frames.
+"""
+import numpy
+
+from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+from comrob_py.robot_handler.coordinates import CoordinatesArray
+
+
+class FrameRegistry:
+    """
+    The FrameRegistry stores frames as homogeneous transforms to a parent frame. The composed transform between two
+    frames is computed once and cached, so every transform is a single matrix multiplication, independent of the number
+    of frames in between.
+    """
+    def __init__(self, root_frame=CoordinateFrame.Uarm):
+        """
+        Constructor.
+        :param root_frame: frame all other frames are defined in, directly or through their parents
+        :type root_frame: CoordinateFrame
+        """
+        self.__root_frame = root_frame
+        # frame -> (parent frame, 4x4 transform from frame to parent frame)
+        self.__frames = {root_frame: (None, numpy.identity(4))}
+        # (from frame, to frame) -> 4x4 transform
+        self.__cache = dict()
+        self.__version = 0
+
+    @classmethod
+    def user_frame(cls, edge_length_xy, edge_length_z, x_offset, y_offset, z_offset):
+        """
+        Create registry with user frame in uarm frame, one unit in user frame is one cube, integer coordinates are the
+        centers of the cubes.
+        :param edge_length_xy: side length of cube in mm
+        :type edge_length_xy: float
+        :param edge_length_z: height length of cube in mm
+        :type edge_length_z: float
+        :param x_offset: offset of user frame in x direction in mm
+        :type x_offset: float
+        :param y_offset: offset of user frame in y direction in mm
+        :type y_offset: float
+        :param z_offset: offset of user frame in z direction in mm
+        :type z_offset: float
+        :return: registry with uarm and user frame
+        :rtype: FrameRegistry
+        """
+        frame_registry = cls(CoordinateFrame.Uarm)
+        frame_registry.add_frame(CoordinateFrame.User, CoordinateFrame.Uarm, offset=(x_offset, y_offset, z_offset),
+                                 scale=(edge_length_xy, edge_length_xy, edge_length_z), shift=(.5, .5, .5))
+        return frame_registry
+
+    @property
+    def version(self):
+        """
+        Number of changes of the frames, increases every time a frame is added or replaced.
+        """
+        return self.__version
+
+    def add_frame(self, coordinate_frame, parent_frame, offset=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0),
+                  rotation_deg=0.0, shift=(0.0, 0.0, 0.0)):
+        """
+        Add or replace frame. Coordinates p of the frame are p_parent = offset + R(rotation_deg) * scale * (p + shift).
+        :param coordinate_frame: frame to add
+        :type coordinate_frame: CoordinateFrame
+        :param parent_frame: frame the new frame is defined in, needs to be registered already
+        :type parent_frame: CoordinateFrame
+        :param offset: origin of the frame in parent frame
+        :type offset: tuple
+        :param scale: scaling of the axes, e.g. cell size
+        :type scale: tuple
+        :param rotation_deg: rotation around z-axis of parent frame in degrees
+        :type rotation_deg: float
+        :param shift: shift in the frame before scaling, e.g. .5 to address the center of a cell
+        :type shift: tuple
+        """
+        self.__check_frame(parent_frame)
+        if coordinate_frame is self.__root_frame:
+            message = "The root frame can not be replaced."
+            raise ComrobError(ErrorCode.E0015, message)
+        # the parent must not be defined in the new frame
+        frame = parent_frame
+        while frame is not None:
+            if frame is coordinate_frame:
+                message = "A frame can not be defined in itself."
+                raise ComrobError(ErrorCode.E0015, message)
+            frame = self.__frames[frame][0]
+
+        translation = numpy.identity(4)
+        translation[:3, 3] = offset
+        rotation = numpy.identity(4)
+        angle_rad = numpy.radians(rotation_deg)
+        rotation[:2, :2] = [[numpy.cos(angle_rad), -numpy.sin(angle_rad)],
+                            [numpy.sin(angle_rad), numpy.cos(angle_rad)]]
+        scaling = numpy.diag([*scale, 1.0])
+        shifting = numpy.identity(4)
+        shifting[:3, 3] = shift
+        self.__frames[coordinate_frame] = (parent_frame, translation @ rotation @ scaling @ shifting)
+
+        # cached transforms might go through the changed frame
+        self.__cache = dict()
+        self.__version += 1
+
+    def get_transform(self, from_frame, to_frame):
+        """
+        Get homogeneous transform between two frames, composed once and cached afterwards.
+        :param from_frame: frame of the coordinates
+        :type from_frame: CoordinateFrame
+        :param to_frame: frame to transform to
+        :type to_frame: CoordinateFrame
+        :return: 4x4 transform
+        :rtype: numpy.ndarray
+        """
+        transform = self.__cache.get((from_frame, to_frame))
+        if transform is None:
+            self.__check_frame(from_frame)
+            self.__check_frame(to_frame)
+            transform = numpy.linalg.inv(self.__to_root(to_frame)) @ self.__to_root(from_frame)
+            transform.setflags(write=False)
+            self.__cache[(from_frame, to_frame)] = transform
+        return transform
+
+    def transform(self, coordinates_array, coordinate_frame):
+        """
+        Transform all coordinates to given frame.
+        :param coordinates_array: coordinates to transform
+        :type coordinates_array: CoordinatesArray
+        :param coordinate_frame: coordinate frame to transform to
+        :type coordinate_frame: CoordinateFrame
+        :return: transformed coordinates
+        :rtype: CoordinatesArray
+        """
+        if coordinate_frame is coordinates_array.coordinate_frame:
+            message = "The coordinates are already in the desired frame."
+            raise ComrobError(ErrorCode.E0012, message)
+
+        transform = self.get_transform(coordinates_array.coordinate_frame, coordinate_frame)
+        return CoordinatesArray(coordinates_array.coordinates @ transform[:3, :3].T + transform[:3, 3],
+                                coordinate_frame)
+
+    def __to_root(self, coordinate_frame):
+        """
+        Compose transform from frame to root frame.
+        """
+        transform = numpy.identity(4)
+        while coordinate_frame is not None:
+            parent_frame, to_parent = self.__frames[coordinate_frame]
+            transform = to_parent @ transform
+            coordinate_frame = parent_frame
+        return transform
+
+    def __check_frame(self, coordinate_frame):
+        """
+        Check if frame is registered.
+        """
+        if coordinate_frame not in self.__frames:
+            message = "Unknown coordinate frame."
+            raise ComrobError(ErrorCode.E0015, message)
@@ -1,45 +1,64 @@
 """
 This file provides the MockSwiftApi class.
 """
+from comrob_py.enums.pump_status import PumpStatus
 
 
 class MockSwiftApi:
     """
-    This class mocks the Swift Api class, printing all function calls.
+    This class mocks the Swift Api class without any timing, every command is done at once. The pose and the pump
+    status are kept, so that the robot handler can be used as with a real uArm.
     """
-    def __init__(self, port=None, baudrate=115200, timeout=None, **kwargs):
-        print("__init__ ", port, baudrate, timeout)
+    def __init__(self, port=None, baudrate=115200, timeout=None, home=(200, 0, 150), **kwargs):
+        """
+        Constructor.
+        :param home: position the arm is reset to in uarm frame
+        :type home: tuple
+        """
+        self.__home = list(home)
+        self.__position = list(home)
+        self.__wrist_angle = 90
+        self.__pump = False
 
     def connect(self, port=None, baudrate=None, timeout=None):
-        print("connect ", port, baudrate, timeout)
+        pass
 
     def disconnect(self, is_clean=True):
-        print("disconnect ", is_clean)
+        pass
 
     def waiting_ready(self, timeout=5, **kwargs):
-        print("waiting_ready ", timeout)
+        pass
 
     def reset(self, speed=None, wait=True, timeout=None, x=200, y=0, z=150):
-        print("resest ", speed, wait, timeout, x, y, z)
+        self.__position = list(self.__home)
 
     def set_mode(self, mode=0, wait=True, timeout=None, callback=None):
-        print("set_mode ", mode, wait, timeout, callback)
+        pass
 
     def get_position(self, wait=True, timeout=None, callback=None):
-        print("get_position ", wait, timeout, callback)
-        return [0, 0, 0]
+        return list(self.__position)
 
-    def set_position(self, x=None, y=None, z=None, speed=None, relative=False, wait=False, timeout=10, callback=None, cmd='G0'):
-        print("set_position ", x, y, z, speed, relative, wait, timeout, callback, cmd)
+    def set_position(self, x=None, y=None, z=None, speed=None, relative=False, wait=False, timeout=10, callback=None,
+                     cmd='G0'):
+        for axis, value in enumerate((x, y, z)):
+            if value is not None:
+                self.__position[axis] = self.__position[axis] + value if relative else value
+
+    def set_acceleration(self, acc=None, wait=True, timeout=None, callback=None):
+        pass
 
     def set_servo_angle(self, servo_id=0, angle=90, wait=False, timeout=10, speed=None, callback=None):
-        print("set_servo_angle ", servo_id, angle, wait, timeout, speed, callback)
+        if servo_id == 3:
+            self.__wrist_angle = angle
 
     def set_wrist(self, angle=90, wait=False, timeout=10, speed=None, callback=None):
-        print("set_wrist ", angle, wait, timeout, speed, callback)
+        self.set_servo_angle(servo_id=3, angle=angle, wait=wait, timeout=timeout, speed=speed, callback=callback)
 
     def set_pump(self, on=False, timeout=None, wait=True, check=False, callback=None):
-        print("set_pump ", on, timeout, wait, check, callback)
+        self.__pump = on
+
+    def get_pump_status(self, wait=True, timeout=None, callback=None):
+        return (PumpStatus.Grabbing if self.__pump else PumpStatus.Stop).value
 
     def flush_cmd(self, timeout=None, wait_stop=False):
-        print("flush_cmd ", timeout, wait_stop)
+        pass
@@ -0,0 +1,181 @@
+"""
+This file contains the MotionPlanner, which plans collision free paths of the end-effector through the user grid.
+"""
+import math
+import numpy
+
+from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.enums.motion_profile import MotionProfile
+from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+from comrob_py.robot_handler.coordinates import CoordinatesArray
+from comrob_py.robot_handler.motion_profiles import MotionProfiles
+
+
+class MotionPlan:
+    """
+    The MotionPlan stores the waypoints of a path in user frame, the motion profile and the estimated duration of every
+    segment.
+    """
+    def __init__(self, waypoints, motion_profiles, durations):
+        """
+        Constructor.
+        :param waypoints: start, intermediate and target position in user frame
+        :type waypoints: CoordinatesArray
+        :param motion_profiles: motion profile of every segment
+        :type motion_profiles: list
+        :param durations: estimated duration of every segment in seconds
+        :type durations: list
+        """
+        self.__waypoints = waypoints
+        self.__motion_profiles = motion_profiles
+        self.__durations = durations
+
+    def __len__(self):
+        """
+        Number of segments.
+        """
+        return len(self.__durations)
+
+    @property
+    def waypoints(self):
+        return self.__waypoints
+
+    @property
+    def motion_profiles(self):
+        return self.__motion_profiles
+
+    @property
+    def durations(self):
+        return self.__durations
+
+    @property
+    def duration(self):
+        """
+        Estimated duration of the whole path in seconds.
+        """
+        return sum(self.__durations)
+
+
+class MotionPlanner:
+    """
+    The MotionPlanner plans paths between cells of the user grid that lift the end-effector to a clearance height,
+    traverse at that height and lower it at the target, so that neither the end-effector nor a held block hits a placed
+    block. Of all safe clearance heights the one with the shortest estimated duration is used. The end-effector is
+    lowered onto the target with the approach profile and carries held blocks with the carry profile.
+    """
+    def __init__(self, frame_registry, reachability_map, occupancy_grid, motion_profiles=None):
+        """
+        Constructor.
+        :param frame_registry: registry containing user and uarm frame
+        :type frame_registry: FrameRegistry
+        :param reachability_map: reachability map of the user grid
+        :type reachability_map: ReachabilityMap
+        :param occupancy_grid: blocks placed in the user grid
+        :type occupancy_grid: OccupancyGrid
+        :param motion_profiles: speed and acceleration of the moves, used to estimate durations
+        :type motion_profiles: MotionProfiles
+        """
+        self.__frame_registry = frame_registry
+        self.__reachability_map = reachability_map
+        self.__occupancy_grid = occupancy_grid
+        self.__motion_profiles = motion_profiles if motion_profiles is not None else MotionProfiles()
+        # highest cell of the user grid the end-effector can be lifted to
+        self.__max_z = reachability_map.origin[2] + reachability_map.shape[2] - 1
+
+    def plan(self, start_coordinates_user, target_coordinates_user, holding=False):
+        """
+        Plan the fastest safe path between two positions in user frame. Positions between cells of the user grid are
+        connected directly without checks.
+        :param start_coordinates_user: current position of the end-effector in user frame
+        :type start_coordinates_user: Coordinates
+        :param target_coordinates_user: position to move to in user frame
+        :type target_coordinates_user: Coordinates
+        :param holding: true if the end-effector holds a block, which occupies the cell below it
+        :type holding: bool
+        :return: planned path
+        :rtype: MotionPlan
+        """
+        start = (start_coordinates_user.x, start_coordinates_user.y, start_coordinates_user.z)
+        target = (target_coordinates_user.x, target_coordinates_user.y, target_coordinates_user.z)
+        if not all(float(value).is_integer() for value in start + target):
+            return self.__create_plan([start, target], holding)
+
+        x_start, y_start, z_start = (int(value) for value in start)
+        x_target, y_target, z_target = (int(value) for value in target)
+        if self.__is_blocked(x_target, y_target, z_target, holding):
+            message = "Collision with a block."
+            raise ComrobError(ErrorCode.E0019, message)
+
+        # every segment of a path with a higher clearance is at least as long, the first safe height is the fastest
+        for z_clearance in range(max(z_start, z_target), self.__max_z + 1):
+            if not self.__is_column_free(x_start, y_start, z_start, z_clearance, holding):
+                # all higher paths need to pass the blocked cell as well
+                break
+            if self.__is_column_free(x_target, y_target, z_target, z_clearance, holding) and \
+                    self.__is_traverse_free(x_start, y_start, x_target, y_target, z_clearance, holding):
+                waypoints = [(x_start, y_start, z_start), (x_start, y_start, z_clearance),
+                             (x_target, y_target, z_clearance), (x_target, y_target, z_target)]
+                # drop segments without movement
+                waypoints = [waypoint for i, waypoint in enumerate(waypoints) if i == 0 or waypoint != waypoints[i - 1]]
+                return self.__create_plan(waypoints, holding)
+
+        message = "No collision free path to the target."
+        raise ComrobError(ErrorCode.E0021, message)
+
+    def estimate_durations(self, waypoints_user, motion_profiles):
+        """
+        Estimate the duration of the segments between waypoints, moving in straight lines.
+        :param waypoints_user: waypoints in user frame
+        :type waypoints_user: CoordinatesArray
+        :param motion_profiles: motion profile of every segment
+        :type motion_profiles: list
+        :return: estimated duration of every segment in seconds
+        :rtype: list
+        """
+        waypoints_uarm = self.__frame_registry.transform(waypoints_user, CoordinateFrame.Uarm).coordinates
+        distances = numpy.linalg.norm(numpy.diff(waypoints_uarm, axis=0), axis=1)
+        return [self.__motion_profiles.estimate_duration(float(distance), motion_profile)
+                for distance, motion_profile in zip(distances, motion_profiles)]
+
+    def __create_plan(self, waypoints, holding):
+        """
+        Create plan from waypoints in user frame.
+        """
+        waypoints_user = CoordinatesArray(waypoints, CoordinateFrame.User)
+        motion_profile = MotionProfile.Carry if holding else MotionProfile.Traverse
+        motion_profiles = [motion_profile] * (len(waypoints) - 1)
+        # slow down when lowering onto the target
+        if motion_profiles and waypoints[-1][2] < waypoints[-2][2] and waypoints[-1][:2] == waypoints[-2][:2]:
+            motion_profiles[-1] = MotionProfile.Approach
+        return MotionPlan(waypoints_user, motion_profiles, self.estimate_durations(waypoints_user, motion_profiles))
+
+    def __is_blocked(self, x_user, y_user, z_user, holding):
+        """
+        Check if the end-effector, or the block it holds, would hit a block in the cell.
+        """
+        return self.__occupancy_grid.is_occupied(x_user, y_user, z_user) or \
+            (holding and self.__occupancy_grid.is_occupied(x_user, y_user, z_user - 1))
+
+    def __is_column_free(self, x_user, y_user, z_from_user, z_to_user, holding):
+        """
+        Check if the end-effector can move vertically between two heights.
+        """
+        for z_user in range(min(z_from_user, z_to_user), max(z_from_user, z_to_user) + 1):
+            if not self.__reachability_map.is_reachable(x_user, y_user, z_user) or \
+                    self.__is_blocked(x_user, y_user, z_user, holding):
+                return False
+        return True
+
+    def __is_traverse_free(self, x_from_user, y_from_user, x_to_user, y_to_user, z_user, holding):
+        """
+        Check if the end-effector can move horizontally at a height, testing that the cells along the straight line are
+        reachable and free.
+        """
+        # two samples per cell, so that no cell is skipped
+        samples = 2 * max(abs(x_to_user - x_from_user), abs(y_to_user - y_from_user)) + 1
+        cells = set()
+        for x_user, y_user in zip(numpy.linspace(x_from_user, x_to_user, samples),
+                                  numpy.linspace(y_from_user, y_to_user, samples)):
+            cells.add((math.floor(x_user + .5), math.floor(y_user + .5)))
+        return all(self.__reachability_map.is_reachable(x_user, y_user, z_user) and
+                   not self.__is_blocked(x_user, y_user, z_user, holding) for x_user, y_user in cells)
@@ -0,0 +1,89 @@
+"""
+This file contains the MotionProfiles, which store speed and acceleration of every motion profile.
+"""
+import math
+
+from comrob_py.enums.motion_profile import MotionProfile
+
+
+def move_duration(distance, speed, acceleration):
+    """
+    Duration of a straight move from standstill to standstill with a trapezoidal velocity profile.
+    :param distance: length of the move in mm
+    :type distance: float
+    :param speed: maximum speed in mm/min
+    :type speed: float
+    :param acceleration: acceleration and deceleration in mm/s^2
+    :type acceleration: float
+    :return: duration in s
+    :rtype: float
+    """
+    speed = speed / 60.0
+    # short moves never reach the full speed
+    if distance < speed * speed / acceleration:
+        return 2.0 * math.sqrt(distance / acceleration)
+    return distance / speed + speed / acceleration
+
+
+class MotionProfiles:
+    """
+    The MotionProfiles store speed and acceleration of every motion profile and estimate the duration of moves, assuming
+    a trapezoidal velocity profile that accelerates and decelerates equally.
+    """
+    def __init__(self, traverse_speed=10000, traverse_acceleration=1000, approach_speed=2000,
+                 approach_acceleration=500, carry_speed=5000, carry_acceleration=500):
+        """
+        Constructor.
+        :param traverse_speed: speed of free moves in mm/min
+        :type traverse_speed: float
+        :param traverse_acceleration: acceleration of free moves in mm/s^2
+        :type traverse_acceleration: float
+        :param approach_speed: speed of moves towards blocks in mm/min
+        :type approach_speed: float
+        :param approach_acceleration: acceleration of moves towards blocks in mm/s^2
+        :type approach_acceleration: float
+        :param carry_speed: speed of moves while holding a block in mm/min
+        :type carry_speed: float
+        :param carry_acceleration: acceleration of moves while holding a block in mm/s^2
+        :type carry_acceleration: float
+        """
+        # profile -> (speed, acceleration)
+        self.__profiles = {MotionProfile.Traverse: (traverse_speed, traverse_acceleration),
+                           MotionProfile.Approach: (approach_speed, approach_acceleration),
+                           MotionProfile.Carry: (carry_speed, carry_acceleration)}
+
+    def speed(self, motion_profile):
+        """
+        Speed of profile in mm/min, the unit used by the swift api.
+        """
+        return self.__profiles[motion_profile][0]
+
+    def acceleration(self, motion_profile):
+        """
+        Acceleration of profile in mm/s^2.
+        """
+        return self.__profiles[motion_profile][1]
+
+    def set_profile(self, motion_profile, speed, acceleration):
+        """
+        Change speed and acceleration of a profile.
+        :param motion_profile: profile to change
+        :type motion_profile: MotionProfile
+        :param speed: speed in mm/min
+        :type speed: float
+        :param acceleration: acceleration in mm/s^2
+        :type acceleration: float
+        """
+        self.__profiles[motion_profile] = (speed, acceleration)
+
+    def estimate_duration(self, distance, motion_profile):
+        """
+        Estimate the duration of a straight move from standstill to standstill.
+        :param distance: length of the move in mm
+        :type distance: float
+        :param motion_profile: profile of the move
+        :type motion_profile: MotionProfile
+        :return: estimated duration in s
+        :rtype: float
+        """
+        return move_duration(distance, self.speed(motion_profile), self.acceleration(motion_profile))
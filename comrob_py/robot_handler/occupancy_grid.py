@@ -0,0 +1,202 @@
+"""
+This file contains the OccupancyGrid, which tracks the blocks placed in the user grid.
+"""
+import numpy
+
+from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+
+
+class OccupancyGrid:
+    """
+    The OccupancyGrid stores for every cell of the user grid if it is occupied by a block. The grid starts at the
+    ground (z = 0), so the cell below a block is either in the grid or the ground.
+    Columns of the grid are either tracked, i.e. all their blocks are known, or unknown, e.g. blocks placed on the
+    table before the start. Blocks dropped onto unknown columns are always supported.
+    """
+    def __init__(self, origin_xy, shape, blocks=None, tracked=True):
+        """
+        Constructor.
+        :param origin_xy: user coordinates x, y of the first cell of the grid
+        :type origin_xy: tuple
+        :param shape: number of cells in x, y and z
+        :type shape: tuple
+        :param blocks: user coordinates x, y, z of blocks already placed
+        :type blocks: list
+        :param tracked: true if the blocks are all blocks already placed, false if no column is known
+        :type tracked: bool
+        """
+        self.__origin = (origin_xy[0], origin_xy[1], 0)
+        self.__occupied = numpy.zeros(shape, dtype=bool)
+        self.__tracked = numpy.full(shape[:2], tracked, dtype=bool)
+        # changed on every change of a block, to know when paths need to be planned again
+        self.__version = 0
+        for block in blocks or []:
+            self.add_block(*block)
+
+    @classmethod
+    def from_reachability_map(cls, reachability_map, blocks=None, tracked=True):
+        """
+        Create grid covering all cells of the reachability map down to the ground.
+        :param reachability_map: reachability map of the user grid
+        :type reachability_map: ReachabilityMap
+        :param blocks: user coordinates x, y, z of blocks already placed
+        :type blocks: list
+        :param tracked: true if the blocks are all blocks already placed, false if no column is known
+        :type tracked: bool
+        :return: grid with the blocks
+        :rtype: OccupancyGrid
+        """
+        x_origin, y_origin, z_origin = reachability_map.origin
+        x_size, y_size, z_size = reachability_map.shape
+        return cls((x_origin, y_origin), (x_size, y_size, max(z_origin + z_size, 1)), blocks, tracked)
+
+    @property
+    def origin(self):
+        """
+        User coordinates of the first cell of the grid.
+        """
+        return self.__origin
+
+    @property
+    def version(self):
+        """
+        Number of changes of the grid.
+        """
+        return self.__version
+
+    @property
+    def occupied(self):
+        """
+        Read-only boolean array of all cells, indexed by user coordinates minus origin.
+        """
+        occupied = self.__occupied.view()
+        occupied.setflags(write=False)
+        return occupied
+
+    def is_occupied(self, x_user, y_user, z_user):
+        """
+        Check if cell is occupied by a block. Cells outside of the grid are never occupied.
+        :param x_user: x-position in user frame
+        :type x_user: int
+        :param y_user: y-position in user frame
+        :type y_user: int
+        :param z_user: z-position in user frame
+        :type z_user: int
+        :return: true if there is a block in the cell
+        :rtype: bool
+        """
+        index = self.__index(x_user, y_user, z_user)
+        if index is None:
+            return False
+        return bool(self.__occupied[index])
+
+    def is_tracked(self, x_user, y_user):
+        """
+        Check if all blocks of a column are known. Columns outside of the grid are known to be empty.
+        :param x_user: x-position in user frame
+        :type x_user: int
+        :param y_user: y-position in user frame
+        :type y_user: int
+        :return: true if the column is tracked
+        :rtype: bool
+        """
+        index = self.__index(x_user, y_user, 0)
+        if index is None:
+            return True
+        return bool(self.__tracked[index[0], index[1]])
+
+    def has_support(self, x_user, y_user, z_user):
+        """
+        Check if a block in the cell would stand on the ground or on another block. Blocks in unknown columns are
+        always supported.
+        :param x_user: x-position in user frame
+        :type x_user: int
+        :param y_user: y-position in user frame
+        :type y_user: int
+        :param z_user: z-position in user frame
+        :type z_user: int
+        :return: true if the cell below is the ground or a block, or the column is unknown
+        :rtype: bool
+        """
+        return z_user == 0 or not self.is_tracked(x_user, y_user) or self.is_occupied(x_user, y_user, z_user - 1)
+
+    def column_height(self, x_user, y_user):
+        """
+        Height of the stack at a position, i.e. the first free cell above the highest block.
+        :param x_user: x-position in user frame
+        :type x_user: int
+        :param y_user: y-position in user frame
+        :type y_user: int
+        :return: z-position in user frame of the first free cell above the highest block, 0 without block, None if
+            the column is unknown
+        :rtype: int
+        """
+        index = self.__index(x_user, y_user, 0)
+        if index is None:
+            return 0
+        if not self.__tracked[index[0], index[1]]:
+            return None
+        column = self.__occupied[index[0], index[1]]
+        occupied_z = numpy.flatnonzero(column)
+        return int(occupied_z[-1]) + 1 if occupied_z.size else 0
+
+    def add_block(self, x_user, y_user, z_user):
+        """
+        Mark cell as occupied.
+        :param x_user: x-position in user frame
+        :type x_user: int
+        :param y_user: y-position in user frame
+        :type y_user: int
+        :param z_user: z-position in user frame
+        :type z_user: int
+        """
+        self.__occupied[self.__checked_index(x_user, y_user, z_user)] = True
+        self.__version += 1
+
+    def remove_block(self, x_user, y_user, z_user):
+        """
+        Mark cell as free.
+        :param x_user: x-position in user frame
+        :type x_user: int
+        :param y_user: y-position in user frame
+        :type y_user: int
+        :param z_user: z-position in user frame
+        :type z_user: int
+        """
+        self.__occupied[self.__checked_index(x_user, y_user, z_user)] = False
+        self.__version += 1
+
+    def track_column(self, x_user, y_user, height):
+        """
+        Mark column as tracked, with a stack of blocks from the ground up to the height.
+        :param x_user: x-position in user frame
+        :type x_user: int
+        :param y_user: y-position in user frame
+        :type y_user: int
+        :param height: z-position in user frame of the first free cell above the stack
+        :type height: int
+        """
+        index = self.__checked_index(x_user, y_user, 0)
+        self.__occupied[index[0], index[1]] = False
+        self.__occupied[index[0], index[1], :height] = True
+        self.__tracked[index[0], index[1]] = True
+        self.__version += 1
+
+    def __index(self, x_user, y_user, z_user):
+        """
+        Array index of cell, None if the cell is outside of the grid.
+        """
+        index = (int(x_user) - self.__origin[0], int(y_user) - self.__origin[1], int(z_user) - self.__origin[2])
+        if all(0 <= value < size for value, size in zip(index, self.__occupied.shape)):
+            return index
+        return None
+
+    def __checked_index(self, x_user, y_user, z_user):
+        """
+        Array index of cell, raises an error if the cell is outside of the grid.
+        """
+        index = self.__index(x_user, y_user, z_user)
+        if index is None:
+            message = "Block is outside of the grid."
+            raise ComrobError(ErrorCode.E0018, message)
+        return index
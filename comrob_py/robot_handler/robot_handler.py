@@ -1,37 +1,87 @@
 """
 This class handles the direct communication with the uArm Swift pro.
 """
+import math
 import time
 
-from uarm_python_sdk.uarm.wrapper.swift_api import SwiftAPI
+from contextlib import contextmanager
 
+from comrob_py.enums.motion_profile import MotionProfile
+from comrob_py.enums.pump_status import PumpStatus
+from comrob_py.enums.robot_backend import RobotBackend
+from comrob_py.metrics.metrics import registry
 from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
 from comrob_py.robot_handler.mock_swift_api import MockSwiftApi
+from comrob_py.robot_handler.motion_profiles import MotionProfiles
+from comrob_py.robot_handler.simulated_swift_api import SimulatedSwiftApi
+
+
+# hardware id of the uArm swift pro
+UARM_HWID = 'USB VID:PID=2341:0042'
+
+SERIAL_SECONDS = registry.histogram("comrob_serial_call_seconds", "Duration of the calls of the swift api.",
+                                    ("call",))
+# time in s between two reads of the pump status while the pump is still working
+PUMP_POLL_INTERVAL = 0.05
 
 
 class RobotHandler:
     """
     This class handles the direct communication with the uArm swift pro and offers the basic functions.
     """
-    def __init__(self):
+    def __init__(self, swift=None, motion_profiles=None, clock=None, port=None, backend=RobotBackend.Uarm,
+                 event_log=None):
         """
         Init function.
+        :param swift: swift api to use instead of the backend
+        :type swift: SwiftAPI or SimulatedSwiftApi or MockSwiftApi
+        :param motion_profiles: speed and acceleration of the moves, default profiles if None
+        :type motion_profiles: MotionProfiles
+        :param clock: monotonic clock returning the time in s, used to estimate when the arm stops, the clock of the
+            simulation or time.monotonic if None
+        :type clock: callable
+        :param port: serial port of the uArm, the first uArm found is used if None
+        :type port: str
+        :param backend: device to connect to, if no swift api is given
+        :type backend: RobotBackend
+        :param event_log: log to record the calls to the swift api in, nothing is recorded if None
+        :type event_log: EventLog
         """
+        self.__event_log = event_log
+        self.__motion_profiles = motion_profiles if motion_profiles is not None else MotionProfiles()
         # connect to uArm
-        try:
-            self.__swift = SwiftAPI(filters={'hwid': 'USB VID:PID=2341:0042'})
-            self.__swift.waiting_ready(timeout=10)
-        except Exception:  # can only except like this due to error kind used in swift api
-            self.__swift = MockSwiftApi()
+        if swift is not None:
+            self.__swift = swift
+        elif backend is RobotBackend.Simulated:
+            self.__swift = SimulatedSwiftApi(port=port)
+        elif backend is RobotBackend.Mock:
+            self.__swift = MockSwiftApi(port=port)
+        else:
+            self.__swift = self.__connect(port)
+        if clock is None:
+            clock = self.__swift.clock if isinstance(self.__swift, SimulatedSwiftApi) else time.monotonic
+        self.__clock = clock
 
         # set general mode: 0
-        self.__swift.set_mode(0)
+        self.__serial("set_mode", 0)
 
         # initialize empty position values
         self.__x_uarm = 0
         self.__y_uarm = 0
         self.__z_uarm = 0
         self.__wrist_angle = 0
+        # moves not sent yet, axis -> target, merged until the batch ends
+        self.__pending_moves = dict()
+        self.__pending_profile = MotionProfile.Traverse
+        # acceleration set on the uarm, None if unknown
+        self.__acceleration = None
+        # estimated time at which the arm stops
+        self.__busy_until = 0.0
+        self.__batch_depth = 0
+        # true if commands were sent since the last flush
+        self.__unflushed = False
+        # true if the next flush waits until the arm stopped
+        self.__wait_stop = False
         # set values
         self.reset()
 
@@ -51,22 +101,73 @@ class RobotHandler:
     def wrist_angle(self):
         return self.__wrist_angle
 
+    @property
+    def motion_profiles(self):
+        return self.__motion_profiles
+
+    @property
+    def busy_time(self):
+        """
+        Estimated time in s until the arm stops, 0 if it is not moving.
+        """
+        return max(self.__busy_until - self.__clock(), 0.0)
+
+    @staticmethod
+    def __connect(port):
+        """
+        Connect to uArm.
+        :param port: serial port of the uArm, the first uArm found is used if None
+        :type port: str
+        :return: connected swift api
+        :rtype: SwiftAPI
+        """
+        try:
+            # the sdk is only needed to control a real uArm
+            from uarm_python_sdk.uarm.wrapper.swift_api import SwiftAPI
+        except ImportError:
+            message = "Robot not connected, uarm python sdk is not installed."
+            raise ComrobError(ErrorCode.E0023, message)
+        try:
+            if port is not None:
+                swift = SwiftAPI(port=port)
+            else:
+                swift = SwiftAPI(filters={'hwid': UARM_HWID})
+            swift.waiting_ready(timeout=10)
+        except Exception:  # can only except like this due to error kind used in swift api
+            message = "Robot not connected."
+            raise ComrobError(ErrorCode.E0023, message)
+        return swift
+
+    @staticmethod
+    def discover_ports():
+        """
+        Find the serial ports of all connected uArms.
+        :return: serial ports
+        :rtype: list
+        """
+        # pyserial is installed with the swift api
+        from serial.tools import list_ports
+        return sorted(port_info.device for port_info in list_ports.comports() if UARM_HWID in port_info.hwid)
+
     def disconnect(self):
         """
         Disconnect robot.
         """
-        self.__swift.flush_cmd()
+        self.__serial("flush_cmd")
         time.sleep(1)
-        self.__swift.disconnect()
+        self.__serial("disconnect")
 
     def reset(self):
         """
         Reset robot, go back to start position.
         """
+        # moves queued before the reset are obsolete
+        self.__pending_moves = dict()
         # reset arm to home
-        self.__swift.reset(wait=True, speed=10000)
+        self.__serial("reset", wait=True, speed=10000)
+        self.__busy_until = self.__clock()
         # get pose values in uarm frame
-        pose = self.__swift.get_position()
+        pose = self.__serial("get_position")
         # check if successful
         if isinstance(pose, list):
             self.__x_uarm = pose[0]
@@ -78,20 +179,69 @@ class RobotHandler:
 
         # set servo value in degrees
         wrist_angle = 90.0
-        self.__swift.set_servo_angle(servo_id=3, angle=wrist_angle)
+        self.__serial("set_servo_angle", servo_id=3, angle=wrist_angle)
         self.__wrist_angle = wrist_angle
 
-        self.__swift.flush_cmd()
+        self.__serial("flush_cmd")
+
+    @contextmanager
+    def batch(self):
+        """
+        Context in which all moves are collected and sent when the context is left, merging consecutive moves into as
+        few commands as possible and flushing only once. Batches can be nested, the outermost batch sends the moves.
+        """
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0:
+                self.__commit()
+
+    def move(self, x=None, y=None, z=None, wrist_angle=None, merge=True, wait=False,
+             motion_profile=MotionProfile.Traverse):
+        """
+        Move robot in uarm frame, axes which are None keep their value. Moves to the current pose are dropped.
+        :param x: new x-position of robot, in uarm coordinate frame
+        :type x: float
+        :param y: new y-position of robot, in uarm coordinate frame
+        :type y: float
+        :param z: new height of robot, in uarm coordinate frame
+        :type z: float
+        :param wrist_angle: absolute wrist angle in degrees
+        :type wrist_angle: float
+        :param merge: false to keep this move separate from the previous one, e.g. for waypoints of a path
+        :type merge: bool
+        :param wait: true to wait until the arm stopped, when the move is sent
+        :type wait: bool
+        :param motion_profile: speed and acceleration of the move
+        :type motion_profile: MotionProfile
+        """
+        new_moves = {axis: value for axis, value in (("x", x), ("y", y), ("z", z), ("wrist_angle", wrist_angle))
+                     if value is not None}
+        # moves along the same axis to different targets are kept in order, moves with different profiles are separate
+        if self.__pending_moves and \
+                (not merge or motion_profile is not self.__pending_profile or
+                 any(self.__pending_moves.get(axis, value) != value for axis, value in new_moves.items())):
+            self.__send_pending_moves()
+        self.__pending_moves.update(new_moves)
+        self.__pending_profile = motion_profile
+        self.__wait_stop = self.__wait_stop or wait
+
+        if self.__batch_depth == 0:
+            self.__commit()
 
-    def height(self, z):
+    def height(self, z, wait=False, motion_profile=MotionProfile.Traverse):
         """
         Move robot to height in uarm frame.
         :param z: new height of robot to move to, in uarm coordinate frame.
         :type z: float
+        :param wait: true to wait until the arm stopped
+        :type wait: bool
+        :param motion_profile: speed and acceleration of the move
+        :type motion_profile: MotionProfile
         """
-        self.__swift.set_position(z=z)
-        self.__swift.flush_cmd()
-        self.__z_uarm = z
+        self.move(z=z, wait=wait, motion_profile=motion_profile)
 
     def position(self, x, y):
         """
@@ -101,20 +251,59 @@ class RobotHandler:
         :param y: new y-position of robot to move to, in uarm coordinate frame
         :type y: float
         """
-        self.__swift.set_position(x=x, y=y)
-        self.__swift.flush_cmd()
-        self.__x_uarm = x
-        self.__y_uarm = y
-        return
+        self.move(x=x, y=y)
 
-    def pump(self, on):
+    def pump(self, on, wait=False):
         """
         Toggle the pump function on/off.
         :param on: True to turn pump on
         :type on: bool
+        :param wait: true to wait until the moves queued in the batch are finished and the pump acknowledged the
+            command
+        :type wait: bool
+        """
+        # queued moves need to be finished before the pump is toggled
+        self.__send_pending_moves()
+        if wait and self.__unflushed:
+            self.__serial("flush_cmd", wait_stop=True)
+            self.__unflushed = False
+            self.__wait_stop = False
+            self.__busy_until = self.__clock()
+        self.__serial("set_pump", on=on, wait=wait)
+        self.__unflushed = True
+
+        if self.__batch_depth == 0:
+            self.__commit()
+
+    def pump_status(self, timeout=0.0):
+        """
+        Read status of the pump.
+        :param timeout: time in s to read the status again while the pump is still working, the firmware reports
+            working for a moment after the pump was toggled
+        :type timeout: float
+        :return: status of the pump
+        :rtype: PumpStatus
+        """
+        self.__commit()
+        status = self.__read_pump_status()
+        for _ in range(int(timeout / PUMP_POLL_INTERVAL)):
+            if status is not PumpStatus.Working:
+                break
+            time.sleep(PUMP_POLL_INTERVAL)
+            status = self.__read_pump_status()
+        return status
+
+    def __read_pump_status(self):
+        """
+        Read status of the pump once.
+        :return: status of the pump
+        :rtype: PumpStatus
         """
-        self.__swift.set_pump(on=on)
-        self.__swift.flush_cmd()
+        try:
+            return PumpStatus(self.__serial("get_pump_status", wait=True))
+        except ValueError:
+            message = "Pump status not readable."
+            raise ComrobError(ErrorCode.E0016, message)
 
     def rotate_wrist(self, angle_deg):
         """
@@ -122,7 +311,63 @@ class RobotHandler:
         :param angle_deg: absolute wrist angle in degrees
         :type angle_deg: float
         """
-        self.__swift.set_wrist(angle=angle_deg, wait=True)
-        self.__swift.flush_cmd()
-        # we still keep track of the real angle
-        self.__wrist_angle = angle_deg
+        # wait for the servo, so that the following commands start with the wrist in place
+        self.move(wrist_angle=angle_deg, wait=True)
+
+    def __send_pending_moves(self):
+        """
+        Send queued moves as one position command and one wrist command, skipping axes already at their target.
+        """
+        position = {axis: value for axis, value in self.__pending_moves.items()
+                    if axis != "wrist_angle" and value != getattr(self, axis + "_uarm")}
+        if position:
+            acceleration = self.__motion_profiles.acceleration(self.__pending_profile)
+            if acceleration != self.__acceleration:
+                self.__serial("set_acceleration", acc=acceleration)
+                self.__acceleration = acceleration
+            self.__serial("set_position", **position, speed=self.__motion_profiles.speed(self.__pending_profile))
+            # moves are executed one after the other
+            distance = math.sqrt(sum((value - getattr(self, axis + "_uarm")) ** 2 for axis, value in position.items()))
+            self.__busy_until = max(self.__busy_until, self.__clock()) + \
+                self.__motion_profiles.estimate_duration(distance, self.__pending_profile)
+            self.__x_uarm = position.get("x", self.__x_uarm)
+            self.__y_uarm = position.get("y", self.__y_uarm)
+            self.__z_uarm = position.get("z", self.__z_uarm)
+            self.__unflushed = True
+
+        wrist_angle = self.__pending_moves.get("wrist_angle")
+        if wrist_angle is not None and wrist_angle != self.__wrist_angle:
+            # wait until the servo acknowledged, so that the following moves start with the wrist in place
+            self.__serial("set_wrist", angle=wrist_angle, wait=True)
+            # we still keep track of the real angle
+            self.__wrist_angle = wrist_angle
+            self.__unflushed = True
+
+        self.__pending_moves = dict()
+
+    def __serial(self, call, *args, **kwargs):
+        """
+        Call function of the swift api and measure how long the serial communication takes.
+        :param call: name of the function
+        :type call: str
+        :return: return value of the function
+        """
+        if self.__event_log is not None:
+            self.__event_log.robot_call(call, args, kwargs)
+        start = time.perf_counter()
+        try:
+            return getattr(self.__swift, call)(*args, **kwargs)
+        finally:
+            SERIAL_SECONDS.observe(time.perf_counter() - start, call)
+
+    def __commit(self):
+        """
+        Send queued moves and flush all sent commands.
+        """
+        self.__send_pending_moves()
+        if self.__unflushed:
+            self.__serial("flush_cmd", wait_stop=self.__wait_stop)
+            self.__unflushed = False
+            if self.__wait_stop:
+                self.__busy_until = self.__clock()
+        self.__wait_stop = False
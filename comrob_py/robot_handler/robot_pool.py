@@ -0,0 +1,181 @@
+"""
+This file contains the RobotPool, which distributes the voting sessions between several arms.
+"""
+import asyncio
+import inspect
+import logging
+
+from comrob_py.enums.aggregation_mode import AggregationMode
+from comrob_py.enums.command_key import CommandKey, FunctionKey
+from comrob_py.enums.pool_mode import PoolMode
+from comrob_py.metrics.metrics import registry
+from comrob_py.robot_handler.async_handler import AsyncExecutor
+from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+from comrob_py.robot_handler.vote_aggregation import aggregate
+
+SELECT_SECONDS = registry.histogram("comrob_select_command_seconds", "Duration of the selection of the winners.")
+
+logger = logging.getLogger(__name__)
+
+
+class RobotPool:
+    """
+    The RobotPool runs the commands of several arms, every arm with its own user handler and frame. In round-robin mode
+    the winner of a session is executed by the next arm in turn, in independent mode every vote selects an arm with an
+    additional last argument and the winners of all arms are executed in parallel. Every arm executes one command at a
+    time.
+    """
+    def __init__(self, user_handlers, pool_mode=PoolMode.RoundRobin, aggregation_mode=AggregationMode.Plurality):
+        """
+        Constructor.
+        :param user_handlers: one user handler per arm
+        :type user_handlers: list
+        :param pool_mode: distribution of the sessions between the arms
+        :type pool_mode: PoolMode
+        :param aggregation_mode: how the votes of every arm are aggregated into its command
+        :type aggregation_mode: AggregationMode
+        """
+        self.__user_handlers = list(user_handlers)
+        self.__pool_mode = pool_mode
+        self.__aggregation_mode = aggregation_mode
+        # number of arguments of every function of the user handler, the arm is given after them
+        self.__argument_counts = {function_key: len(inspect.signature(getattr(self.__user_handlers[0],
+                                                                              function_key.value)).parameters)
+                                  for function_key in FunctionKey}
+        # arm executing the winner of the current session in round-robin mode
+        self.__next_arm = 0
+        self.__async_executors = [AsyncExecutor() for _ in self.__user_handlers]
+        # last execution of every arm
+        self.__executions = [None] * len(self.__user_handlers)
+
+    def __len__(self):
+        """
+        Number of arms.
+        """
+        return len(self.__user_handlers)
+
+    @property
+    def pool_mode(self):
+        return self.__pool_mode
+
+    @property
+    def aggregation_mode(self):
+        return self.__aggregation_mode
+
+    @property
+    def user_handlers(self):
+        return tuple(self.__user_handlers)
+
+    @property
+    def busy_time(self):
+        """
+        Estimated time in s until the arms executing the next session are free.
+        """
+        if self.__pool_mode is PoolMode.RoundRobin:
+            return self.__user_handlers[self.__next_arm].busy_time
+        return max(user_handler.busy_time for user_handler in self.__user_handlers)
+
+    def validate_command(self, function_key, args):
+        """
+        Check if a command can be executed by the arm it is meant for, without moving the robot.
+        :param function_key: function of the command
+        :type function_key: FunctionKey
+        :param args: arguments of the command, in independent mode optionally followed by the arm
+        :type args: list
+        """
+        arm, args = self.__split_arm(function_key, args)
+        self.__user_handlers[arm].validate_command(function_key, args)
+
+    def select_commands(self, vote_tally):
+        """
+        Select the command with the most votes for every arm.
+        :param vote_tally: tally of a closed session
+        :type vote_tally: VoteTally
+        :return: arm -> command with arguments of the user handler
+        :rtype: dict
+        """
+        if self.__pool_mode is PoolMode.RoundRobin:
+            # the tally keeps the leader of the plurality vote
+            if self.__aggregation_mode is AggregationMode.Plurality:
+                return {self.__next_arm: vote_tally.select_command()}
+            return {self.__next_arm: aggregate(vote_tally.commands(), self.__aggregation_mode)}
+
+        # arm -> (function, args) -> number of votes, votes with and without the default arm are counted together
+        counts = dict()
+        for command in vote_tally.commands():
+            try:
+                arm, args = self.__split_arm(command[CommandKey.Function], command[CommandKey.Args])
+            except ComrobError:
+                continue
+            arm_counts = counts.setdefault(arm, dict())
+            command_tuple = (command[CommandKey.Function], tuple(args))
+            arm_counts[command_tuple] = arm_counts.get(command_tuple, 0) + command[CommandKey.Count]
+
+        return {arm: aggregate([{CommandKey.Function: function_key, CommandKey.Args: list(args),
+                                 CommandKey.Count: count} for (function_key, args), count in arm_counts.items()],
+                               self.__aggregation_mode)
+                for arm, arm_counts in counts.items()}
+
+    async def dispatch(self, vote_tally, execute):
+        """
+        Execute the winners of a session, waiting without blocking the event loop until the arms executing them
+        finished their previous command. Needs to be called from one event loop only.
+        :param vote_tally: tally of a closed session
+        :type vote_tally: VoteTally
+        :param execute: function called with user handler, command and arm on the thread of the arm
+        :type execute: callable
+        :return: arm -> awaitable execution
+        :rtype: dict
+        """
+        with SELECT_SECONDS.time():
+            commands = self.select_commands(vote_tally)
+        # votes arriving from now on are for the next session, so they are checked for the arm executing it
+        if self.__pool_mode is PoolMode.RoundRobin:
+            self.__next_arm = (self.__next_arm + 1) % len(self.__user_handlers)
+        executions = dict()
+        for arm, command in commands.items():
+            if self.__executions[arm] is not None:
+                await asyncio.wait([self.__executions[arm]])
+            execution = asyncio.ensure_future(
+                self.__async_executors[arm].run(execute, self.__user_handlers[arm], command, arm))
+            execution.add_done_callback(lambda done, arm=arm: self.__log_failure(done, arm))
+            self.__executions[arm] = execution
+            executions[arm] = execution
+        return executions
+
+    def shutdown(self):
+        """
+        Wait for all executions and stop the threads of the arms.
+        """
+        for async_executor in self.__async_executors:
+            async_executor.shutdown(wait=True)
+
+    @staticmethod
+    def __log_failure(execution, arm):
+        """
+        Log unexpected errors of an execution, expected errors are handled by the execute function.
+        """
+        if execution.cancelled():
+            return
+        error = execution.exception()
+        if error is not None and not isinstance(error, ComrobError):
+            logger.error("Arm %d failed to execute a command.", arm, exc_info=error)
+
+    def __split_arm(self, function_key, args):
+        """
+        Split the arm from the arguments of a command.
+        :return: arm and arguments of the user handler
+        :rtype: tuple
+        """
+        argument_count = self.__argument_counts[function_key]
+        if len(args) == argument_count:
+            return (self.__next_arm if self.__pool_mode is PoolMode.RoundRobin else 0), list(args)
+
+        if self.__pool_mode is PoolMode.RoundRobin:
+            message = "Arms can only be chosen in independent mode."
+            raise ComrobError(ErrorCode.E0022, message)
+        arm = args[-1]
+        if len(args) != argument_count + 1 or not 0 <= arm < len(self.__user_handlers):
+            message = "Unknown arm."
+            raise ComrobError(ErrorCode.E0022, message)
+        return arm, list(args[:-1])
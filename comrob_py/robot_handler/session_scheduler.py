@@ -0,0 +1,180 @@
+"""
+This file contains the SessionScheduler, which decides when a voting session is closed.
+"""
+import asyncio
+import threading
+import time
+
+from comrob_py.metrics.metrics import registry
+
+WINDOW_SECONDS = registry.histogram("comrob_session_window_seconds", "Length of the sessions from the first vote.",
+                                    buckets=(1.0, 2.0, 3.0, 5.0, 10.0, 15.0, 20.0, 30.0, 60.0))
+SESSION_VOTES = registry.histogram("comrob_session_votes", "Weighted number of votes of the closed sessions.",
+                                   buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000))
+
+
+class SessionScheduler:
+    """
+    The SessionScheduler waits for the votes of one session. The window starts with the first vote, is closed early if
+    a quorum with a clear majority is reached and is extended while a quiet chat keeps voting.
+    """
+    def __init__(self, window=10.0, min_window=3.0, max_window=20.0, quiet_extension=3.0, quorum=10, majority=0.5,
+                 clock=time.monotonic):
+        """
+        Constructor.
+        :param window: regular length of a session in s, counted from the first vote
+        :type window: float
+        :param min_window: minimum length of a session in s, before it can be closed early
+        :type min_window: float
+        :param max_window: maximum length of a session in s, including extensions
+        :type max_window: float
+        :param quiet_extension: time in s the session stays open after the last vote, while the quorum is not reached
+        :type quiet_extension: float
+        :param quorum: number of votes needed to close the session early
+        :type quorum: int
+        :param majority: share of votes the leading command needs to close the session early
+        :type majority: float
+        :param clock: monotonic clock returning the time in s
+        :type clock: callable
+        """
+        self.__window = window
+        self.__min_window = min_window
+        self.__max_window = max_window
+        self.__quiet_extension = quiet_extension
+        self.__quorum = quorum
+        self.__majority = majority
+        self.__clock = clock
+
+        self.__condition = threading.Condition()
+        # state of the latest voted session
+        self.__session_id = None
+        self.__total = 0
+        self.__leader_count = 0
+        self.__first_vote_time = None
+        self.__last_vote_time = None
+        # estimated time at which the robot is free for the next command
+        self.__busy_until = 0.0
+        # functions waking up the coroutines waiting for a session
+        self.__wakeups = []
+
+    def notify_vote(self, vote_tally):
+        """
+        Notify scheduler about an accepted vote, can be called from any thread.
+        :param vote_tally: live tally of the session the vote was added to
+        :type vote_tally: VoteTally
+        """
+        with self.__condition:
+            now = self.__clock()
+            if vote_tally.session_id != self.__session_id:
+                self.__session_id = vote_tally.session_id
+                self.__first_vote_time = now
+            self.__total = vote_tally.total
+            self.__leader_count = vote_tally.leader_count
+            self.__last_vote_time = now
+            self.__notify()
+
+    def notify_busy(self, busy_time):
+        """
+        Notify scheduler how long the robot is still busy, a session is not closed before the robot is free, so that
+        votes arriving in the meantime are still counted.
+        :param busy_time: estimated time in s until the robot is free
+        :type busy_time: float
+        """
+        with self.__condition:
+            self.__busy_until = self.__clock() + busy_time
+            self.__notify()
+
+    def remaining_time(self, total, leader_count, elapsed, elapsed_last_vote):
+        """
+        Time left until a session with the given state is closed.
+        :param total: number of votes in the session
+        :type total: int
+        :param leader_count: number of votes of the leading command
+        :type leader_count: int
+        :param elapsed: time since the first vote in s
+        :type elapsed: float
+        :param elapsed_last_vote: time between the first and the last vote in s
+        :type elapsed_last_vote: float
+        :return: remaining time in s, 0 if the session is to be closed
+        :rtype: float
+        """
+        # close early if there is a clear winner
+        if total >= self.__quorum and leader_count > self.__majority * total:
+            return max(self.__min_window - elapsed, 0.0)
+
+        deadline = self.__window
+        # keep a quiet session open while votes are still coming in
+        if total < self.__quorum:
+            deadline = max(deadline, elapsed_last_vote + self.__quiet_extension)
+        deadline = min(deadline, self.__max_window)
+        return max(deadline - elapsed, 0.0)
+
+    def wait_for_session(self, session_id):
+        """
+        Wait until the session is to be closed (blocking). Waits without time limit until the first vote is received.
+        :param session_id: id of the session to wait for
+        :type session_id: int
+        """
+        with self.__condition:
+            while True:
+                remaining = self.__remaining(session_id)
+                if remaining is not None and remaining <= 0.0:
+                    return
+                self.__condition.wait(remaining)
+
+    async def wait_for_session_async(self, session_id):
+        """
+        Wait until the session is to be closed, without blocking the event loop. Waits without time limit until the
+        first vote is received.
+        :param session_id: id of the session to wait for
+        :type session_id: int
+        """
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+
+        def wake():
+            loop.call_soon_threadsafe(wakeup.set)
+
+        with self.__condition:
+            self.__wakeups.append(wake)
+        try:
+            while True:
+                # cleared before the state is read, so that no notification is missed
+                wakeup.clear()
+                with self.__condition:
+                    remaining = self.__remaining(session_id)
+                if remaining is not None and remaining <= 0.0:
+                    return
+                try:
+                    await asyncio.wait_for(wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self.__condition:
+                self.__wakeups.remove(wake)
+
+    def __remaining(self, session_id):
+        """
+        Time left until the session is to be closed, needs to be called with the condition acquired.
+        :return: remaining time in s, 0 if the session is to be closed, None if no vote was received yet
+        :rtype: float
+        """
+        if self.__session_id != session_id:
+            return None
+
+        now = self.__clock()
+        remaining = self.remaining_time(self.__total, self.__leader_count, now - self.__first_vote_time,
+                                        self.__last_vote_time - self.__first_vote_time)
+        remaining = max(remaining, self.__busy_until - now)
+        if remaining <= 0.0:
+            WINDOW_SECONDS.observe(now - self.__first_vote_time)
+            SESSION_VOTES.observe(self.__total)
+        return remaining
+
+    def __notify(self):
+        """
+        Wake up everyone waiting for a session, needs to be called with the condition acquired.
+        """
+        self.__condition.notify_all()
+        for wake in self.__wakeups:
+            wake()
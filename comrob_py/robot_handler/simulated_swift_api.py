@@ -0,0 +1,191 @@
+"""
+This file provides the SimulatedSwiftApi class.
+"""
+import math
+import threading
+import time
+
+from comrob_py.enums.pump_status import PumpStatus
+from comrob_py.robot_handler.motion_profiles import move_duration
+
+
+class SimulatedSwiftApi:
+    """
+    This class simulates the Swift Api class with the timing of a real uArm. Every command takes the serial latency to be
+    acknowledged, moves are executed one after the other with a duration derived from distance, speed and acceleration,
+    and the pose is interpolated along the current move. In real time mode waiting sleeps, otherwise a virtual clock is
+    advanced, so that long runs take no time.
+    """
+    def __init__(self, port=None, baudrate=115200, timeout=None, latency=0.005, default_speed=10000,
+                 acceleration=1000, home=(200, 0, 150), realtime=True, **kwargs):
+        """
+        Constructor.
+        :param latency: time in s until a command is acknowledged
+        :type latency: float
+        :param default_speed: speed of moves without speed in mm/min
+        :type default_speed: float
+        :param acceleration: acceleration of moves in mm/s^2, until changed with set_acceleration
+        :type acceleration: float
+        :param home: position the arm is reset to in uarm frame
+        :type home: tuple
+        :param realtime: true to wait in real time, false to advance a virtual clock
+        :type realtime: bool
+        """
+        self.__latency = latency
+        self.__default_speed = default_speed
+        self.__acceleration = acceleration
+        self.__home = tuple(float(value) for value in home)
+        self.__realtime = realtime
+        self.__start_time = time.monotonic()
+        self.__virtual_time = 0.0
+        self.__lock = threading.Lock()
+
+        # moves as (start time, end time, start pose, end pose), the last move ends at the target pose
+        self.__moves = [(0.0, 0.0, self.__home, self.__home)]
+        # time at which the last command is acknowledged
+        self.__ack_time = 0.0
+        self.__mode = 0
+        self.__servo_angles = {3: 90.0}
+        self.__pump = False
+        self.__connected = True
+
+    def clock(self):
+        """
+        Simulated time in s, can be used as clock of the robot handler.
+        """
+        if self.__realtime:
+            return time.monotonic() - self.__start_time
+        return self.__virtual_time
+
+    @property
+    def pose(self):
+        """
+        Current position in uarm frame.
+        """
+        with self.__lock:
+            return self.__pose_at(self.clock())
+
+    @property
+    def connected(self):
+        return self.__connected
+
+    @property
+    def pump_on(self):
+        return self.__pump
+
+    @property
+    def servo_angles(self):
+        return dict(self.__servo_angles)
+
+    def connect(self, port=None, baudrate=None, timeout=None):
+        self.__connected = True
+
+    def disconnect(self, is_clean=True):
+        self.__connected = False
+
+    def waiting_ready(self, timeout=5, **kwargs):
+        self.__command(wait=True)
+
+    def reset(self, speed=None, wait=True, timeout=None, x=200, y=0, z=150):
+        self.__move((x, y, z), speed, wait)
+        self.__servo_angles = {3: 90.0}
+
+    def set_mode(self, mode=0, wait=True, timeout=None, callback=None):
+        self.__command(wait)
+        self.__mode = mode
+
+    def get_position(self, wait=True, timeout=None, callback=None):
+        self.__command(wait=True)
+        with self.__lock:
+            return list(self.__pose_at(self.clock()))
+
+    def set_position(self, x=None, y=None, z=None, speed=None, relative=False, wait=False, timeout=10, callback=None,
+                     cmd='G0'):
+        target = self.__moves[-1][3]
+        if relative:
+            target = tuple(value + (offset or 0.0) for value, offset in zip(target, (x, y, z)))
+        else:
+            target = tuple(value if new_value is None else float(new_value)
+                           for value, new_value in zip(target, (x, y, z)))
+        self.__move(target, speed, wait)
+
+    def set_acceleration(self, acc=None, wait=True, timeout=None, callback=None):
+        self.__command(wait)
+        if acc is not None:
+            self.__acceleration = acc
+
+    def set_servo_angle(self, servo_id=0, angle=90, wait=False, timeout=10, speed=None, callback=None):
+        self.__command(wait)
+        self.__servo_angles[servo_id] = angle
+
+    def set_wrist(self, angle=90, wait=False, timeout=10, speed=None, callback=None):
+        self.set_servo_angle(servo_id=3, angle=angle, wait=wait, timeout=timeout, speed=speed, callback=callback)
+
+    def set_pump(self, on=False, timeout=None, wait=True, check=False, callback=None):
+        self.__command(wait)
+        self.__pump = on
+
+    def get_pump_status(self, wait=True, timeout=None, callback=None):
+        self.__command(wait=True)
+        return (PumpStatus.Grabbing if self.__pump else PumpStatus.Stop).value
+
+    def flush_cmd(self, timeout=None, wait_stop=False):
+        with self.__lock:
+            wait_time = max(self.__ack_time, self.__moves[-1][1]) if wait_stop else self.__ack_time
+        self.__wait_until(wait_time)
+
+    def __command(self, wait):
+        """
+        Send a command, returns when it is acknowledged if wait is true.
+        :return: time at which the command is acknowledged
+        :rtype: float
+        """
+        with self.__lock:
+            # commands are sent one after the other over the serial connection
+            self.__ack_time = max(self.__ack_time, self.clock()) + self.__latency
+            ack_time = self.__ack_time
+        if wait:
+            self.__wait_until(ack_time)
+        return ack_time
+
+    def __move(self, target, speed, wait):
+        """
+        Queue move to target, returns when the arm stopped if wait is true.
+        """
+        ack_time = self.__command(wait=False)
+        with self.__lock:
+            start_time = max(ack_time, self.__moves[-1][1])
+            start = self.__moves[-1][3]
+            end_time = start_time + move_duration(math.dist(start, target), speed or self.__default_speed,
+                                                  self.__acceleration)
+            # finished moves are not needed for the pose anymore
+            now = self.clock()
+            self.__moves = [move for move in self.__moves if move[1] > now] or [self.__moves[-1]]
+            self.__moves.append((start_time, end_time, start, target))
+        if wait:
+            self.__wait_until(end_time)
+
+    def __pose_at(self, at_time):
+        """
+        Position at time, interpolated along the move executed at that time.
+        """
+        for start_time, end_time, start, end in self.__moves:
+            if at_time < end_time:
+                if at_time <= start_time:
+                    return start
+                share = (at_time - start_time) / (end_time - start_time)
+                return tuple(start_value + share * (end_value - start_value)
+                             for start_value, end_value in zip(start, end))
+        return self.__moves[-1][3]
+
+    def __wait_until(self, at_time):
+        """
+        Wait until the simulated time reached at_time.
+        """
+        if self.__realtime:
+            remaining = at_time - self.clock()
+            if remaining > 0:
+                time.sleep(remaining)
+        else:
+            with self.__lock:
+                self.__virtual_time = max(self.__virtual_time, at_time)
@@ -0,0 +1,86 @@
+"""
+This file contains the unit tests for the async robot handler and user handler.
+"""
+import asyncio
+import threading
+import unittest
+
+from comrob_py.enums.command_key import FunctionKey
+from comrob_py.robot_handler.async_handler import AsyncExecutor, AsyncRobotHandler, AsyncUserHandler
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.robot_handler import RobotHandler
+from comrob_py.robot_handler.simulated_swift_api import SimulatedSwiftApi
+from comrob_py.robot_handler.user_handler import UserHandler
+
+
+class TestAsyncHandler(unittest.TestCase):
+    def setUp(self):
+        self.__swift = SimulatedSwiftApi(realtime=False)
+        self.__robot_handler = RobotHandler(swift=self.__swift)
+        self.__async_executor = AsyncExecutor()
+        self.addCleanup(self.__async_executor.shutdown)
+        super().setUp()
+
+    def test_robot_handler(self):
+        """
+        Test that awaited moves are acknowledged by the arm, and stopped if waited for.
+        """
+        async_robot_handler = AsyncRobotHandler(self.__robot_handler, self.__async_executor)
+
+        async def run():
+            await async_robot_handler.move(x=150, y=50, wait=True)
+            await async_robot_handler.rotate_wrist(45)
+            await async_robot_handler.pump(True, wait=True)
+            return await async_robot_handler.pump_status()
+
+        asyncio.run(run())
+        self.assertEqual(self.__swift.pose[:2], (150.0, 50.0))
+        self.assertEqual(self.__swift.servo_angles[3], 45)
+        self.assertTrue(self.__swift.pump_on)
+
+    def test_user_handler(self):
+        """
+        Test that commands are executed in order and errors are raised when awaited.
+        """
+        async_user_handler = AsyncUserHandler(UserHandler(robot_handler=self.__robot_handler), self.__async_executor)
+
+        async def run():
+            # both commands are queued at once and executed one after the other
+            await asyncio.gather(async_user_handler.position(5, 9), async_user_handler.height(1))
+            await async_user_handler.execute(FunctionKey.Position, [6, 9])
+            with self.assertRaises(ComrobError):
+                await async_user_handler.height(100)
+
+        asyncio.run(run())
+        # the arm reaches the last acknowledged move
+        self.__swift.flush_cmd(wait_stop=True)
+        self.assertEqual(self.__swift.pose, (self.__robot_handler.x_uarm, self.__robot_handler.y_uarm,
+                                             self.__robot_handler.z_uarm))
+
+    def test_cancel(self):
+        """
+        Test that cancelled calls are dropped before they start.
+        """
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def blocking_call(name):
+            started.set()
+            release.wait()
+            calls.append(name)
+
+        async def run():
+            first = asyncio.ensure_future(self.__async_executor.run(blocking_call, "first"))
+            second = asyncio.ensure_future(self.__async_executor.run(blocking_call, "second"))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+            second.cancel()
+            await asyncio.gather(second, return_exceptions=True)
+            release.set()
+            await first
+            with self.assertRaises(asyncio.CancelledError):
+                await second
+
+        asyncio.run(run())
+        self.__async_executor.shutdown()
+        self.assertEqual(calls, ["first"])
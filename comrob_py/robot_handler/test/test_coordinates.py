@@ -4,7 +4,8 @@ Test file for coordinates.py
 import unittest
 
 from comrob_py.enums.coordinate_frame import CoordinateFrame
-from comrob_py.robot_handler.coordinates import Coordinates
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.coordinates import Coordinates, CoordinatesArray
 
 
 class TestCoordinates(unittest.TestCase):
@@ -35,4 +36,19 @@ class TestCoordinates(unittest.TestCase):
         self.assertEqual(y_2, c_1.y)
         self.assertEqual(z_2, c_1.z)
 
-
+    def test_array(self):
+        """
+        Test conversion between coordinates array and single coordinates.
+        """
+        c_1 = Coordinates(1, 2, 3, CoordinateFrame.User)
+        c_2 = Coordinates(4, 5, 6, CoordinateFrame.User)
+        array_1 = CoordinatesArray.from_coordinates([c_1, c_2])
+        self.assertEqual(len(array_1), 2)
+        self.assertEqual(list(array_1.y), [2, 5])
+        self.assertEqual(CoordinateFrame.User, array_1.coordinate_frame)
+        c_3 = array_1[1]
+        self.assertEqual((c_3.x, c_3.y, c_3.z), (4, 5, 6))
+        self.assertEqual(CoordinateFrame.User, c_3.coordinate_frame)
+        # all coordinates need to be in the same frame
+        c_4 = Coordinates(1, 2, 3, CoordinateFrame.Uarm)
+        self.assertRaises(ComrobError, CoordinatesArray.from_coordinates, [c_1, c_4])
@@ -0,0 +1,66 @@
+"""
+Test file for frame registry.
+"""
+import numpy
+import unittest
+
+from enum import Enum
+
+from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.coordinates import CoordinatesArray
+from comrob_py.robot_handler.frame_registry import FrameRegistry
+
+
+class ExtraFrame(Enum):
+    """
+    Additional frame only used in this test.
+    """
+    Table = "table"
+
+
+class TestFrameRegistry(unittest.TestCase):
+    def setUp(self):
+        self.__frame_registry = FrameRegistry.user_frame(edge_length_xy=40, edge_length_z=35, x_offset=0,
+                                                         y_offset=-320, z_offset=0)
+        super().setUp()
+
+    def test_transform(self):
+        """
+        Test transform of an array from user to uarm frame and back.
+        """
+        coordinates_user = CoordinatesArray([[4, 8, 3], [0, 0, 0]], CoordinateFrame.User)
+        coordinates_uarm = self.__frame_registry.transform(coordinates_user, CoordinateFrame.Uarm)
+        self.assertEqual(CoordinateFrame.Uarm, coordinates_uarm.coordinate_frame)
+        numpy.testing.assert_allclose(coordinates_uarm.coordinates, [[180, 20, 122.5], [20, -300, 17.5]])
+        coordinates_back = self.__frame_registry.transform(coordinates_uarm, CoordinateFrame.User)
+        numpy.testing.assert_allclose(coordinates_back.coordinates, coordinates_user.coordinates)
+
+    def test_chained_frames(self):
+        """
+        Test transform through a chain of frames and that the cache is updated when a frame changes.
+        """
+        # table frame rotated by 90 degrees in user frame
+        self.__frame_registry.add_frame(ExtraFrame.Table, CoordinateFrame.User, offset=(1, 2, 0), rotation_deg=90.0)
+        coordinates_table = CoordinatesArray([[1, 0, 0]], ExtraFrame.Table)
+        coordinates_uarm = self.__frame_registry.transform(coordinates_table, CoordinateFrame.Uarm)
+        # (1, 0, 0) in table frame is (1, 3, 0) in user frame
+        numpy.testing.assert_allclose(coordinates_uarm.coordinates, [[60, -180, 17.5]], atol=1e-9)
+        coordinates_back = self.__frame_registry.transform(coordinates_uarm, ExtraFrame.Table)
+        numpy.testing.assert_allclose(coordinates_back.coordinates, [[1, 0, 0]], atol=1e-9)
+
+        version = self.__frame_registry.version
+        self.__frame_registry.add_frame(ExtraFrame.Table, CoordinateFrame.User, offset=(2, 2, 0), rotation_deg=90.0)
+        self.assertGreater(self.__frame_registry.version, version)
+        coordinates_uarm = self.__frame_registry.transform(coordinates_table, CoordinateFrame.Uarm)
+        numpy.testing.assert_allclose(coordinates_uarm.coordinates, [[100, -180, 17.5]], atol=1e-9)
+
+    def test_errors(self):
+        """
+        Test transforms to the same frame, unknown frames and cycles.
+        """
+        coordinates_user = CoordinatesArray([[4, 8, 3]], CoordinateFrame.User)
+        self.assertRaises(ComrobError, self.__frame_registry.transform, coordinates_user, CoordinateFrame.User)
+        self.assertRaises(ComrobError, self.__frame_registry.transform, coordinates_user, ExtraFrame.Table)
+        self.__frame_registry.add_frame(ExtraFrame.Table, CoordinateFrame.User)
+        self.assertRaises(ComrobError, self.__frame_registry.add_frame, CoordinateFrame.User, ExtraFrame.Table)
@@ -0,0 +1,77 @@
+"""
+Test file for motion planner.
+"""
+import numpy
+import unittest
+
+from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.enums.motion_profile import MotionProfile
+from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+from comrob_py.robot_handler.coordinates import Coordinates
+from comrob_py.robot_handler.frame_registry import FrameRegistry
+from comrob_py.robot_handler.motion_planner import MotionPlanner
+from comrob_py.robot_handler.occupancy_grid import OccupancyGrid
+from comrob_py.robot_handler.workspace import ReachabilityMap, Workspace
+
+
+class TestMotionPlanner(unittest.TestCase):
+    def setUp(self):
+        frame_registry = FrameRegistry.user_frame(edge_length_xy=40, edge_length_z=35, x_offset=0, y_offset=-320,
+                                                  z_offset=0)
+        reachability_map = ReachabilityMap(Workspace(174, 93.5, 120, 340, 40), frame_registry)
+        # tower of two blocks between start and target
+        self.__occupancy_grid = OccupancyGrid.from_reachability_map(reachability_map, [(5, 8, 0), (5, 8, 1)])
+        self.__motion_planner = MotionPlanner(frame_registry, reachability_map, self.__occupancy_grid)
+        super().setUp()
+
+    def test_direct(self):
+        """
+        Test that free paths are not lifted.
+        """
+        motion_plan = self.__motion_planner.plan(Coordinates(4, 8, 3, CoordinateFrame.User),
+                                                 Coordinates(6, 8, 3, CoordinateFrame.User))
+        numpy.testing.assert_array_equal(motion_plan.waypoints.coordinates, [[4, 8, 3], [6, 8, 3]])
+        # 80 mm at 10000 mm/min, accelerating with 1000 mm/s^2
+        self.assertAlmostEqual(motion_plan.duration, 0.48 + 1 / 6)
+        self.assertEqual([MotionProfile.Traverse], motion_plan.motion_profiles)
+
+    def test_lift(self):
+        """
+        Test that the end-effector is lifted over a tower, higher when holding a block.
+        """
+        motion_plan = self.__motion_planner.plan(Coordinates(4, 8, 1, CoordinateFrame.User),
+                                                 Coordinates(6, 8, 1, CoordinateFrame.User))
+        numpy.testing.assert_array_equal(motion_plan.waypoints.coordinates,
+                                         [[4, 8, 1], [4, 8, 2], [6, 8, 2], [6, 8, 1]])
+        self.assertEqual(3, len(motion_plan))
+        motion_plan = self.__motion_planner.plan(Coordinates(4, 8, 1, CoordinateFrame.User),
+                                                 Coordinates(6, 8, 1, CoordinateFrame.User), holding=True)
+        numpy.testing.assert_array_equal(motion_plan.waypoints.coordinates,
+                                         [[4, 8, 1], [4, 8, 3], [6, 8, 3], [6, 8, 1]])
+        self.assertEqual([MotionProfile.Carry, MotionProfile.Carry, MotionProfile.Approach],
+                         motion_plan.motion_profiles)
+
+    def test_blocked(self):
+        """
+        Test that targets in a block and paths without clearance are rejected.
+        """
+        with self.assertRaises(ComrobError) as context:
+            self.__motion_planner.plan(Coordinates(4, 8, 1, CoordinateFrame.User),
+                                       Coordinates(5, 8, 1, CoordinateFrame.User))
+        self.assertEqual(ErrorCode.E0019, context.exception.error_code)
+        # fill the column above the start
+        for z_user in range(2, self.__occupancy_grid.occupied.shape[2]):
+            self.__occupancy_grid.add_block(4, 8, z_user)
+        with self.assertRaises(ComrobError) as context:
+            self.__motion_planner.plan(Coordinates(4, 8, 1, CoordinateFrame.User),
+                                       Coordinates(6, 8, 1, CoordinateFrame.User))
+        self.assertEqual(ErrorCode.E0021, context.exception.error_code)
+
+    def test_unreachable_traverse(self):
+        """
+        Test that paths traversing cells out of reach, next to the base of the robot, are rejected.
+        """
+        with self.assertRaises(ComrobError) as context:
+            self.__motion_planner.plan(Coordinates(1, 12, 1, CoordinateFrame.User),
+                                       Coordinates(1, 4, 1, CoordinateFrame.User))
+        self.assertEqual(ErrorCode.E0021, context.exception.error_code)
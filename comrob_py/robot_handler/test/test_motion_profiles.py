@@ -0,0 +1,21 @@
+"""
+Test file for motion profiles.
+"""
+import unittest
+
+from comrob_py.enums.motion_profile import MotionProfile
+from comrob_py.robot_handler.motion_profiles import MotionProfiles
+
+
+class TestMotionProfiles(unittest.TestCase):
+    def test_estimate_duration(self):
+        """
+        Test duration of long moves at full speed and of short moves that only accelerate and decelerate.
+        """
+        motion_profiles = MotionProfiles()
+        motion_profiles.set_profile(MotionProfile.Traverse, speed=6000, acceleration=1000)
+        # 100 mm/s reached after 10 mm
+        self.assertAlmostEqual(motion_profiles.estimate_duration(100, MotionProfile.Traverse), 1.1)
+        self.assertAlmostEqual(motion_profiles.estimate_duration(2.5, MotionProfile.Traverse), 0.1)
+        self.assertEqual(motion_profiles.estimate_duration(0, MotionProfile.Traverse), 0.0)
+        self.assertEqual(motion_profiles.speed(MotionProfile.Approach), 2000)
@@ -0,0 +1,50 @@
+"""
+Test file for occupancy grid.
+"""
+import unittest
+
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.occupancy_grid import OccupancyGrid
+
+
+class TestOccupancyGrid(unittest.TestCase):
+    def test_blocks(self):
+        """
+        Test adding and removing blocks, support and column height.
+        """
+        occupancy_grid = OccupancyGrid((-1, 0), (10, 10, 5), blocks=[(2, 3, 0)])
+        self.assertTrue(occupancy_grid.is_occupied(2, 3, 0))
+        self.assertFalse(occupancy_grid.is_occupied(2, 3, 1))
+        # outside of the grid
+        self.assertFalse(occupancy_grid.is_occupied(2, 3, 7))
+        self.assertFalse(occupancy_grid.is_occupied(-2, 3, 0))
+        # ground and blocks support other blocks
+        self.assertTrue(occupancy_grid.has_support(4, 4, 0))
+        self.assertTrue(occupancy_grid.has_support(2, 3, 1))
+        self.assertFalse(occupancy_grid.has_support(4, 4, 1))
+
+        occupancy_grid.add_block(2, 3, 1)
+        self.assertEqual(occupancy_grid.column_height(2, 3), 2)
+        occupancy_grid.remove_block(2, 3, 1)
+        self.assertEqual(occupancy_grid.column_height(2, 3), 1)
+        self.assertEqual(occupancy_grid.column_height(4, 4), 0)
+        self.assertRaises(ComrobError, occupancy_grid.add_block, 20, 3, 1)
+
+    def test_unknown_columns(self):
+        """
+        Test that columns with unknown blocks support every block and get tracked once their stack is known.
+        """
+        occupancy_grid = OccupancyGrid((-1, 0), (10, 10, 5), tracked=False)
+        self.assertFalse(occupancy_grid.is_tracked(2, 3))
+        self.assertTrue(occupancy_grid.has_support(2, 3, 2))
+        self.assertIsNone(occupancy_grid.column_height(2, 3))
+        # outside of the grid there are no blocks
+        self.assertTrue(occupancy_grid.is_tracked(20, 3))
+
+        version = occupancy_grid.version
+        occupancy_grid.track_column(2, 3, 2)
+        self.assertNotEqual(occupancy_grid.version, version)
+        self.assertTrue(occupancy_grid.is_tracked(2, 3))
+        self.assertEqual(occupancy_grid.column_height(2, 3), 2)
+        self.assertTrue(occupancy_grid.has_support(2, 3, 2))
+        self.assertFalse(occupancy_grid.has_support(2, 3, 3))
@@ -3,12 +3,54 @@ Test robot handler.
 """
 import unittest
 
+from comrob_py.enums.motion_profile import MotionProfile
+from comrob_py.enums.pump_status import PumpStatus
+from comrob_py.enums.robot_backend import RobotBackend
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.mock_swift_api import MockSwiftApi
+from comrob_py.robot_handler.motion_profiles import MotionProfiles
 from comrob_py.robot_handler.robot_handler import RobotHandler
+from comrob_py.robot_handler.user_handler import UserHandler
+
+
+class RecordingSwiftApi(MockSwiftApi):
+    """
+    Mock swift api recording the name and arguments of all calls.
+    """
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        # speed and acceleration of the moves, recorded separately
+        self.speeds = []
+        self.accelerations = []
+
+    def get_position(self, wait=True, timeout=None, callback=None):
+        return [200, 0, 150]
+
+    def set_position(self, x=None, y=None, z=None, speed=None, relative=False, wait=False, timeout=10, callback=None,
+                     cmd='G0'):
+        self.calls.append(("set_position", x, y, z))
+        self.speeds.append(speed)
+
+    def set_acceleration(self, acc=None, wait=True, timeout=None, callback=None):
+        self.accelerations.append(acc)
+
+    def set_wrist(self, angle=90, wait=False, timeout=10, speed=None, callback=None):
+        self.calls.append(("set_wrist", angle, wait))
+
+    def set_pump(self, on=False, timeout=None, wait=True, check=False, callback=None):
+        self.calls.append(("set_pump", on, wait))
+
+    def get_pump_status(self, wait=True, timeout=None, callback=None):
+        return 2
+
+    def flush_cmd(self, timeout=None, wait_stop=False):
+        self.calls.append(("flush_cmd", wait_stop))
 
 
 class TestRobotHandler(unittest.TestCase):
     def setUp(self):
-        self.__robot_handler = RobotHandler()
+        self.__robot_handler = RobotHandler(backend=RobotBackend.Simulated)
         super().setUp()
 
     def tearDown(self):
@@ -21,3 +63,105 @@ class TestRobotHandler(unittest.TestCase):
         """
         pass
 
+    def test_batch(self):
+        """
+        Test that moves in a batch are merged, moves to the current pose are dropped and commands are flushed once.
+        """
+        swift = RecordingSwiftApi()
+        robot_handler = RobotHandler(swift=swift)
+        swift.calls = []
+        with robot_handler.batch():
+            robot_handler.position(180, 20)
+            robot_handler.height(150)
+            robot_handler.rotate_wrist(80)
+        # the batch waits for the wrist
+        self.assertEqual(swift.calls, [("set_position", 180, 20, None), ("set_wrist", 80, True), ("flush_cmd", True)])
+        self.assertEqual((robot_handler.x_uarm, robot_handler.y_uarm, robot_handler.wrist_angle), (180, 20, 80))
+
+        # move to the current pose is not sent at all
+        swift.calls = []
+        robot_handler.position(180, 20)
+        self.assertEqual(swift.calls, [])
+
+    def test_batch_order(self):
+        """
+        Test that moves along the same axis and moves around the pump keep their order.
+        """
+        swift = RecordingSwiftApi()
+        robot_handler = RobotHandler(swift=swift)
+        swift.calls = []
+        with robot_handler.batch():
+            robot_handler.height(100)
+            robot_handler.pump(True)
+            robot_handler.height(150)
+            robot_handler.height(120)
+            robot_handler.move(x=100, merge=False)
+        self.assertEqual(swift.calls, [("set_position", None, None, 100), ("set_pump", True, False),
+                                       ("set_position", None, None, 150), ("set_position", None, None, 120),
+                                       ("set_position", 100, None, None), ("flush_cmd", False)])
+
+    def test_pump_wait(self):
+        """
+        Test that the pump waits until the arm stopped after a move.
+        """
+        swift = RecordingSwiftApi()
+        robot_handler = RobotHandler(swift=swift)
+        swift.calls = []
+        robot_handler.height(100)
+        robot_handler.pump(True, wait=True)
+        self.assertEqual(swift.calls, [("set_position", None, None, 100), ("flush_cmd", False),
+                                       ("set_pump", True, True), ("flush_cmd", False)])
+        swift.calls = []
+        with robot_handler.batch():
+            robot_handler.height(120)
+            robot_handler.pump(False, wait=True)
+        self.assertEqual(swift.calls, [("set_position", None, None, 120), ("flush_cmd", True),
+                                       ("set_pump", False, True), ("flush_cmd", False)])
+        self.assertEqual(robot_handler.pump_status(), PumpStatus.Grabbing)
+
+    def test_motion_profiles(self):
+        """
+        Test that moves are sent with the speed of their profile and the estimated time until the arm stops.
+        """
+        swift = RecordingSwiftApi()
+        now = [0.0]
+        robot_handler = RobotHandler(swift=swift, motion_profiles=MotionProfiles(), clock=lambda: now[0])
+        with robot_handler.batch():
+            robot_handler.height(100)
+            # different profiles are not merged
+            robot_handler.position(150, 0)
+            robot_handler.height(50, motion_profile=MotionProfile.Approach)
+        self.assertEqual(swift.speeds, [10000, 2000])
+        self.assertEqual(swift.accelerations, [1000, 500])
+        # 50 mm diagonal in 50 * sqrt(2) / 10000 min, 50 mm at 2000 mm/min, plus acceleration
+        self.assertAlmostEqual(robot_handler.busy_time, 50 * 2 ** .5 * 0.006 + 1 / 6 + 1.5 + 1 / 15)
+        now[0] = 10.0
+        self.assertEqual(robot_handler.busy_time, 0.0)
+
+    def test_lifted_path(self):
+        """
+        Test that a path over a stack is sent as separate lift, traverse and lower moves, with the wrist rotated and
+        acknowledged during the lift.
+        """
+        swift = RecordingSwiftApi()
+        user_handler = UserHandler(initial_blocks=[(5, 9, 0), (5, 9, 1)], robot_handler=RobotHandler(swift=swift))
+        user_handler.position(4, 9)
+        user_handler.height(1)
+        swift.calls = []
+        user_handler.position(6, 9)
+        self.assertEqual([call[0] for call in swift.calls],
+                         ["set_position", "set_wrist", "set_position", "set_position", "flush_cmd"])
+        # lift, traverse and lower move one axis each
+        self.assertEqual([[value is None for value in call[1:]] for call in swift.calls if call[0] == "set_position"],
+                         [[True, True, False], [False, True, True], [True, True, False]])
+        self.assertTrue(swift.calls[1][2])
+
+    def test_backends(self):
+        """
+        Test that the mock backend starts at the home position and that a missing uArm raises a ComrobError.
+        """
+        robot_handler = RobotHandler(backend=RobotBackend.Mock)
+        self.assertEqual((robot_handler.x_uarm, robot_handler.y_uarm, robot_handler.z_uarm), (200, 0, 150))
+        robot_handler.pump(True)
+        self.assertEqual(robot_handler.pump_status(), PumpStatus.Grabbing)
+        self.assertRaises(ComrobError, RobotHandler, backend=RobotBackend.Uarm)
@@ -0,0 +1,140 @@
+"""
+Test file for robot pool.
+"""
+import asyncio
+import threading
+import unittest
+
+from comrob_py.enums.command_key import CommandKey, FunctionKey
+from comrob_py.enums.pool_mode import PoolMode
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.robot_handler import RobotHandler
+from comrob_py.robot_handler.simulated_swift_api import SimulatedSwiftApi
+from comrob_py.robot_handler.robot_pool import RobotPool
+from comrob_py.robot_handler.user_handler import UserHandler
+from comrob_py.robot_handler.vote_tally import VoteTally
+
+
+class TestRobotPool(unittest.TestCase):
+    def setUp(self):
+        # the second arm has its user frame shifted by one cube
+        self.__user_handlers = [UserHandler(robot_handler=RobotHandler(swift=SimulatedSwiftApi(realtime=False))),
+                                UserHandler(x_offset=40, robot_handler=RobotHandler(swift=SimulatedSwiftApi(realtime=False)))]
+        super().setUp()
+
+    @staticmethod
+    def __execute(executed):
+        def execute(user_handler, command, arm):
+            getattr(user_handler, command[CommandKey.Function].value)(*command[CommandKey.Args])
+            executed.append((arm, command[CommandKey.Function], command[CommandKey.Args]))
+        return execute
+
+    def test_round_robin(self):
+        """
+        Test that the sessions are executed by the arms in turn and that arms can not be chosen.
+        """
+        robot_pool = RobotPool(self.__user_handlers, PoolMode.RoundRobin)
+        self.assertRaises(ComrobError, robot_pool.validate_command, FunctionKey.Height, [2, 1])
+        executed = []
+
+        async def run():
+            for session_id in range(3):
+                vote_tally = VoteTally(session_id)
+                vote_tally.add(FunctionKey.Height, [session_id + 1], "user")
+                executions = await robot_pool.dispatch(vote_tally, self.__execute(executed))
+                await asyncio.gather(*executions.values())
+
+        asyncio.run(run())
+        robot_pool.shutdown()
+        self.assertEqual(executed, [(0, FunctionKey.Height, [1]), (1, FunctionKey.Height, [2]),
+                                    (0, FunctionKey.Height, [3])])
+
+    def test_dispatch(self):
+        """
+        Test that the next session is dispatched while the previous winner is executed, and waits for its arm only.
+        """
+        robot_pool = RobotPool(self.__user_handlers[:1], PoolMode.RoundRobin)
+        executed = []
+
+        async def run():
+            vote_tally = VoteTally(0)
+            vote_tally.add(FunctionKey.Height, [1], "user")
+            first = (await robot_pool.dispatch(vote_tally, self.__execute(executed)))[0]
+            vote_tally = VoteTally(1)
+            vote_tally.add(FunctionKey.Height, [2], "user")
+            second = (await robot_pool.dispatch(vote_tally, self.__execute(executed)))[0]
+            # the second winner is dispatched after the first one is finished
+            self.assertTrue(first.done())
+            await second
+
+        asyncio.run(run())
+        robot_pool.shutdown()
+        self.assertEqual(executed, [(0, FunctionKey.Height, [1]), (0, FunctionKey.Height, [2])])
+
+    def test_next_arm(self):
+        """
+        Test that votes arriving while a session waits for its arm are checked for the arm of the next session, and that
+        unexpected errors of an arm are logged.
+        """
+        robot_pool = RobotPool(self.__user_handlers, PoolMode.RoundRobin)
+        release = threading.Event()
+        executed = []
+
+        def execute(user_handler, command, arm):
+            if arm == 0:
+                release.wait()
+            self.__execute(executed)(user_handler, command, arm)
+
+        async def run():
+            executions = []
+            for session_id in range(2):
+                vote_tally = VoteTally(session_id)
+                vote_tally.add(FunctionKey.Height, [session_id + 1], "user")
+                executions.extend((await robot_pool.dispatch(vote_tally, execute)).values())
+            vote_tally = VoteTally(2)
+            vote_tally.add(FunctionKey.Height, [3], "user")
+            dispatch = asyncio.ensure_future(robot_pool.dispatch(vote_tally, execute))
+            await asyncio.sleep(0.05)
+            # the third session waits for the first arm, the next session is executed by the second arm
+            self.assertFalse(dispatch.done())
+            robot_pool.validate_command(FunctionKey.Position, [2, 8])
+            release.set()
+            executions.extend((await dispatch).values())
+            await asyncio.gather(*executions)
+
+            def fail(user_handler, command, arm):
+                raise RuntimeError("arm crashed")
+
+            vote_tally = VoteTally(3)
+            vote_tally.add(FunctionKey.Hold, [], "user")
+            with self.assertLogs("comrob_py.robot_handler.robot_pool", level="ERROR"):
+                await asyncio.wait((await robot_pool.dispatch(vote_tally, fail)).values())
+                await asyncio.sleep(0)
+
+        asyncio.run(run())
+        robot_pool.shutdown()
+        self.assertEqual([arm for arm, _, _ in executed], [1, 0, 0])
+
+    def test_independent(self):
+        """
+        Test that every arm executes the winner of its votes, votes without arm go to the first arm.
+        """
+        robot_pool = RobotPool(self.__user_handlers, PoolMode.Independent)
+        robot_pool.validate_command(FunctionKey.Position, [5, 9, 1])
+        self.assertRaises(ComrobError, robot_pool.validate_command, FunctionKey.Position, [5, 9, 2])
+        vote_tally = VoteTally()
+        vote_tally.add(FunctionKey.Position, [5, 9, 1], "user_1")
+        vote_tally.add(FunctionKey.Height, [2], "user_2")
+        vote_tally.add(FunctionKey.Height, [2, 0], "user_3")
+        vote_tally.add(FunctionKey.Hold, [1], "user_4")
+        vote_tally.add(FunctionKey.Hold, [1], "user_5")
+        executed = []
+
+        async def run():
+            executions = await robot_pool.dispatch(vote_tally, self.__execute(executed))
+            await asyncio.gather(*executions.values())
+
+        asyncio.run(run())
+        robot_pool.shutdown()
+        self.assertEqual(sorted(executed, key=lambda execution: execution[0]),
+                         [(0, FunctionKey.Height, [2]), (1, FunctionKey.Hold, [])])
@@ -0,0 +1,101 @@
+"""
+Test file for session scheduler.
+"""
+import asyncio
+import threading
+import time
+import unittest
+
+from comrob_py.enums.command_key import FunctionKey
+from comrob_py.robot_handler.session_scheduler import SessionScheduler
+from comrob_py.robot_handler.vote_tally import VoteTally
+
+
+class TestSessionScheduler(unittest.TestCase):
+    def test_remaining_time(self):
+        """
+        Test closing, extending and the regular window.
+        """
+        scheduler = SessionScheduler(window=10.0, min_window=3.0, max_window=20.0, quiet_extension=3.0, quorum=10,
+                                     majority=0.5)
+        # regular window
+        self.assertEqual(scheduler.remaining_time(20, 5, 4.0, 4.0), 6.0)
+        # clear majority closes early, but not before the minimum window
+        self.assertEqual(scheduler.remaining_time(20, 15, 4.0, 4.0), 0.0)
+        self.assertEqual(scheduler.remaining_time(20, 15, 2.0, 2.0), 1.0)
+        # quiet chat extends the window after the last vote, limited by the maximum window
+        self.assertEqual(scheduler.remaining_time(3, 2, 10.0, 9.0), 2.0)
+        self.assertEqual(scheduler.remaining_time(3, 2, 19.0, 19.0), 1.0)
+        self.assertEqual(scheduler.remaining_time(3, 2, 20.0, 19.0), 0.0)
+
+    def test_wait_for_session(self):
+        """
+        Test that the session waits for the first vote and closes early on a clear majority.
+        """
+        scheduler = SessionScheduler(window=5.0, min_window=0.0, quorum=3)
+        tally = VoteTally(1)
+
+        def vote():
+            time.sleep(0.1)
+            for index in range(3):
+                tally.add(FunctionKey.Hold, [], "user_" + str(index))
+                scheduler.notify_vote(tally)
+
+        thread = threading.Thread(target=vote)
+        start = time.monotonic()
+        thread.start()
+        scheduler.wait_for_session(1)
+        thread.join()
+        duration = time.monotonic() - start
+        self.assertGreaterEqual(duration, 0.1)
+        self.assertLess(duration, 1.0)
+
+    def test_wait_for_session_async(self):
+        """
+        Test waiting on the event loop for votes arriving on the loop and from other threads.
+        """
+        scheduler = SessionScheduler(window=5.0, min_window=0.0, quorum=3)
+        tally = VoteTally(1)
+
+        async def vote():
+            await asyncio.sleep(0.1)
+            tally.add(FunctionKey.Hold, [], "user_0")
+            scheduler.notify_vote(tally)
+            await asyncio.get_running_loop().run_in_executor(None, vote_from_thread)
+
+        def vote_from_thread():
+            for index in range(1, 3):
+                tally.add(FunctionKey.Hold, [], "user_" + str(index))
+                scheduler.notify_vote(tally)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(scheduler.wait_for_session_async(1), vote())
+            return time.monotonic() - start
+
+        duration = asyncio.run(run())
+        self.assertGreaterEqual(duration, 0.1)
+        self.assertLess(duration, 1.0)
+
+    def test_busy(self):
+        """
+        Test that a session is not closed while the robot is busy.
+        """
+        now = [0.0]
+        scheduler = SessionScheduler(window=5.0, min_window=0.0, quorum=1, clock=lambda: now[0])
+        tally = VoteTally(1)
+        tally.add(FunctionKey.Hold, [], "user")
+        scheduler.notify_busy(0.2)
+        scheduler.notify_vote(tally)
+
+        def advance():
+            time.sleep(0.1)
+            now[0] = 1.0
+            scheduler.notify_busy(0.0)
+
+        thread = threading.Thread(target=advance)
+        start = time.monotonic()
+        thread.start()
+        scheduler.wait_for_session(1)
+        thread.join()
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
@@ -0,0 +1,38 @@
+"""
+Test file for simulated swift api.
+"""
+import unittest
+
+from comrob_py.enums.pump_status import PumpStatus
+from comrob_py.robot_handler.simulated_swift_api import SimulatedSwiftApi
+
+
+class TestSimulatedSwiftApi(unittest.TestCase):
+    def test_timing(self):
+        """
+        Test that moves are executed one after the other and the pose is interpolated.
+        """
+        swift = SimulatedSwiftApi(latency=0.01, acceleration=1000, realtime=False)
+        # 100 mm at 6000 mm/min take 1.1 s, after 0.01 s latency
+        swift.set_position(x=300, speed=6000)
+        swift.set_position(y=100, speed=6000)
+        self.assertEqual(swift.pose, (200, 0, 150))
+        # both commands are acknowledged, the first move started
+        swift.flush_cmd()
+        self.assertAlmostEqual(swift.clock(), 0.02)
+        self.assertAlmostEqual(swift.pose[0], 200 + 100 * 0.01 / 1.1)
+        swift.flush_cmd(wait_stop=True)
+        self.assertAlmostEqual(swift.clock(), 2.21)
+        self.assertEqual(swift.get_position(), [300, 100, 150])
+
+        swift.set_position(x=200, speed=6000, wait=True)
+        self.assertAlmostEqual(swift.clock(), 3.33)
+
+    def test_pump(self):
+        """
+        Test pump status.
+        """
+        swift = SimulatedSwiftApi(realtime=False)
+        self.assertEqual(PumpStatus(swift.get_pump_status()), PumpStatus.Stop)
+        swift.set_pump(True)
+        self.assertEqual(PumpStatus(swift.get_pump_status()), PumpStatus.Grabbing)
@@ -3,6 +3,194 @@ This file contains the unit tests for the user handler.
 """
 import unittest
 
+from comrob_py.enums.command_key import FunctionKey
+from comrob_py.enums.pump_status import PumpStatus
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.robot_handler import RobotHandler
+from comrob_py.robot_handler.simulated_swift_api import SimulatedSwiftApi
 from comrob_py.robot_handler.user_handler import UserHandler
 
 
+class SlowPumpSwiftApi(SimulatedSwiftApi):
+    """
+    Simulated swift api whose pump reports working once after every toggle, like the firmware.
+    """
+    def __init__(self):
+        super().__init__(realtime=False)
+        self.__working = False
+
+    def set_pump(self, on=False, timeout=None, wait=True, check=False, callback=None):
+        super().set_pump(on=on, timeout=timeout, wait=wait, check=check, callback=callback)
+        self.__working = True
+
+    def get_pump_status(self, wait=True, timeout=None, callback=None):
+        status = super().get_pump_status(wait=wait, timeout=timeout, callback=callback)
+        if self.__working:
+            self.__working = False
+            return PumpStatus.Working.value
+        return status
+
+
+class FailingSwiftApi(SimulatedSwiftApi):
+    """
+    Simulated swift api losing one move while a block is held.
+    """
+    def __init__(self, failing_move):
+        """
+        Constructor.
+        :param failing_move: number of the move failing while the pump is on, counted from 1
+        :type failing_move: int
+        """
+        super().__init__(realtime=False)
+        self.__failing_move = failing_move
+        self.__pump = False
+
+    def set_pump(self, on=False, timeout=None, wait=True, check=False, callback=None):
+        super().set_pump(on=on, timeout=timeout, wait=wait, check=check, callback=callback)
+        self.__pump = on
+
+    def set_position(self, x=None, y=None, z=None, speed=None, relative=False, wait=False, timeout=10, callback=None,
+                     cmd='G0'):
+        if self.__pump:
+            self.__failing_move -= 1
+            if self.__failing_move == 0:
+                raise TimeoutError("Move not acknowledged.")
+        super().set_position(x=x, y=y, z=z, speed=speed, relative=relative, wait=wait, timeout=timeout,
+                             callback=callback, cmd=cmd)
+
+
+class TestUserHandler(unittest.TestCase):
+    def setUp(self):
+        self.__user_handler = UserHandler(initial_blocks=[(5, 9, 0)],
+                                          robot_handler=RobotHandler(swift=SimulatedSwiftApi(realtime=False)))
+        super().setUp()
+
+    def test_collision(self):
+        """
+        Test that moves into blocks are rejected on execution.
+        """
+        self.__user_handler.position(5, 9)
+        self.assertRaises(ComrobError, self.__user_handler.height, 0)
+        self.__user_handler.height(1)
+
+    def test_pick_and_drop(self):
+        """
+        Test that picked up and dropped blocks are tracked.
+        """
+        occupancy_grid = self.__user_handler.occupancy_grid
+        self.__user_handler.position(5, 9)
+        self.__user_handler.height(1)
+        self.__user_handler.hold()
+        self.assertFalse(occupancy_grid.is_occupied(5, 9, 0))
+        # the held block can not be dropped in the air
+        self.__user_handler.height(3)
+        self.assertRaises(ComrobError, self.__user_handler.hold)
+        self.__user_handler.position(6, 9)
+        self.__user_handler.height(1)
+        self.__user_handler.hold()
+        self.assertTrue(occupancy_grid.is_occupied(6, 9, 0))
+
+    def test_check_grip(self):
+        """
+        Test that the grip is checked once the pump stopped working.
+        """
+        user_handler = UserHandler(check_grip=True, initial_blocks=[(5, 9, 0)],
+                                   robot_handler=RobotHandler(swift=SlowPumpSwiftApi()))
+        user_handler.position(5, 9)
+        user_handler.height(1)
+        user_handler.hold()
+        self.assertFalse(user_handler.occupancy_grid.is_occupied(5, 9, 0))
+
+    def test_unknown_blocks(self):
+        """
+        Test that blocks can be dropped onto stacks placed before start if the blocks on the table are unknown.
+        """
+        user_handler = UserHandler(robot_handler=RobotHandler(swift=SimulatedSwiftApi(realtime=False)))
+        user_handler.height(1)
+        user_handler.hold()
+        user_handler.position(5, 8)
+        user_handler.height(2)
+        user_handler.validate_command(FunctionKey.Hold, [])
+        user_handler.hold()
+        self.assertFalse(user_handler.occupancy_grid.is_tracked(5, 8))
+        # the height of unknown stacks is needed for a move
+        self.assertRaises(ComrobError, user_handler.validate_command, FunctionKey.Move, [5, 8, 6, 8])
+
+    def test_default_blocks(self):
+        """
+        Test that blocks dropped onto the ground are tracked if the blocks on the table are unknown.
+        """
+        user_handler = UserHandler(robot_handler=RobotHandler(swift=SimulatedSwiftApi(realtime=False)))
+        occupancy_grid = user_handler.occupancy_grid
+        user_handler.height(1)
+        user_handler.hold()
+        user_handler.position(6, 8)
+        user_handler.hold()
+        self.assertTrue(occupancy_grid.is_tracked(6, 8))
+        self.assertEqual(occupancy_grid.column_height(6, 8), 1)
+        # the dropped block is avoided and can be moved
+        self.assertRaises(ComrobError, user_handler.height, 0)
+        user_handler.height(3)
+        user_handler.hold()
+        self.assertRaises(ComrobError, user_handler.hold)
+        user_handler.height(2)
+        user_handler.hold()
+        self.assertEqual(occupancy_grid.column_height(6, 8), 2)
+
+    def test_move_initial_blocks(self):
+        """
+        Test moving blocks of stacks placed before start.
+        """
+        user_handler = UserHandler(initial_blocks=[(5, 8, 0), (5, 8, 1), (6, 8, 0)],
+                                   robot_handler=RobotHandler(swift=SimulatedSwiftApi(realtime=False)))
+        occupancy_grid = user_handler.occupancy_grid
+        user_handler.validate_command(FunctionKey.Move, [5, 8, 6, 8])
+        user_handler.move(5, 8, 6, 8)
+        self.assertEqual(occupancy_grid.column_height(5, 8), 1)
+        self.assertEqual(occupancy_grid.column_height(6, 8), 2)
+        user_handler.move(6, 8, 4, 8)
+        self.assertEqual(occupancy_grid.column_height(4, 8), 1)
+
+    def test_move_failure(self):
+        """
+        Test that a block is put back onto its stack if a move fails while carrying it.
+        """
+        for failing_move in (1, 2):
+            user_handler = UserHandler(initial_blocks=[(5, 9, 0)],
+                                       robot_handler=RobotHandler(swift=FailingSwiftApi(failing_move)))
+            occupancy_grid = user_handler.occupancy_grid
+            self.assertRaises(TimeoutError, user_handler.move, 5, 9, 6, 9)
+            self.assertTrue(occupancy_grid.is_occupied(5, 9, 0))
+            self.assertFalse(occupancy_grid.is_occupied(6, 9, 0))
+            # the pump is off again, so the block can be moved
+            user_handler.move(5, 9, 6, 9)
+            self.assertTrue(occupancy_grid.is_occupied(6, 9, 0))
+
+    def test_validate_command(self):
+        """
+        Test that commands are checked on arrival independent of the current position.
+        """
+        self.__user_handler.height(5)
+        # reachable once the arm is lower
+        self.__user_handler.validate_command(FunctionKey.Position, [2, 0])
+        self.assertRaises(ComrobError, self.__user_handler.validate_command, FunctionKey.Position, [-20, 0])
+        self.__user_handler.validate_command(FunctionKey.Height, [1])
+        self.assertRaises(ComrobError, self.__user_handler.validate_command, FunctionKey.Height, [100])
+
+    def test_move(self):
+        """
+        Test that a block is moved onto another stack in one command, and that impossible moves are rejected.
+        """
+        occupancy_grid = self.__user_handler.occupancy_grid
+        self.__user_handler.validate_command(FunctionKey.Move, [5, 9, 6, 9])
+        self.assertRaises(ComrobError, self.__user_handler.validate_command, FunctionKey.Move, [6, 9, 5, 9])
+        self.assertRaises(ComrobError, self.__user_handler.validate_command, FunctionKey.Move, [5, 9, 5, 9])
+        self.assertRaises(ComrobError, self.__user_handler.validate_command, FunctionKey.Move, [5, 9, 100, 9])
+        self.__user_handler.move(5, 9, 6, 9)
+        self.assertFalse(occupancy_grid.is_occupied(5, 9, 0))
+        self.assertTrue(occupancy_grid.is_occupied(6, 9, 0))
+        # the moved block can be stacked on
+        occupancy_grid.add_block(5, 9, 0)
+        self.__user_handler.move(5, 9, 6, 9)
+        self.assertEqual(occupancy_grid.column_height(6, 9), 2)
+        self.assertFalse(occupancy_grid.is_occupied(5, 9, 0))
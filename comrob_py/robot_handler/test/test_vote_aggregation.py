@@ -0,0 +1,85 @@
+"""
+Test file for vote aggregation.
+"""
+import unittest
+
+import numpy
+
+from comrob_py.enums.aggregation_mode import AggregationMode
+from comrob_py.enums.command_key import CommandKey, FunctionKey
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.vote_aggregation import aggregate, neighborhood, weighted_median
+from comrob_py.robot_handler.vote_tally import VoteTally
+
+
+class TestVoteAggregation(unittest.TestCase):
+    def setUp(self):
+        # many votes spread around (4, 8), a few identical votes elsewhere
+        self.__vote_tally = VoteTally()
+        spread = [(4, 8), (3, 8), (5, 8), (4, 7), (4, 9), (3, 9), (5, 7)]
+        for index in range(70):
+            x, y = spread[index % len(spread)]
+            self.__vote_tally.add(FunctionKey.Position, [x, y], "user_" + str(index))
+        for index in range(11):
+            self.__vote_tally.add(FunctionKey.Position, [10, 2], "other_" + str(index))
+        super().setUp()
+
+    def test_plurality(self):
+        """
+        Test that plurality keeps selecting the most identical votes, like the tally.
+        """
+        self.assertEqual(aggregate(self.__vote_tally.commands()), self.__vote_tally.select_command())
+        self.assertEqual(aggregate(self.__vote_tally.commands())[CommandKey.Args], [10, 2])
+        self.assertRaises(ComrobError, aggregate, [], AggregationMode.Median)
+
+    def test_position(self):
+        """
+        Test that spread votes win against identical votes in the spatial modes.
+        """
+        for aggregation_mode in (AggregationMode.Median, AggregationMode.Centroid, AggregationMode.Heatmap):
+            command = aggregate(self.__vote_tally.commands(), aggregation_mode)
+            self.assertEqual(command[CommandKey.Function], FunctionKey.Position)
+            self.assertEqual(command[CommandKey.Args], [4, 8], aggregation_mode)
+            self.assertEqual(command[CommandKey.Count], 81)
+
+    def test_move(self):
+        """
+        Test that moves and targets given with an arm are voted by plurality in the spatial modes.
+        """
+        vote_tally = VoteTally()
+        for index, args in enumerate([[4, 8, 6, 8], [4, 8, 6, 8], [3, 8, 5, 8], [5, 8, 7, 8]]):
+            vote_tally.add(FunctionKey.Move, args, "user_" + str(index))
+        for index, args in enumerate([[3, 8], [5, 8], [4, 8, 1]]):
+            vote_tally.add(FunctionKey.Position, args, "other_" + str(index))
+        for aggregation_mode in (AggregationMode.Median, AggregationMode.Centroid, AggregationMode.Heatmap):
+            command = aggregate(vote_tally.commands(), aggregation_mode)
+            self.assertEqual(command[CommandKey.Args], [4, 8, 6, 8], aggregation_mode)
+            positions = [command for command in vote_tally.commands()
+                         if command[CommandKey.Function] is FunctionKey.Position]
+            self.assertEqual(aggregate(positions, aggregation_mode)[CommandKey.Args], [3, 8], aggregation_mode)
+
+    def test_neighborhood(self):
+        """
+        Test that the smoothed votes match the sum over all pairs of targets.
+        """
+        generator = numpy.random.default_rng(0)
+        targets = generator.integers(-2, 12, size=(50, 2)).astype(float)
+        weights = generator.integers(1, 5, size=50).astype(float)
+        squared_distances = numpy.sum((targets[:, numpy.newaxis, :] - targets[numpy.newaxis, :, :]) ** 2, axis=2)
+        numpy.testing.assert_allclose(neighborhood(targets, weights),
+                                      numpy.exp(-0.5 * squared_distances) @ weights)
+
+    def test_height(self):
+        """
+        Test that height is the weighted median and that the function with the most votes wins.
+        """
+        vote_tally = VoteTally()
+        for index, z in enumerate([0, 1, 1, 2, 5, 5]):
+            vote_tally.add(FunctionKey.Height, [z], "user_" + str(index))
+        vote_tally.add(FunctionKey.Hold, [], "user_hold_1", weight=3)
+        command = aggregate(vote_tally.commands(), AggregationMode.Heatmap)
+        self.assertEqual(command, {CommandKey.Function: FunctionKey.Height, CommandKey.Args: [1], CommandKey.Count: 6})
+        vote_tally.add(FunctionKey.Hold, [], "user_hold_2", weight=4)
+        self.assertEqual(aggregate(vote_tally.commands(), AggregationMode.Median)[CommandKey.Function],
+                         FunctionKey.Hold)
+        self.assertEqual(weighted_median(numpy.array([3.0, 1.0, 2.0]), numpy.array([1.0, 1.0, 5.0])), 2.0)
@@ -0,0 +1,75 @@
+"""
+Test file for vote tally.
+"""
+import unittest
+
+from collections import deque
+
+from comrob_py.enums.command_key import CommandKey, FunctionKey
+from comrob_py.robot_handler.command_handler import select_command
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.vote_tally import VoteTally
+
+
+class TestVoteTally(unittest.TestCase):
+    def test_add(self):
+        """
+        Test that every user can only vote once per session.
+        """
+        tally = VoteTally()
+        self.assertTrue(tally.add(FunctionKey.Height, [1], "user_1"))
+        self.assertFalse(tally.add(FunctionKey.Height, [2], "user_1"))
+        self.assertTrue(tally.has_user("user_1"))
+        self.assertFalse(tally.has_user("user_2"))
+        self.assertEqual(len(tally), 1)
+
+    def test_select_command(self):
+        """
+        Test that the tally selects the same command as select_command on the command buffer, including ties.
+        """
+        votes = [(FunctionKey.Height, [1]), (FunctionKey.Position, [3, 5]), (FunctionKey.Position, [3, 5]),
+                 (FunctionKey.Height, [1]), (FunctionKey.Hold, []), (FunctionKey.Hold, [])]
+        tally = VoteTally()
+        command_buffer = deque()
+        for index, (function_key, args) in enumerate(votes):
+            tally.add(function_key, args, "user_" + str(index))
+            command_buffer.append({CommandKey.Function: function_key, CommandKey.Args: args})
+            self.assertEqual(select_command(tally), select_command(command_buffer))
+        self.assertEqual(tally.select_command(),
+                         {CommandKey.Function: FunctionKey.Height, CommandKey.Args: [1], CommandKey.Count: 2})
+        self.assertEqual(tally.leader_count, 2)
+
+    def test_empty(self):
+        """
+        Test empty tally.
+        """
+        tally = VoteTally(3)
+        self.assertEqual(tally.session_id, 3)
+        self.assertEqual(tally.leader_count, 0)
+        self.assertRaises(ComrobError, tally.select_command)
+
+    def test_commands(self):
+        """
+        Test that all commands are listed in the order of their first vote.
+        """
+        tally = VoteTally()
+        tally.add(FunctionKey.Hold, [], "user_1")
+        tally.add(FunctionKey.Height, [1], "user_2")
+        tally.add(FunctionKey.Height, [1], "user_3")
+        self.assertEqual(tally.commands(),
+                         [{CommandKey.Function: FunctionKey.Hold, CommandKey.Args: [], CommandKey.Count: 1},
+                          {CommandKey.Function: FunctionKey.Height, CommandKey.Args: [1], CommandKey.Count: 2}])
+
+    def test_weights(self):
+        """
+        Test that users are counted per channel and votes are weighted.
+        """
+        tally = VoteTally()
+        self.assertTrue(tally.add(FunctionKey.Hold, [], ("channel_1", "user_1"), 0.5))
+        self.assertTrue(tally.add(FunctionKey.Hold, [], ("channel_2", "user_1"), 0.5))
+        self.assertFalse(tally.add(FunctionKey.Hold, [], ("channel_2", "user_1"), 0.5))
+        self.assertTrue(tally.add(FunctionKey.Height, [1], ("channel_3", "user_2"), 2))
+        self.assertEqual(len(tally), 3)
+        self.assertEqual(tally.total, 3)
+        self.assertEqual(tally.select_command()[CommandKey.Function], FunctionKey.Height)
+        self.assertEqual(tally.leader_count, 2)
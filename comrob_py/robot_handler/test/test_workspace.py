@@ -0,0 +1,46 @@
+"""
+Test file for workspace and reachability map.
+"""
+import itertools
+import unittest
+
+from comrob_py.robot_handler.frame_registry import FrameRegistry
+from comrob_py.robot_handler.workspace import ReachabilityMap, Workspace
+
+
+class TestWorkspace(unittest.TestCase):
+    def setUp(self):
+        self.__workspace = Workspace(xy_base_offset=174, z_base_offset=93.5, min_radius_xy=120, max_radius_xy=340,
+                                     min_z=40)
+        frame_registry = FrameRegistry.user_frame(edge_length_xy=40, edge_length_z=35, x_offset=0, y_offset=-320,
+                                                  z_offset=0)
+        self.__reachability_map = ReachabilityMap(self.__workspace, frame_registry)
+        super().setUp()
+
+    def test_contains(self):
+        """
+        Test single coordinates in uarm frame.
+        """
+        self.assertTrue(self.__workspace.contains(180, 20, 122.5))
+        # behind the robot
+        self.assertFalse(self.__workspace.contains(-20, 20, 122.5))
+        # too close to the base
+        self.assertFalse(self.__workspace.contains(60, 20, 122.5))
+        # below the minimum height
+        self.assertFalse(self.__workspace.contains(180, 20, 17.5))
+
+    def test_reachability_map(self):
+        """
+        Test that the map equals the workspace check for every cell, also outside the bounds of the map.
+        """
+        for x_user, y_user, z_user in itertools.product(range(-2, 12), range(-2, 20), range(-2, 10)):
+            self.assertEqual(self.__reachability_map.is_reachable(x_user, y_user, z_user),
+                             bool(self.__workspace.contains((x_user + .5) * 40, (y_user + .5) * 40 - 320,
+                                                            (z_user + .5) * 35)))
+        # start position of the robot
+        self.assertTrue(self.__reachability_map.is_reachable(4, 8, 3))
+        # some cell at the height or the position is reachable
+        self.assertTrue(self.__reachability_map.is_reachable_height(3))
+        self.assertFalse(self.__reachability_map.is_reachable_height(100))
+        self.assertTrue(self.__reachability_map.is_reachable_column(2, 0))
+        self.assertFalse(self.__reachability_map.is_reachable_column(-20, 0))
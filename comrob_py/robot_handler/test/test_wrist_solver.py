@@ -0,0 +1,55 @@
+"""
+Test file for wrist solver.
+"""
+import unittest
+
+from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.robot_handler.comrob_error import ComrobError
+from comrob_py.robot_handler.coordinates import Coordinates
+from comrob_py.robot_handler.frame_registry import FrameRegistry
+from comrob_py.robot_handler.wrist_solver import WristSolver
+
+
+class TestWristSolver(unittest.TestCase):
+    def setUp(self):
+        self.__frame_registry = FrameRegistry.user_frame(edge_length_xy=40, edge_length_z=35, x_offset=0,
+                                                         y_offset=-320, z_offset=0)
+        self.__wrist_solver = WristSolver(self.__frame_registry, max_size=2)
+        super().setUp()
+
+    def test_solve(self):
+        """
+        Test calculated wrist angle and memoization.
+        """
+        old_coordinates = Coordinates(2, 8, 3, CoordinateFrame.User)
+        new_coordinates = Coordinates(6, 8, 1, CoordinateFrame.User)
+        self.assertAlmostEqual(self.__wrist_solver.solve(old_coordinates, new_coordinates, 90.0), 82.126450117)
+        self.assertEqual(len(self.__wrist_solver), 1)
+        # same cells at a different height use the memoized angle
+        self.__wrist_solver.solve(Coordinates(2, 8, 2, CoordinateFrame.User), new_coordinates, 90.0)
+        self.assertEqual(len(self.__wrist_solver), 1)
+        # moves between non-integer coordinates are not memoized
+        self.__wrist_solver.solve(Coordinates(2.5, 8, 2, CoordinateFrame.User), new_coordinates, 90.0)
+        self.assertEqual(len(self.__wrist_solver), 1)
+
+    def test_cache_size(self):
+        """
+        Test that the cache is bounded and cleared when the frames change.
+        """
+        for x_user in range(2, 6):
+            self.__wrist_solver.solve(Coordinates(x_user, 8, 3, CoordinateFrame.User),
+                                      Coordinates(x_user + 1, 8, 3, CoordinateFrame.User), 90.0)
+        self.assertEqual(len(self.__wrist_solver), 2)
+        self.__frame_registry.add_frame(CoordinateFrame.User, CoordinateFrame.Uarm, offset=(0, -300, 0))
+        self.__wrist_solver.solve(Coordinates(2, 8, 3, CoordinateFrame.User),
+                                  Coordinates(3, 8, 3, CoordinateFrame.User), 90.0)
+        self.assertEqual(len(self.__wrist_solver), 1)
+
+    def test_out_of_range(self):
+        """
+        Test that angles out of servo range raise an error, also when memoized.
+        """
+        old_coordinates = Coordinates(6, 8, 3, CoordinateFrame.User)
+        new_coordinates = Coordinates(1, 0, 3, CoordinateFrame.User)
+        for _ in range(2):
+            self.assertRaises(ComrobError, self.__wrist_solver.solve, old_coordinates, new_coordinates, 90.0)
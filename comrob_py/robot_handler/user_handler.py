@@ -1,14 +1,28 @@
 """
 The user handler handles the conversion from user to uarm frame, as well as validity and collision checks.
 """
-import math
-import numpy
-import time
+import threading
 
+from comrob_py.enums.command_key import FunctionKey
 from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.enums.motion_profile import MotionProfile
+from comrob_py.enums.pump_status import PumpStatus
+from comrob_py.metrics.metrics import registry
 from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
-from comrob_py.robot_handler.coordinates import Coordinates
+from comrob_py.robot_handler.coordinates import Coordinates, CoordinatesArray
+from comrob_py.robot_handler.frame_registry import FrameRegistry
+from comrob_py.robot_handler.motion_planner import MotionPlanner
+from comrob_py.robot_handler.occupancy_grid import OccupancyGrid
 from comrob_py.robot_handler.robot_handler import RobotHandler
+from comrob_py.robot_handler.workspace import ReachabilityMap, Workspace
+from comrob_py.robot_handler.wrist_solver import WristSolver
+
+VALIDATE_SECONDS = registry.histogram("comrob_validate_seconds", "Duration of the checks of a command on arrival.",
+                                      ("function",))
+TRANSFORM_SECONDS = registry.histogram("comrob_transform_seconds",
+                                       "Duration of transforms into the uarm frame including workspace checks.")
+# time in s to wait for the pump to report whether a block was picked up
+GRIP_TIMEOUT = 0.5
 
 
 class UserHandler:
@@ -17,7 +31,7 @@ class UserHandler:
     """
     def __init__(self, edge_length_xy=40, edge_length_z=35, x_offset=0, y_offset=-320, z_offset=0, xy_base_offset=174,
                  z_base_offset=93.5, min_radius_xy=120, max_radius_xy=340, x_start_user=4, y_start_user=8,
-                 z_start_user=3):
+                 z_start_user=3, check_grip=False, initial_blocks=None, motion_profiles=None, robot_handler=None):
         """
         Constructor, defines basic values of user frame.
         :param edge_length_xy: side length of cube in mm
@@ -38,22 +52,41 @@ class UserHandler:
         :type min_radius_xy: float
         :param max_radius_xy: maximum workspace radius
         :type max_radius_xy: float
+        :param check_grip: true to check the pump status after picking up a block
+        :type check_grip: bool
+        :param initial_blocks: user coordinates x, y, z of all blocks placed before start, None if they are unknown, so
+            that blocks can be dropped onto any stack not built by the robot
+        :type initial_blocks: list
+        :param motion_profiles: speed and acceleration of the moves, used if a new robot handler is connected
+        :type motion_profiles: MotionProfiles
+        :param robot_handler: robot handler to use, a new one is connected if None
+        :type robot_handler: RobotHandler
         """
-        self.__edge_length_xy = edge_length_xy
         self.__edge_length_z = edge_length_z
-        self.__x_offset = x_offset
-        self.__y_offset = y_offset
-        self.__z_offset = z_offset
-        self.__xy_base_offset = xy_base_offset
-        self.__z_base_offset = z_base_offset
-        self.__min_radius_xy = min_radius_xy
-        self.__max_radius_xy = max_radius_xy
+        self.__frame_registry = FrameRegistry.user_frame(edge_length_xy, edge_length_z, x_offset, y_offset, z_offset)
+        self.__workspace = Workspace(xy_base_offset, z_base_offset, min_radius_xy, max_radius_xy,
+                                     edge_length_xy + z_offset)
+        # reachability of all cells of the user grid, computed once
+        self.__reachability_map = ReachabilityMap(self.__workspace, self.__frame_registry)
+        self.__wrist_solver = WristSolver(self.__frame_registry)
+        # blocks placed in the user grid, no column is tracked if the blocks on the table are unknown
+        self.__occupancy_grid = OccupancyGrid.from_reachability_map(self.__reachability_map, initial_blocks,
+                                                                    initial_blocks is not None)
 
+        # guards the pump status and the occupancy grid, which are changed on the thread of the arm
+        self.__lock = threading.Lock()
         # track pump status
         self.__pump = False
+        self.__check_grip = check_grip
 
         # initialize robot handler
-        self.__robot_handler = RobotHandler()
+        self.__robot_handler = robot_handler if robot_handler is not None else \
+            RobotHandler(motion_profiles=motion_profiles)
+        self.__motion_planner = MotionPlanner(self.__frame_registry, self.__reachability_map, self.__occupancy_grid,
+                                              self.__robot_handler.motion_profiles)
+        # plans from the current position per target cell, until the robot or a block moves
+        self.__plans = dict()
+        self.__plans_state = None
         
         # start coordinates in uarm frame
         start_coordinates_uarm = Coordinates(self.__robot_handler.x_uarm, self.__robot_handler.y_uarm,
@@ -61,9 +94,59 @@ class UserHandler:
         # we need to set the coordinates here to be able to correct the wrist when moving to the starting coordinates
         self.__coordinates = self.__transform(start_coordinates_uarm, CoordinateFrame.User)
 
-        # move to start position
-        self.position(x_start_user, y_start_user)
-        self.height(z_start_user)
+        # move to start position, both moves are sent at once
+        with self.__robot_handler.batch():
+            self.position(x_start_user, y_start_user)
+            self.height(z_start_user)
+
+    @property
+    def frame_registry(self):
+        return self.__frame_registry
+
+    @property
+    def workspace(self):
+        return self.__workspace
+
+    @property
+    def reachability_map(self):
+        return self.__reachability_map
+
+    @property
+    def occupancy_grid(self):
+        return self.__occupancy_grid
+
+    @property
+    def motion_planner(self):
+        return self.__motion_planner
+
+    @property
+    def busy_time(self):
+        """
+        Estimated time in s until the robot stops.
+        """
+        return self.__robot_handler.busy_time
+
+    def validate_command(self, function_key, args):
+        """
+        Check if a command can be executed, without moving the robot. The position changes while the previous winner
+        is executed, so only checks independent of the position are done, everything is checked again on execution.
+        :param function_key: function of the command
+        :type function_key: FunctionKey
+        :param args: arguments of the command
+        :type args: list
+        """
+        with VALIDATE_SECONDS.time(function_key.value):
+            if function_key is FunctionKey.Height:
+                if not self.__reachability_map.is_reachable_height(args[0]):
+                    message = "Position is not in workspace of robot."
+                    raise ComrobError(ErrorCode.E0009, message)
+            elif function_key is FunctionKey.Position:
+                if not self.__reachability_map.is_reachable_column(args[0], args[1]):
+                    message = "Position is not in workspace of robot."
+                    raise ComrobError(ErrorCode.E0009, message)
+            elif function_key is FunctionKey.Move:
+                with self.__lock:
+                    self.__check_move(*args)
 
     # TODO (ALR): Think about moving this to coordinates.
     def __transform(self, coordinates, coordinate_frame):
@@ -74,29 +157,18 @@ class UserHandler:
         :param coordinate_frame: coordinate frame to transform to
         :type coordinate_frame: CoordinateFrame
         """
-        if coordinate_frame is coordinates.coordinate_frame:
-            message = "The coordinates are already in the desired frame."
-            raise ComrobError(ErrorCode.E0012, message)
+        with TRANSFORM_SECONDS.time():
+            # transform from uarm to user, check workspace before
+            if coordinates.coordinate_frame is CoordinateFrame.Uarm and coordinate_frame is not CoordinateFrame.Uarm:
+                self.__check_workspace(coordinates)
 
-        # transform from user to uarm
-        if coordinate_frame is CoordinateFrame.Uarm and coordinates.coordinate_frame is CoordinateFrame.User:
-            x_uarm = (coordinates.x + .5) * self.__edge_length_xy + self.__x_offset
-            y_uarm = (coordinates.y + .5) * self.__edge_length_xy + self.__y_offset
-            z_uarm = (coordinates.z + .5) * self.__edge_length_z + self.__z_offset
-            coordinates_uarm = Coordinates(x_uarm, y_uarm, z_uarm, coordinate_frame)
-            self.__check_workspace(coordinates_uarm)
-            return coordinates_uarm
-        
-        # transform from uarm to user
-        if coordinate_frame is CoordinateFrame.User and coordinates.coordinate_frame is CoordinateFrame.Uarm:
-            self.__check_workspace(coordinates)
-            x_user = (coordinates.x - self.__x_offset) / self.__edge_length_xy - 0.5
-            y_user = (coordinates.y - self.__y_offset) / self.__edge_length_xy - 0.5
-            z_user = (coordinates.z - self.__z_offset) / self.__edge_length_z - 0.5
-            coordinates_user = Coordinates(x_user, y_user, z_user, coordinate_frame)
-            return coordinates_user
+            transformed = self.__frame_registry.transform(CoordinatesArray.from_coordinates([coordinates]),
+                                                          coordinate_frame)[0]
 
-        raise NotImplementedError()
+            # transform from user to uarm, check workspace after
+            if coordinate_frame is CoordinateFrame.Uarm:
+                self.__check_cell(coordinates.x, coordinates.y, coordinates.z, transformed)
+            return transformed
 
     def height(self, z_user):
         """
@@ -105,9 +177,9 @@ class UserHandler:
         # only change copy before all checks are performed
         new_coordinates_user = self.__coordinates.copy()
         new_coordinates_user.z = z_user
-        new_coordinates_uarm = self.__transform(new_coordinates_user, CoordinateFrame.Uarm)
-        # TODO (ALR): Add collision tests.
-        self.__robot_handler.height(new_coordinates_uarm.z)
+        self.__transform(new_coordinates_user, CoordinateFrame.Uarm)
+        motion_plan = self.__plan(new_coordinates_user, self.__pump)
+        self.__follow(motion_plan)
         # change coordinates if everything is successful
         self.__coordinates = new_coordinates_user
 
@@ -119,16 +191,7 @@ class UserHandler:
         :param y_user: y-position in user frame to move to
         :type y_user: int
         """
-        new_coordinates_user = self.__coordinates.copy()
-        new_coordinates_user.x = x_user
-        new_coordinates_user.y = y_user
-        new_coordinates_uarm = self.__transform(new_coordinates_user, CoordinateFrame.Uarm)
-        # change wrist rotation to keep orthogonal cube orientation
-        new_wrist_angle = self.__calculate_equal_wrist_rotation(self.__coordinates, new_coordinates_user)
-        self.__robot_handler.position(new_coordinates_uarm.x, new_coordinates_uarm.y)
-        self.__robot_handler.rotate_wrist(new_wrist_angle)
-        # change coordinates if everything is successful
-        self.__coordinates = new_coordinates_user
+        self.__go_to(x_user, y_user, self.__coordinates.z)
 
     def hold(self):
         """
@@ -138,17 +201,189 @@ class UserHandler:
         """
         hold_coordinates_user = self.__coordinates.copy()
         hold_coordinates_uarm = self.__transform(hold_coordinates_user, CoordinateFrame.Uarm)
+        self.__check_support(hold_coordinates_user)
         z_before_move_uarm = hold_coordinates_uarm.z
         hold_coordinates_uarm.z -= 0.5 * self.__edge_length_z
-        # move down to block surface and wait for command to finish
-        self.__robot_handler.height(hold_coordinates_uarm.z)
-        time.sleep(0.5)
-        # toggle pump
-        self.__robot_handler.pump(not self.__pump)
-        time.sleep(0.5)
-        self.__pump = not self.__pump
+        # move down to block surface and wait until the arm stopped
+        self.__robot_handler.height(hold_coordinates_uarm.z, wait=True, motion_profile=MotionProfile.Approach)
+        # toggle pump and wait for acknowledgement
+        self.__robot_handler.pump(not self.__pump, wait=True)
+        if self.__check_grip and not self.__pump and \
+                self.__robot_handler.pump_status(timeout=GRIP_TIMEOUT) is not PumpStatus.Grabbing:
+            # nothing was picked up, turn pump off again
+            self.__robot_handler.pump(False, wait=True)
+            self.__robot_handler.height(z_before_move_uarm)
+            message = "No block picked up."
+            raise ComrobError(ErrorCode.E0017, message)
+        with self.__lock:
+            self.__pump = not self.__pump
+            self.__update_occupancy(hold_coordinates_user)
         # move back up
-        self.__robot_handler.height(z_before_move_uarm)
+        self.__robot_handler.height(z_before_move_uarm,
+                                    motion_profile=MotionProfile.Carry if self.__pump else MotionProfile.Traverse)
+
+    def move(self, x_from_user, y_from_user, x_to_user, y_to_user):
+        """
+        Move the top block of one stack onto another stack, executed as one command.
+        :param x_from_user: x-position in user frame of the stack to take the block from
+        :type x_from_user: int
+        :param y_from_user: y-position in user frame of the stack to take the block from
+        :type y_from_user: int
+        :param x_to_user: x-position in user frame of the stack to put the block on
+        :type x_to_user: int
+        :param y_to_user: y-position in user frame of the stack to put the block on
+        :type y_to_user: int
+        """
+        steps = self.__compile_move(x_from_user, y_from_user, x_to_user, y_to_user)
+        try:
+            for step, args in steps:
+                step(*args)
+        except Exception:
+            if self.__pump:
+                # put the block back onto its stack, so that the arm is not left holding it
+                self.__go_to(*steps[0][1])
+                self.hold()
+            raise
+
+    def __compile_move(self, x_from_user, y_from_user, x_to_user, y_to_user):
+        """
+        Check a move of a block and compile it into the steps to execute. Every approach goes directly to the block,
+        lifting over the stacks in the way, instead of moving sideways and down in separate commands.
+        :return: steps as (function, arguments)
+        :rtype: list
+        """
+        if self.__pump:
+            message = "A block is already held."
+            raise ComrobError(ErrorCode.E0024, message)
+        z_pick_user, z_drop_user = self.__check_move(x_from_user, y_from_user, x_to_user, y_to_user)
+        pick_user = Coordinates(x_from_user, y_from_user, z_pick_user, CoordinateFrame.User)
+        drop_user = Coordinates(x_to_user, y_to_user, z_drop_user, CoordinateFrame.User)
+        # both paths need to be free, the second one carrying the block, which is still in the grid until it is picked
+        # up, so the carried path is checked from one cell above
+        self.__plan(pick_user, False)
+        self.__motion_planner.plan(Coordinates(x_from_user, y_from_user, z_pick_user + 1, CoordinateFrame.User),
+                                   drop_user, True)
+        return [(self.__go_to, (x_from_user, y_from_user, z_pick_user)), (self.hold, ()),
+                (self.__go_to, (x_to_user, y_to_user, z_drop_user)), (self.hold, ())]
+
+    def __check_move(self, x_from_user, y_from_user, x_to_user, y_to_user):
+        """
+        Check that the stacks of a move are known and reachable, independent of the position of the end-effector.
+        :return: z-positions in user frame of the end-effector picking up and dropping the block
+        :rtype: tuple
+        """
+        if (x_from_user, y_from_user) == (x_to_user, y_to_user):
+            message = "Block would not be moved."
+            raise ComrobError(ErrorCode.E0024, message)
+        # the end-effector picks up the block below and drops the block into the cell below
+        z_pick_user = self.__occupancy_grid.column_height(x_from_user, y_from_user)
+        z_drop_user = self.__occupancy_grid.column_height(x_to_user, y_to_user)
+        if z_pick_user is None or z_drop_user is None:
+            # stacks not built by the robot need to be set as initial blocks
+            message = "Height of the stack is unknown, use position, height and hold instead."
+            raise ComrobError(ErrorCode.E0024, message)
+        if z_pick_user == 0:
+            message = "No block to move."
+            raise ComrobError(ErrorCode.E0024, message)
+        z_drop_user += 1
+        self.__check_cell(x_from_user, y_from_user, z_pick_user)
+        self.__check_cell(x_to_user, y_to_user, z_drop_user)
+        return z_pick_user, z_drop_user
+
+    def __go_to(self, x_user, y_user, z_user):
+        """
+        Move to position and height in user frame along a planned path, keep alignment of end-effector.
+        """
+        new_coordinates_user = Coordinates(x_user, y_user, z_user, CoordinateFrame.User)
+        self.__transform(new_coordinates_user, CoordinateFrame.Uarm)
+        # lift over blocks in the way
+        motion_plan = self.__plan(new_coordinates_user, self.__pump)
+        # change wrist rotation to keep orthogonal cube orientation
+        new_wrist_angle = self.__wrist_solver.solve(self.__coordinates, new_coordinates_user,
+                                                    self.__robot_handler.wrist_angle)
+        self.__follow(motion_plan, new_wrist_angle)
+        # change coordinates if everything is successful
+        self.__coordinates = new_coordinates_user
+
+    def __plan(self, target_user, holding):
+        """
+        Plan path from the current position, the plan is computed once per target cell, e.g. when a move is checked
+        and then executed.
+        :param target_user: position to move to in user frame
+        :type target_user: Coordinates
+        :param holding: true if a block is held
+        :type holding: bool
+        :return: planned path in user frame
+        :rtype: MotionPlan
+        """
+        state = (self.__coordinates.x, self.__coordinates.y, self.__coordinates.z, self.__occupancy_grid.version)
+        if state != self.__plans_state:
+            self.__plans.clear()
+            self.__plans_state = state
+        key = (target_user.x, target_user.y, target_user.z, holding)
+        motion_plan = self.__plans.get(key)
+        if motion_plan is None:
+            motion_plan = self.__motion_planner.plan(self.__coordinates, target_user, holding)
+            self.__plans[key] = motion_plan
+        return motion_plan
+
+    def __follow(self, motion_plan, wrist_angle=None):
+        """
+        Move along the waypoints of a plan, all moves are sent at once.
+        :param motion_plan: planned path in user frame
+        :type motion_plan: MotionPlan
+        :param wrist_angle: wrist angle to rotate to during the horizontal move, None to keep the angle
+        :type wrist_angle: float
+        """
+        waypoints_uarm = self.__frame_registry.transform(motion_plan.waypoints, CoordinateFrame.Uarm)
+        with self.__robot_handler.batch():
+            for i in range(1, len(waypoints_uarm)):
+                waypoint_uarm = waypoints_uarm[i]
+                # the wrist is rotated together with the first move
+                self.__robot_handler.move(waypoint_uarm.x, waypoint_uarm.y, waypoint_uarm.z,
+                                          wrist_angle if i == 1 else None, merge=False,
+                                          motion_profile=motion_plan.motion_profiles[i - 1])
+
+    def __check_support(self, coordinates_user):
+        """
+        Check that a held block would be dropped onto the ground or another block.
+        :param coordinates_user: position of the end-effector in user frame
+        :type coordinates_user: Coordinates
+        """
+        if not self.__pump or not all(float(value).is_integer() for value in
+                                      (coordinates_user.x, coordinates_user.y, coordinates_user.z)):
+            return
+        if not self.__occupancy_grid.has_support(int(coordinates_user.x), int(coordinates_user.y),
+                                                 int(coordinates_user.z) - 1):
+            message = "Block would not be supported."
+            raise ComrobError(ErrorCode.E0020, message)
+
+    def __update_occupancy(self, coordinates_user):
+        """
+        Update occupancy grid after a block was picked up or dropped below the end-effector.
+        :param coordinates_user: position of the end-effector in user frame
+        :type coordinates_user: Coordinates
+        """
+        if not all(float(value).is_integer() for value in
+                   (coordinates_user.x, coordinates_user.y, coordinates_user.z)):
+            return
+        block = (int(coordinates_user.x), int(coordinates_user.y), int(coordinates_user.z) - 1)
+        if not self.__occupancy_grid.is_tracked(block[0], block[1]):
+            if self.__pump and self.__check_grip:
+                # the block picked up stood on a stack, the end-effector came down through the free cells above
+                self.__occupancy_grid.track_column(block[0], block[1], block[2])
+            elif not self.__pump and block[2] == 0:
+                # a block dropped onto the ground is the only block of its column, nothing can stand on a free cell
+                self.__occupancy_grid.track_column(block[0], block[1], 1)
+            # a block dropped onto an unknown stack may fall, so its height stays unknown
+            return
+        if self.__pump:
+            # picked up
+            if self.__occupancy_grid.is_occupied(*block):
+                self.__occupancy_grid.remove_block(*block)
+        else:
+            # dropped
+            self.__occupancy_grid.add_block(*block)
 
     def __check_workspace(self, coordinates_uarm):
         """
@@ -156,67 +391,31 @@ class UserHandler:
         :param coordinates_uarm: coordinates in uarm frame
         :type coordinates_uarm: Coordinates
         """
-        # check if input is in range of robot
-        # TODO (ALR): This is not at all accurate, check if this is good enough.
-        xy_length = numpy.sqrt(coordinates_uarm.x ** 2 + coordinates_uarm.y ** 2)
-        xy_radius = abs(xy_length - self.__xy_base_offset)
-        z_radius = abs(coordinates_uarm.z - self.__z_base_offset)
-        radius = numpy.sqrt(xy_radius ** 2 + z_radius ** 2)
-        if radius > (self.__max_radius_xy - self.__xy_base_offset) or\
-                coordinates_uarm.x < 0 or\
-                xy_length <= self.__min_radius_xy or\
-                coordinates_uarm.z < self.__edge_length_xy + self.__z_offset:
+        if not self.__workspace.contains(coordinates_uarm.x, coordinates_uarm.y, coordinates_uarm.z):
             message = "Position is not in workspace of robot."
             raise ComrobError(ErrorCode.E0009, message)
 
-    def __calculate_equal_wrist_rotation(self, old_coordinates_user, new_coordinates_user):
-        """
-        Calculates new wrist rotation that keeps the end-effector rotation equal in the world frame.
-        :param old_coordinates_user: coordinates of previous position in user frame
-        :type old_coordinates_user: Coordinates
-        :param new_coordinates_user: coordinates of new position in user frame
-        :type new_coordinates_user: Coordinates
-        :return: new wrist angle that keeps the object in the same orientation
-        :rtype: float
-        """
-        old_coordinates_uarm = self.__transform(old_coordinates_user, CoordinateFrame.Uarm)
-        new_coordinates_uarm = self.__transform(new_coordinates_user, CoordinateFrame.Uarm)
-        # angle from world x-axis to arm
-        alpha_1_rad = numpy.arctan2(old_coordinates_uarm.y, old_coordinates_uarm.x)
-        alpha_2_rad = numpy.arctan2(new_coordinates_uarm.y, new_coordinates_uarm.x)
-        alpha_1_deg = numpy.degrees(alpha_1_rad)
-        alpha_2_deg = numpy.degrees(alpha_2_rad)
-        # angle from world x-axis to end effector orientation (-90 because of the asymmetric servo range 0-180)
-        beta_1 = alpha_1_deg + 90.0 - self.__robot_handler.wrist_angle
-        # calculate the corresponding new wrist angle for new position, so that the orientation of the grabbed object
-        # stays the same
-        wrist_new = -beta_1 + alpha_2_deg + 90.0
-        # TODO (ALR): Remove once servo is changed.
-        wrist_corrected = self.__correct_servo_range(wrist_new)
-        # TODO (ALR): Add check for block type.
-        # check that the wrist angle is within the servos range, if not rotate by 90 degrees
-        if not (0 <= wrist_corrected <= 180):
-            wrist_new -= math.copysign(90.0, wrist_new)
-            wrist_corrected = self.__correct_servo_range(wrist_new)
-
-        if not (0 <= wrist_corrected <= 180):
-            message = "Wrist angle out of range"
-            raise ComrobError(ErrorCode.E0003, message)
-
-        return wrist_corrected
-
-    @staticmethod
-    def __correct_servo_range(wrist_angle_deg):
-        """
-        Correction of the faulty servo angles in a linear way.
-        """
-        # TODO (ALR): This should be deprecated after installing a higher quality servo.
-        # the range [11.0, 173.0] was measured of the real robot
-        lower_limit = 11.0
-        upper_limit = 173.0
-        if wrist_angle_deg <= 90.0:
-            wrist_angle_corrected = (wrist_angle_deg - lower_limit) * 90.0 / (90.0 - lower_limit)
-        else:
-            wrist_angle_corrected = 90.0 + 90.0 * (wrist_angle_deg - 90) / (upper_limit - 90.0)
+    def __check_cell(self, x_user, y_user, z_user, coordinates_uarm=None):
+        """
+        Check if coordinates in user frame are within the workspace of the robot, using the reachability map for cells
+        of the user grid.
+        :param x_user: x-position in user frame
+        :type x_user: float
+        :param y_user: y-position in user frame
+        :type y_user: float
+        :param z_user: z-position in user frame
+        :type z_user: float
+        :param coordinates_uarm: same coordinates in uarm frame, if already transformed
+        :type coordinates_uarm: Coordinates
+        """
+        if float(x_user).is_integer() and float(y_user).is_integer() and float(z_user).is_integer():
+            if not self.__reachability_map.is_reachable(int(x_user), int(y_user), int(z_user)):
+                message = "Position is not in workspace of robot."
+                raise ComrobError(ErrorCode.E0009, message)
+            return
 
-        return wrist_angle_corrected
+        if coordinates_uarm is None:
+            # the transform checks the workspace
+            self.__transform(Coordinates(x_user, y_user, z_user, CoordinateFrame.User), CoordinateFrame.Uarm)
+        else:
+            self.__check_workspace(coordinates_uarm)
@@ -0,0 +1,108 @@
+"""
+This file contains the aggregation of the votes of a session into the winning command.
+"""
+import numpy
+
+from comrob_py.enums.aggregation_mode import AggregationMode
+from comrob_py.enums.command_key import CommandKey, FunctionKey
+from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+
+# standard deviation of the neighborhood of a voted position in cells
+HEATMAP_SIGMA = 1.0
+# radius of the cluster around the densest voted position in cells
+CLUSTER_RADIUS = 1.5
+# number of arguments of the functions whose targets are aggregated spatially, the others are voted by plurality
+SPATIAL_ARGUMENTS = {FunctionKey.Height: 1, FunctionKey.Position: 2}
+
+
+def aggregate(commands, aggregation_mode=AggregationMode.Plurality):
+    """
+    Select the winning command of a session. Except in plurality mode the function with the most votes wins and its
+    arguments are aggregated over all votes for this function, height by the weighted median, position depending on
+    the mode. Hold, move and targets given with an arm are voted by plurality. The winner is always a voted target, so
+    that it passed the checks on arrival.
+    :param commands: voted commands with their number of votes in the order of their first vote, see
+        VoteTally.commands
+    :type commands: list
+    :param aggregation_mode: how the votes are aggregated
+    :type aggregation_mode: AggregationMode
+    :return: winning command, with the number of votes for its function except in plurality mode
+    :rtype: dict
+    """
+    if len(commands) == 0:
+        message = "No command in command queue."
+        raise ComrobError(ErrorCode.E0011, message)
+    if aggregation_mode is AggregationMode.Plurality:
+        return plurality(commands)
+
+    # the function with the most votes wins, on equal votes the function voted first
+    totals = dict()
+    for command in commands:
+        totals[command[CommandKey.Function]] = totals.get(command[CommandKey.Function], 0) + command[CommandKey.Count]
+    function_key = max(totals, key=totals.get)
+    commands = [command for command in commands if command[CommandKey.Function] is function_key]
+    if function_key not in SPATIAL_ARGUMENTS or len(commands) == 1 or \
+            any(len(command[CommandKey.Args]) != SPATIAL_ARGUMENTS[function_key] for command in commands):
+        return plurality(commands)
+
+    targets = numpy.array([command[CommandKey.Args] for command in commands], dtype=float)
+    weights = numpy.array([command[CommandKey.Count] for command in commands], dtype=float)
+    if function_key is FunctionKey.Height or aggregation_mode is AggregationMode.Median:
+        index = nearest(targets, numpy.array([weighted_median(targets[:, axis], weights)
+                                           for axis in range(targets.shape[1])]))
+    elif aggregation_mode is AggregationMode.Heatmap:
+        index = int(numpy.argmax(neighborhood(targets, weights)))
+    else:
+        # centroid of the votes around the densest position
+        center = targets[numpy.argmax(neighborhood(targets, weights))]
+        in_cluster = numpy.linalg.norm(targets - center, axis=1) <= CLUSTER_RADIUS
+        index = nearest(targets, numpy.average(targets[in_cluster], axis=0, weights=weights[in_cluster]))
+    return {CommandKey.Function: function_key, CommandKey.Args: list(commands[index][CommandKey.Args]),
+            CommandKey.Count: totals[function_key]}
+
+
+def plurality(commands):
+    """
+    Command with the most votes, on equal votes the command voted first.
+    """
+    winner = max(commands, key=lambda command: command[CommandKey.Count])
+    return {CommandKey.Function: winner[CommandKey.Function], CommandKey.Args: list(winner[CommandKey.Args]),
+            CommandKey.Count: winner[CommandKey.Count]}
+
+
+def weighted_median(values, weights):
+    """
+    Value at which half of the weights are reached, the lower one if it lies between two values.
+    """
+    order = numpy.argsort(values, kind="stable")
+    cumulative = numpy.cumsum(weights[order])
+    return values[order][numpy.searchsorted(cumulative, 0.5 * cumulative[-1])]
+
+
+def neighborhood(targets, weights):
+    """
+    Votes around every target, weighted by a gaussian of the distance. The gaussian is separable, so the votes are
+    counted per cell and smoothed along one axis after the other, instead of comparing every pair of targets.
+    :param targets: voted cells, one row per target
+    :type targets: numpy.ndarray
+    :param weights: votes of every target
+    :type weights: numpy.ndarray
+    :return: smoothed votes of every target
+    :rtype: numpy.ndarray
+    """
+    # cells relative to the corner of the box spanned by the targets
+    indices = tuple(numpy.rint(targets - targets.min(axis=0)).astype(int).T)
+    smoothed = numpy.zeros([int(index.max()) + 1 for index in indices])
+    numpy.add.at(smoothed, indices, weights)
+    for axis, size in enumerate(smoothed.shape):
+        offsets = numpy.arange(size)
+        kernel = numpy.exp(-0.5 * (offsets[:, numpy.newaxis] - offsets[numpy.newaxis, :]) ** 2 / HEATMAP_SIGMA ** 2)
+        smoothed = numpy.moveaxis(numpy.tensordot(kernel, smoothed, axes=(1, axis)), 0, axis)
+    return smoothed[indices]
+
+
+def nearest(targets, point):
+    """
+    Index of the target closest to a point, the first one on equal distance.
+    """
+    return int(numpy.argmin(numpy.linalg.norm(targets - point, axis=1)))
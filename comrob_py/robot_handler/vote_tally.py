@@ -0,0 +1,136 @@
+"""
+This file contains the VoteTally class, which counts the votes of one session while they are added.
+"""
+from comrob_py.enums.command_key import CommandKey
+from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+
+
+class VoteTally:
+    """
+    The VoteTally keeps a live count of the commands of one voting session, so that the check for duplicate users and
+    the selection of the winning command do not need to walk through all votes.
+    """
+    def __init__(self, session_id=0):
+        """
+        Constructor.
+        :param session_id: generation id of the session this tally belongs to
+        :type session_id: int
+        """
+        self.__session_id = session_id
+        # (function, args) -> weighted number of votes
+        self.__counts = dict()
+        # (function, args) -> index of first vote, used to break ties like select_command on a deque
+        self.__order = dict()
+        self.__users = set()
+        self.__votes = 0
+        self.__total = 0
+        self.__leader = None
+
+    def __len__(self):
+        """
+        Number of votes in tally.
+        """
+        return self.__votes
+
+    @property
+    def session_id(self):
+        return self.__session_id
+
+    @property
+    def total(self):
+        """
+        Weighted number of votes, equal to the number of votes if all votes have weight 1.
+        """
+        return self.__total
+
+    @property
+    def leader_count(self):
+        """
+        Weighted number of votes of the leading command, 0 if there is no vote.
+        """
+        if self.__leader is None:
+            return 0
+        return self.__counts[self.__leader]
+
+    def has_user(self, user_name):
+        """
+        Check if user already voted in this session.
+        :param user_name: name of user to be checked
+        :type user_name: str or tuple
+        :return: true if user already voted
+        :rtype: bool
+        """
+        return user_name in self.__users
+
+    def add(self, function_key, args, user_name, weight=1):
+        """
+        Add the vote of a user, if the user has not voted in this session yet.
+        :param function_key: function of the command
+        :type function_key: FunctionKey
+        :param args: arguments of the command
+        :type args: list
+        :param user_name: name of the voting user, e.g. channel and name to count users per channel
+        :type user_name: str or tuple
+        :param weight: weight of the vote
+        :type weight: float
+        :return: true if the vote was added, false if the user already voted
+        :rtype: bool
+        """
+        if user_name in self.__users:
+            return False
+        self.__users.add(user_name)
+
+        # turn function and args into tuples to be hashable
+        command_tuple = (function_key, tuple(args))
+        count = self.__counts.get(command_tuple, 0) + weight
+        self.__counts[command_tuple] = count
+        if command_tuple not in self.__order:
+            self.__order[command_tuple] = len(self.__order)
+        self.__votes += 1
+        self.__total += weight
+
+        # keep the leader, on equal count the command voted first wins
+        if self.__leader is None:
+            self.__leader = command_tuple
+        elif command_tuple != self.__leader:
+            leader_count = self.__counts[self.__leader]
+            if count > leader_count or \
+                    (count == leader_count and self.__order[command_tuple] < self.__order[self.__leader]):
+                self.__leader = command_tuple
+        return True
+
+    def select_command(self):
+        """
+        Get the command with the most votes.
+        :return: command with highest number of votes, first command on equal votes
+        :rtype: dict
+        """
+        if self.__leader is None:
+            message = "No command in command queue."
+            raise ComrobError(ErrorCode.E0011, message)
+
+        return {CommandKey.Function: self.__leader[0], CommandKey.Args: list(self.__leader[1]),
+                CommandKey.Count: self.__counts[self.__leader]}
+
+    def commands(self):
+        """
+        Get all voted commands with their number of votes.
+        :return: commands in the order of their first vote
+        :rtype: list
+        """
+        return [{CommandKey.Function: command_tuple[0], CommandKey.Args: list(command_tuple[1]),
+                 CommandKey.Count: self.__counts[command_tuple]}
+                for command_tuple in sorted(self.__order, key=self.__order.get)]
+
+    def copy(self):
+        """
+        Copy tally.
+        """
+        tally = VoteTally(self.__session_id)
+        tally.__counts = self.__counts.copy()
+        tally.__order = self.__order.copy()
+        tally.__users = self.__users.copy()
+        tally.__votes = self.__votes
+        tally.__total = self.__total
+        tally.__leader = self.__leader
+        return tally
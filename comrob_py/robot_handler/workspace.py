@@ -0,0 +1,168 @@
+"""
+This file contains the workspace of the uarm and the reachability map of the user grid.
+"""
+import numpy
+
+from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.robot_handler.coordinates import CoordinatesArray
+
+
+class Workspace:
+    """
+    The Workspace describes the region reachable by the uarm in uarm frame. All checks work on single values as well as
+    on numpy arrays, e.g. the x, y and z columns of a CoordinatesArray.
+    """
+    def __init__(self, xy_base_offset, z_base_offset, min_radius_xy, max_radius_xy, min_z):
+        """
+        Constructor.
+        :param xy_base_offset: offset of workspace in xy-plane
+        :type xy_base_offset: float
+        :param z_base_offset: offset of uarm base in z-direction in mm
+        :type z_base_offset: float
+        :param min_radius_xy: minimum workspace radius
+        :type min_radius_xy: float
+        :param max_radius_xy: maximum workspace radius
+        :type max_radius_xy: float
+        :param min_z: minimum height in uarm frame
+        :type min_z: float
+        """
+        self.__xy_base_offset = xy_base_offset
+        self.__z_base_offset = z_base_offset
+        self.__min_radius_xy = min_radius_xy
+        self.__max_radius_xy = max_radius_xy
+        self.__min_z = min_z
+
+    @property
+    def max_radius_xy(self):
+        return self.__max_radius_xy
+
+    @property
+    def min_z(self):
+        return self.__min_z
+
+    @property
+    def max_z(self):
+        """
+        Maximum height reachable in uarm frame.
+        """
+        return self.__z_base_offset + self.__max_radius_xy - self.__xy_base_offset
+
+    def contains(self, x_uarm, y_uarm, z_uarm):
+        """
+        Check if coordinates in uarm frame are within the workspace of the robot.
+        :param x_uarm: x-coordinates in uarm frame
+        :type x_uarm: float or numpy.ndarray
+        :param y_uarm: y-coordinates in uarm frame
+        :type y_uarm: float or numpy.ndarray
+        :param z_uarm: z-coordinates in uarm frame
+        :type z_uarm: float or numpy.ndarray
+        :return: true for coordinates within the workspace
+        :rtype: bool or numpy.ndarray
+        """
+        # TODO (ALR): This is not at all accurate, check if this is good enough.
+        xy_length = numpy.sqrt(numpy.square(x_uarm) + numpy.square(y_uarm))
+        xy_radius = numpy.abs(xy_length - self.__xy_base_offset)
+        z_radius = numpy.abs(z_uarm - self.__z_base_offset)
+        radius = numpy.sqrt(numpy.square(xy_radius) + numpy.square(z_radius))
+        return (radius <= (self.__max_radius_xy - self.__xy_base_offset)) & \
+            (numpy.asarray(x_uarm) >= 0) & \
+            (xy_length > self.__min_radius_xy) & \
+            (numpy.asarray(z_uarm) >= self.__min_z)
+
+
+class ReachabilityMap:
+    """
+    The ReachabilityMap stores for every cell of the user grid if it is within the workspace, computed once for the
+    whole grid, so that commands can be checked with a single lookup.
+    """
+    def __init__(self, workspace, frame_registry):
+        """
+        Constructor, computes the map.
+        :param workspace: workspace of the robot
+        :type workspace: Workspace
+        :param frame_registry: registry containing user and uarm frame
+        :type frame_registry: FrameRegistry
+        """
+        # bounds of the workspace in uarm frame, converted to cells of the user grid
+        max_radius = workspace.max_radius_xy
+        bounds_uarm = CoordinatesArray([[0.0, -max_radius, workspace.min_z], [max_radius, max_radius, workspace.max_z]],
+                                       CoordinateFrame.Uarm)
+        bounds_user = frame_registry.transform(bounds_uarm, CoordinateFrame.User).coordinates
+        lower = numpy.floor(bounds_user[0]).astype(int)
+        upper = numpy.ceil(bounds_user[1]).astype(int) + 1
+        self.__origin = tuple(int(value) for value in lower)
+
+        cells_user = numpy.stack(numpy.meshgrid(*[numpy.arange(lower[axis], upper[axis]) for axis in range(3)],
+                                                indexing="ij"), axis=-1)
+        cells_uarm = frame_registry.transform(CoordinatesArray(cells_user, CoordinateFrame.User),
+                                              CoordinateFrame.Uarm)
+        self.__reachable = workspace.contains(cells_uarm.x, cells_uarm.y, cells_uarm.z).reshape(cells_user.shape[:3])
+        self.__reachable.setflags(write=False)
+        # reachable heights and columns, for checks independent of the current position
+        self.__reachable_z = self.__reachable.any(axis=(0, 1))
+        self.__reachable_xy = self.__reachable.any(axis=2)
+
+    @property
+    def origin(self):
+        """
+        User coordinates of the first cell of the map.
+        """
+        return self.__origin
+
+    @property
+    def shape(self):
+        return self.__reachable.shape
+
+    @property
+    def reachable(self):
+        """
+        Read-only boolean array of all cells, indexed by user coordinates minus origin.
+        """
+        return self.__reachable
+
+    def is_reachable(self, x_user, y_user, z_user):
+        """
+        Check if cell of the user grid is within the workspace.
+        :param x_user: x-position in user frame
+        :type x_user: int
+        :param y_user: y-position in user frame
+        :type y_user: int
+        :param z_user: z-position in user frame
+        :type z_user: int
+        :return: true if cell is within the workspace
+        :rtype: bool
+        """
+        x_index = x_user - self.__origin[0]
+        y_index = y_user - self.__origin[1]
+        z_index = z_user - self.__origin[2]
+        if not (0 <= x_index < self.__reachable.shape[0] and 0 <= y_index < self.__reachable.shape[1] and
+                0 <= z_index < self.__reachable.shape[2]):
+            return False
+        return bool(self.__reachable[x_index, y_index, z_index])
+
+    def is_reachable_height(self, z_user):
+        """
+        Check if any cell of the user grid at a height is within the workspace.
+        :param z_user: z-position in user frame
+        :type z_user: int
+        :return: true if a cell at the height is within the workspace
+        :rtype: bool
+        """
+        z_index = z_user - self.__origin[2]
+        return 0 <= z_index < self.__reachable_z.shape[0] and bool(self.__reachable_z[z_index])
+
+    def is_reachable_column(self, x_user, y_user):
+        """
+        Check if any cell of the user grid at a position is within the workspace.
+        :param x_user: x-position in user frame
+        :type x_user: int
+        :param y_user: y-position in user frame
+        :type y_user: int
+        :return: true if a cell at the position is within the workspace
+        :rtype: bool
+        """
+        x_index = x_user - self.__origin[0]
+        y_index = y_user - self.__origin[1]
+        if not (0 <= x_index < self.__reachable_xy.shape[0] and 0 <= y_index < self.__reachable_xy.shape[1]):
+            return False
+        return bool(self.__reachable_xy[x_index, y_index])
@@ -0,0 +1,119 @@
+"""
+This file contains the WristSolver, which calculates the wrist rotation keeping the orientation of a held cube.
+"""
+import math
+import numpy
+
+from collections import OrderedDict
+
+from comrob_py.enums.coordinate_frame import CoordinateFrame
+from comrob_py.robot_handler.comrob_error import ComrobError, ErrorCode
+from comrob_py.robot_handler.coordinates import CoordinatesArray
+
+
+class WristSolver:
+    """
+    The WristSolver calculates the wrist angle that keeps the end-effector rotation equal in the world frame. Results
+    for moves between cells of the user grid are memoized by (old cell, new cell, wrist angle), since positions are on a
+    grid and the wrist only takes a few different angles.
+    """
+    def __init__(self, frame_registry, max_size=4096):
+        """
+        Constructor.
+        :param frame_registry: registry containing user and uarm frame
+        :type frame_registry: FrameRegistry
+        :param max_size: maximum number of memoized moves, the least recently used move is dropped first
+        :type max_size: int
+        """
+        self.__frame_registry = frame_registry
+        self.__max_size = max_size
+        # (old x, old y, new x, new y, wrist angle) -> new wrist angle, None if out of range
+        self.__cache = OrderedDict()
+        self.__frame_version = frame_registry.version
+
+    def __len__(self):
+        """
+        Number of memoized moves.
+        """
+        return len(self.__cache)
+
+    def solve(self, old_coordinates_user, new_coordinates_user, wrist_angle):
+        """
+        Calculates new wrist rotation that keeps the end-effector rotation equal in the world frame.
+        :param old_coordinates_user: coordinates of previous position in user frame
+        :type old_coordinates_user: Coordinates
+        :param new_coordinates_user: coordinates of new position in user frame
+        :type new_coordinates_user: Coordinates
+        :param wrist_angle: current wrist angle in degrees
+        :type wrist_angle: float
+        :return: new wrist angle that keeps the object in the same orientation
+        :rtype: float
+        """
+        # the memoized angles are only valid for the frames they were calculated with
+        if self.__frame_registry.version != self.__frame_version:
+            self.__cache.clear()
+            self.__frame_version = self.__frame_registry.version
+
+        # the height does not change the angle
+        cells = (old_coordinates_user.x, old_coordinates_user.y, new_coordinates_user.x, new_coordinates_user.y)
+        if all(float(value).is_integer() for value in cells):
+            key = tuple(int(value) for value in cells) + (wrist_angle,)
+            if key in self.__cache:
+                self.__cache.move_to_end(key)
+                new_wrist_angle = self.__cache[key]
+            else:
+                new_wrist_angle = self.__calculate(old_coordinates_user, new_coordinates_user, wrist_angle)
+                self.__cache[key] = new_wrist_angle
+                if len(self.__cache) > self.__max_size:
+                    self.__cache.popitem(last=False)
+        else:
+            new_wrist_angle = self.__calculate(old_coordinates_user, new_coordinates_user, wrist_angle)
+
+        if new_wrist_angle is None:
+            message = "Wrist angle out of range"
+            raise ComrobError(ErrorCode.E0003, message)
+        return new_wrist_angle
+
+    def __calculate(self, old_coordinates_user, new_coordinates_user, wrist_angle):
+        """
+        Calculate new wrist angle.
+        :return: new wrist angle, None if out of range of the servo
+        :rtype: float
+        """
+        coordinates_uarm = self.__frame_registry.transform(
+            CoordinatesArray.from_coordinates([old_coordinates_user, new_coordinates_user]), CoordinateFrame.Uarm)
+        # angle from world x-axis to arm
+        alpha_1_deg, alpha_2_deg = numpy.degrees(numpy.arctan2(coordinates_uarm.y, coordinates_uarm.x))
+        # angle from world x-axis to end effector orientation (-90 because of the asymmetric servo range 0-180)
+        beta_1 = alpha_1_deg + 90.0 - wrist_angle
+        # calculate the corresponding new wrist angle for new position, so that the orientation of the grabbed object
+        # stays the same
+        wrist_new = -beta_1 + alpha_2_deg + 90.0
+        # TODO (ALR): Remove once servo is changed.
+        wrist_corrected = self.__correct_servo_range(wrist_new)
+        # TODO (ALR): Add check for block type.
+        # check that the wrist angle is within the servos range, if not rotate by 90 degrees
+        if not (0 <= wrist_corrected <= 180):
+            wrist_new -= math.copysign(90.0, wrist_new)
+            wrist_corrected = self.__correct_servo_range(wrist_new)
+
+        if not (0 <= wrist_corrected <= 180):
+            return None
+
+        return float(wrist_corrected)
+
+    @staticmethod
+    def __correct_servo_range(wrist_angle_deg):
+        """
+        Correction of the faulty servo angles in a linear way.
+        """
+        # TODO (ALR): This should be deprecated after installing a higher quality servo.
+        # the range [11.0, 173.0] was measured of the real robot
+        lower_limit = 11.0
+        upper_limit = 173.0
+        if wrist_angle_deg <= 90.0:
+            wrist_angle_corrected = (wrist_angle_deg - lower_limit) * 90.0 / (90.0 - lower_limit)
+        else:
+            wrist_angle_corrected = 90.0 + 90.0 * (wrist_angle_deg - 90) / (upper_limit - 90.0)
+
+        return wrist_angle_corrected